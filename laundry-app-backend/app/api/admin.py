@@ -0,0 +1,133 @@
+from datetime import datetime
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, admin_user
+from app.core.profiler import Profile, profile_for, profiling_lock, request_profiles
+from app.core.resilience import dependency_metrics
+from app.db.session import shard_router
+from app.models.order import Order, OrderStatus
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.user_mirror import refresh_mirrors
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+class UserLocationUpdate(BaseModel):
+    location: str
+
+
+def _download(profile: Profile, fmt: str, name: str):
+    headers = {"X-Profile-Samples": str(profile.samples)}
+    if fmt == "speedscope":
+        headers["Content-Disposition"] = f'attachment; filename="{name}.speedscope.json"'
+        return JSONResponse(profile.speedscope(name), headers=headers)
+    headers["Content-Disposition"] = f'attachment; filename="{name}.collapsed.txt"'
+    return PlainTextResponse(profile.collapsed(), headers=headers)
+
+
+@router.get("/profile", summary="Admin: sample this worker for a few seconds")
+def profile_worker(
+    seconds: float = Query(5, gt=0, le=60),
+    interval_ms: float = Query(5, ge=1, le=100),
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope)$"),
+    include_idle: bool = False,
+    admin: User = Depends(admin_user),
+):
+    """
+    Statistical profile of whichever worker serves this request. Send
+    the request repeatedly to reach the other workers.
+    """
+    if not profiling_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+    try:
+        profile = profile_for(seconds, interval_ms / 1000, include_idle)
+    finally:
+        profiling_lock.release()
+    return _download(profile, format, f"worker-{datetime.utcnow():%Y%m%dT%H%M%S}")
+
+
+@router.get("/profiles/{profile_id}", summary="Admin: download a single-request profile")
+def download_request_profile(
+    profile_id: str,
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope)$"),
+    admin: User = Depends(admin_user),
+):
+    """
+    Profiles are taken by sending any request with `X-Profile: 1` as an
+    admin; the response's X-Profile-Id names the profile. Stored in
+    PROFILE_DIR for PROFILE_TTL_SECONDS, so any worker sharing that
+    directory can serve it.
+    """
+    profile = request_profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found or expired")
+    return _download(profile, format, f"request-{profile_id}")
+
+
+@router.get("/dependencies", summary="Admin: outbound dependency health")
+def list_dependencies(admin: User = Depends(admin_user)):
+    return {"dependencies": dependency_metrics()}
+
+
+@router.get("/locations", summary="Admin: configured locations")
+def list_locations(admin: User = Depends(admin_user)):
+    return {"locations": shard_router.locations}
+
+
+def _has_open_work(location: str, user_id) -> bool:
+    """
+    Undelivered orders (as customer or driver) or active subscriptions
+    on the shard serving `location`.
+    """
+    db = shard_router.session_for(location)
+    try:
+        open_order = select(Order.id).where(
+            or_(Order.customer_id == user_id, Order.driver_id == user_id),
+            Order.status != OrderStatus.delivered,
+        )
+        active_subscription = select(Subscription.id).where(
+            Subscription.customer_id == user_id,
+            Subscription.is_active.is_(True),
+        )
+        return bool(db.scalar(select(open_order.exists())) or db.scalar(select(active_subscription.exists())))
+    finally:
+        db.close()
+
+
+@router.patch("/users/{user_id}/location", summary="Admin: move a user to a location")
+def set_user_location(
+    user_id: UUID,
+    payload: UserLocationUpdate,
+    admin: User = Depends(admin_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Only new orders follow the user. A move to another shard is refused
+    while the user has open orders or active subscriptions on the current
+    one, since they could no longer reach them; delivered orders stay
+    behind and remain visible to admins with X-Location.
+    """
+    if not shard_router.is_known(payload.location):
+        raise HTTPException(status_code=400, detail=f"Unknown location '{payload.location}'")
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    moves_shard = shard_router.engine_for(payload.location) is not shard_router.engine_for(user.location)
+    if moves_shard and _has_open_work(user.location, user.id):
+        raise HTTPException(
+            status_code=409,
+            detail="User has open orders or active subscriptions at their current location",
+        )
+
+    user.location = payload.location
+    db.commit()
+    refresh_mirrors(user, db)
+    return {"user_id": str(user.id), "location": user.location}
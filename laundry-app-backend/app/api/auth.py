@@ -11,6 +11,8 @@ from app.services.email_service import send_verification_email
 from passlib.context import CryptContext
 from fastapi import Form
 from fastapi.security import OAuth2PasswordRequestForm
+from app.core.config import settings
+from app.api.deps import rate_limit, username_rate_limit
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 pwd_context = CryptContext(
@@ -29,7 +31,10 @@ def get_db():
         db.close()
 
 
-@router.post("/register")
+@router.post(
+    "/register",
+    dependencies=[Depends(rate_limit("auth:register", settings.REGISTER_RATE_PER_IP, settings.REGISTER_RATE_PER_ROUTE))],
+)
 async def register_user(user: UserRegister, db: Session = Depends(get_db)):
     # Check if email exists
     existing = db.query(User).filter(User.email == user.email).first()
@@ -96,7 +101,13 @@ def verify_email(
 
 
 
-@router.post("/login")
+@router.post(
+    "/login",
+    dependencies=[
+        Depends(rate_limit("auth:login", settings.LOGIN_RATE_PER_IP, settings.LOGIN_RATE_PER_ROUTE)),
+        Depends(username_rate_limit("auth:login", settings.LOGIN_RATE_PER_USERNAME)),
+    ],
+)
 def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
@@ -1,10 +1,15 @@
-from fastapi import Depends, HTTPException, status
+import math
+import uuid
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from jose import jwt, JWTError
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.jwt_backend import InvalidTokenError
+from app.core.token import decode_token
+from app.db.session import get_db, SessionLocal, shard_router
 from app.models.user import User, UserRole
-from fastapi.security import OAuth2PasswordBearer
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from app.core.rate_limit import Rate, build_store, parse_rate
 
 
 # --------------------
@@ -26,25 +31,26 @@ def get_current_user(
     token: str = Depends(oauth2_scheme),
 ):
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
+        payload = decode_token(token)  # cached per token until it expires
         user_id: str = payload.get("sub")
         role: str = payload.get("role")
 
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        user = db.query(User).filter(User.id == user_id).first()
+        try:
+            user_uuid = uuid.UUID(user_id)
+        except ValueError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+        user = db.query(User).filter(User.id == user_uuid).first()
 
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
         return user
 
-    except JWTError:
+    except InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
 
@@ -85,3 +91,126 @@ def admin_user(current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.admin:
         raise HTTPException(status_code=403, detail="Admins only")
     return current_user
+
+
+
+def is_admin_token(token: str) -> bool:
+    """
+    admin_user for code outside the dependency system (e.g. middleware).
+    """
+    db = SessionLocal()
+    try:
+        admin_user(get_current_user(db=db, token=token))
+        return True
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+
+# --------------------
+# Rate Limiting
+# --------------------
+rate_limit_store = build_store(settings.RATE_LIMIT_STORE)
+
+
+def client_ip(request: Request) -> str:
+    if settings.TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _enforce(key: str, rate: Rate):
+    wait = rate_limit_store.consume(key, rate)
+    if wait > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
+def rate_limit(route: str, per_ip: Optional[str] = None, per_route: Optional[str] = None):
+    """
+    Token-bucket limits for unauthenticated routes: one bucket per client IP
+    and one shared by every caller of the route.
+    """
+    ip_rate = parse_rate(per_ip) if per_ip else None
+    route_rate = parse_rate(per_route) if per_route else None
+
+    def limiter(request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        if ip_rate:
+            _enforce(f"{route}:ip:{client_ip(request)}", ip_rate)
+        if route_rate:
+            _enforce(f"{route}:route", route_rate)
+    return limiter
+
+
+def username_rate_limit(route: str, per_username: str):
+    """
+    Token-bucket limit per submitted username (login form), so guessing
+    one account's password is throttled however many IPs it comes from.
+    Shares the parsed form with the route, so the body is read once.
+    """
+    username_rate = parse_rate(per_username)
+
+    def limiter(form_data: OAuth2PasswordRequestForm = Depends()):
+        if settings.RATE_LIMIT_ENABLED:
+            _enforce(f"{route}:username:{form_data.username.strip().lower()}", username_rate)
+    return limiter
+
+
+def user_rate_limit(route: str, per_user: str):
+    """
+    Token-bucket limit per authenticated user. Reuses the request's
+    get_current_user result, so it adds no extra lookup.
+    """
+    user_rate = parse_rate(per_user)
+
+    def limiter(user: User = Depends(get_current_user)):
+        if settings.RATE_LIMIT_ENABLED:
+            _enforce(f"{route}:user:{user.id}", user_rate)
+        return user
+    return limiter
+
+
+# --------------------
+# Location Routing
+# --------------------
+def request_location(request: Request, current_user: User = Depends(get_current_user)) -> str:
+    """
+    Customers and drivers always work in their own site. Admins pick one
+    with the X-Location header (or ?location=), defaulting to the main site.
+    """
+    if current_user.role == UserRole.admin:
+        location = request.headers.get("x-location") or request.query_params.get("location")
+        if location:
+            if not shard_router.is_known(location):
+                raise HTTPException(status_code=400, detail=f"Unknown location '{location}'")
+            return location
+        return settings.DEFAULT_LOCATION
+    return current_user.location or settings.DEFAULT_LOCATION
+
+
+def get_order_db(
+    location: str = Depends(request_location),
+    directory_db: Session = Depends(get_db),
+):
+    """
+    Session on the shard holding the caller's orders. On a single-database
+    deployment this is the request's existing session, so no second
+    connection is taken from the pool.
+    """
+    if shard_router.engine_for(location) is directory_db.get_bind():
+        yield directory_db
+        return
+
+    db = shard_router.session_for(location)
+    try:
+        yield db
+    finally:
+        db.close()
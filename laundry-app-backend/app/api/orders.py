@@ -1,16 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, UploadFile
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
-from typing import Optional
-from app.schemas.order_response import OrderPublic, OrderTimeline, ListResponse, ListMeta
-from app.schemas.order import OrderCreate
+from typing import Optional, List
+from datetime import date, datetime, timedelta
+from uuid import UUID
+from app.schemas.order_response import (
+    OrderPublic, OrderTimeline, ListResponse, ListMeta, CursorListResponse, CursorMeta,
+    SyncOrder, SyncRemoval, SyncPullResponse, SyncItemResult, SyncPushResponse, DriverManifest,
+)
+from app.schemas.order import OrderCreate, SyncPushRequest, LaundryType as SchemaLaundryType
+from app.schemas.pickup_slot import PickupSlotBatchCreate, PickupSlotPublic
+from app.services.pickup_slots import book_slot, available_slots, create_slots
+from app.models.pickup_slot import PickupSlot
 from app.models.order import Order, OrderStatus, LaundryType as ModelLaundryType
 from app.services.pricing import calc_price
+from app.services.pricing_rules import pricing_store, extract_zip
 from app.services.email_service import send_order_status_update_email
-from app.api.deps import get_db, customer_user, admin_user, driver_user
+from app.api.deps import get_db, get_order_db, request_location, customer_user, admin_user, driver_user, user_rate_limit
+from app.db.session import shard_router
+from app.services.user_mirror import mirror_user
+from app.services.driver_manifest import build_manifest, resequence_route
+from app.services.order_import import import_orders_csv
+from app.services.addresses import get_address_id
+from app.core.config import settings
 from app.models.user import User, UserRole
 from app.db.base import Base
 from app.services.stripe_service import create_payment_intent
+from app.core.resilience import DependencyUnavailable
 from app.core.email import send_order_status_update_email
+from app.services.order_archive import customer_history
+from app.models.order_rollup import OrderDailyRollup
+from app.models.order_event import OrderEventType
+from app.services.order_events import record_event, status_timestamps, stage_histograms, merge_histograms, summarize_histograms
+from app.services.order_query import OrderQuery, parse_fields, parse_sort, run_order_query
+from app.services.order_search import search_terms, text_match_clause, keyset_after_clause, encode_cursor
+from app.services.change_feed import visible_clause, after_cursor_clause, encode_sync_cursor
+from app.models.order_sync_tombstone import OrderSyncTombstone
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 ALLOWED_STATUS_TRANSITIONS = {
@@ -20,21 +46,58 @@ ALLOWED_STATUS_TRANSITIONS = {
 }
 
 
-@router.post("/create")
+def transition_error(current_status: str, requested_status: str) -> Optional[str]:
+    if requested_status not in ALLOWED_STATUS_TRANSITIONS.get(current_status, []):
+        return f"Invalid status transition from '{current_status}' to '{requested_status}'"
+    return None
+
+
+@router.post(
+    "/create",
+    dependencies=[Depends(user_rate_limit("orders:create", settings.ORDER_CREATE_RATE_PER_USER))],
+)
 def create_order(
     order_data: OrderCreate,
     current_user = Depends(customer_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_order_db),
+    directory_db: Session = Depends(get_db),
 ):
+    laundry_type = ModelLaundryType(order_data.laundry_type.value)
+    zip_code = extract_zip(order_data.pickup_address)
+
+    if order_data.pickup_slot_id is not None:
+        if not book_slot(db, order_data.pickup_slot_id, order_data.pickup_date, zip_code):
+            slot = db.query(PickupSlot).filter(PickupSlot.id == order_data.pickup_slot_id).first()
+            db.rollback()
+            if not slot:
+                raise HTTPException(status_code=404, detail="Pickup slot not found")
+            if slot.booked >= slot.capacity:
+                raise HTTPException(status_code=409, detail="Pickup slot is fully booked")
+            raise HTTPException(status_code=400, detail="Pickup slot does not match pickup date or address zone")
+
+    mirror_user(db, current_user, directory_db)
+
+    # snapshot the rates in effect for this booking
+    rates = pricing_store.resolve(laundry_type, zip_code, order_data.pickup_date)
+
     new_order = Order(
+        id=uuid.uuid4(),  # known up front so the created event needs no flush
         customer_id=current_user.id,
+        location=current_user.location,
         pickup_address=order_data.pickup_address,
-        laundry_type=ModelLaundryType(order_data.laundry_type.value),
+        address_id=get_address_id(db, order_data.pickup_address),  # geocoded later by the resolver job
+        laundry_type=laundry_type,
         pickup_date=order_data.pickup_date,
         special_instructions=order_data.special_instructions,
+        pickup_slot_id=order_data.pickup_slot_id,
+        price_per_lb_cents=rates.price_per_lb_cents,
+        service_fee_cents=rates.service_fee_cents,
+        delivery_fee_cents=rates.delivery_fee_cents,
+        tax_rate_bp=rates.tax_rate_bp,
     )
 
     db.add(new_order)
+    record_event(db, new_order.id, OrderEventType.created, OrderStatus.scheduled, current_user.id)
     db.commit()
     db.refresh(new_order)
 
@@ -44,39 +107,104 @@ def create_order(
         "status": new_order.status.value
     }
 
+@router.get("/slots/available", response_model=List[PickupSlotPublic], summary="Customer: free pickup slots for the next N days")
+def get_available_slots(
+    days: int = 7,
+    zip_code: Optional[str] = None,
+    current_user: User = Depends(customer_user),
+    db: Session = Depends(get_order_db),
+):
+    days = max(1, min(days, 30))
+    return available_slots(db, date.today(), days, zip_code)
+
+
+@router.post("/admin/slots", summary="Admin: create pickup slots for a date range")
+def admin_create_slots(
+    slot_data: PickupSlotBatchCreate,
+    admin: User = Depends(admin_user),
+    db: Session = Depends(get_order_db),
+):
+    if slot_data.date_to < slot_data.date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    if (slot_data.date_to - slot_data.date_from).days > 90:
+        raise HTTPException(status_code=400, detail="At most 90 days of slots per request")
+    if any(w.end <= w.start for w in slot_data.windows):
+        raise HTTPException(status_code=400, detail="Each window must end after it starts")
+
+    created = create_slots(
+        db,
+        slot_data.date_from,
+        slot_data.date_to,
+        [(w.start, w.end) for w in slot_data.windows],
+        slot_data.zone,
+        slot_data.capacity,
+    )
+
+    return {"message": "Pickup slots created", "created": created}
+
+
+@router.post("/admin/import", summary="Admin: bulk import orders from CSV")
+def admin_import_orders(
+    file: UploadFile,
+    chunk_size: int = 5000,
+    admin: User = Depends(admin_user),
+    location: str = Depends(request_location),
+    db: Session = Depends(get_order_db),
+    directory_db: Session = Depends(get_db),
+):
+    """
+    Columns: customer_email, pickup_address, laundry_type, pickup_date
+    and optionally special_instructions. Orders go to the location chosen
+    with X-Location; bad rows are reported and skipped.
+    """
+    chunk_size = max(100, min(chunk_size, 20000))
+    try:
+        result = import_orders_csv(file.file, db, directory_db, location, chunk_size, actor_id=admin.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result.as_dict()
+
+
 @router.get("/my", response_model=ListResponse, summary="Customer: track my orders (paginated)")
 def track_my_orders(
     limit: int = 20,
     offset: int = 0,
     status: Optional[OrderStatus] = None,
     current_user: User = Depends(customer_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_order_db),
 ):
     # guardrails
     limit = max(1, min(limit, 100))
     offset = max(0, offset)
 
-    base_q = db.query(Order).filter(Order.customer_id == current_user.id)
-
-    if status:
-        base_q = base_q.filter(Order.status == status)
+    # live + archived orders, read as one history
+    history = customer_history(current_user.id, status)
 
-    total = base_q.count()
+    total = db.scalar(select(func.count()).select_from(history))
 
-    orders = (
-        base_q.order_by(Order.pickup_date.desc())
+    orders = db.execute(
+        select(history)
+        .order_by(history.c.pickup_date.desc(), history.c.id.desc())
         .limit(limit)
         .offset(offset)
-        .all()
-    )
+    ).all()
+
+    # one query for the whole page
+    stamps = status_timestamps(db, [o.id for o in orders])
 
-    def timeline_for(s: OrderStatus) -> OrderTimeline:
+    def timeline_for(order_id, s: OrderStatus) -> OrderTimeline:
+        at = stamps.get(order_id, {})
         return OrderTimeline(
             scheduled=True,
             picked_up=s in [OrderStatus.picked_up, OrderStatus.in_cleaning, OrderStatus.ready_for_delivery, OrderStatus.delivered],
             in_cleaning=s in [OrderStatus.in_cleaning, OrderStatus.ready_for_delivery, OrderStatus.delivered],
             ready_for_delivery=s in [OrderStatus.ready_for_delivery, OrderStatus.delivered],
             delivered=s == OrderStatus.delivered,
+            scheduled_at=at.get(OrderStatus.scheduled),
+            picked_up_at=at.get(OrderStatus.picked_up),
+            in_cleaning_at=at.get(OrderStatus.in_cleaning),
+            ready_for_delivery_at=at.get(OrderStatus.ready_for_delivery),
+            delivered_at=at.get(OrderStatus.delivered),
         )
 
     data = [
@@ -88,11 +216,11 @@ def track_my_orders(
             special_instructions=o.special_instructions,
             driver_id=o.driver_id,
             customer_id=o.customer_id,
-            weight_lbs=getattr(o, "weight_lbs", None),
-            subtotal_cents=getattr(o, "subtotal_cents", None),
-            tax_cents=getattr(o, "tax_cents", None),
-            total_cents=getattr(o, "total_cents", None),
-            timeline=timeline_for(o.status),
+            weight_lbs=o.weight_lbs,
+            subtotal_cents=o.subtotal_cents,
+            tax_cents=o.tax_cents,
+            total_cents=o.total_cents,
+            timeline=timeline_for(o.id, o.status),
         )
         for o in orders
     ]
@@ -105,21 +233,36 @@ def track_my_orders(
 
 @router.patch("/assign/{order_id}")
 def assign_order_to_driver(
-    order_id: str,
-    driver_id: str,
+    order_id: UUID,
+    driver_id: UUID,
     admin = Depends(admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_order_db),
+    directory_db: Session = Depends(get_db),
 ):
     order = db.query(Order).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    driver = db.query(User).filter(User.id == driver_id, User.role == UserRole.driver).first()
+    driver = directory_db.query(User).filter(User.id == driver_id, User.role == UserRole.driver).first()
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found or is not a driver")
 
+    # drivers belong to a site and only serve its orders
+    if driver.location != order.location:
+        raise HTTPException(status_code=400, detail="Driver works at a different location")
+
+    mirror_user(db, driver, directory_db)
+
+    previous_driver_id = order.driver_id
     order.driver_id = driver.id
     order.status = OrderStatus.picked_up  # optional, can be changed later
+    record_event(db, order.id, OrderEventType.assigned, order.status, admin.id)
+
+    db.flush()
+    resequence_route(db, driver.id, order.pickup_date)
+    if previous_driver_id is not None and previous_driver_id != driver.id:
+        # close the gap the order leaves in the old route
+        resequence_route(db, previous_driver_id, order.pickup_date)
 
     db.commit()
     db.refresh(order)
@@ -137,7 +280,7 @@ def get_assigned_orders(
     offset: int = 0,
     status: Optional[OrderStatus] = None,
     current_user: User = Depends(driver_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_order_db),
 ):
     limit = max(1, min(limit, 100))
     offset = max(0, offset)
@@ -173,12 +316,20 @@ def get_assigned_orders(
         meta=ListMeta(limit=limit, offset=offset, count=len(data), total=total),
     )
 
+@router.get("/driver/manifest", response_model=DriverManifest, summary="Driver: all stops for a day in route order")
+def get_driver_manifest(
+    pickup_date: Optional[date] = None,
+    current_user: User = Depends(driver_user),
+    db: Session = Depends(get_order_db),
+):
+    return build_manifest(db, current_user.id, pickup_date or date.today())
+
 @router.patch("/driver/update-status/{order_id}", summary="Driver: update order status")
 def update_order_status(
-    order_id: str,
+    order_id: UUID,
     new_status: OrderStatus,
     current_user: User = Depends(driver_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_order_db)
 ):
     order = db.query(Order).filter(Order.id == order_id).first()
 
@@ -191,15 +342,12 @@ def update_order_status(
     current_status = order.status.value
     requested_status = new_status.value
 
-    allowed_next = ALLOWED_STATUS_TRANSITIONS.get(current_status, [])
-
-    if requested_status not in allowed_next:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid status transition from '{current_status}' to '{requested_status}'",
-        )
+    error = transition_error(current_status, requested_status)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
 
     order.status = new_status
+    record_event(db, order.id, OrderEventType.status_changed, new_status, current_user.id)
     db.commit()
     db.refresh(order)
 
@@ -212,113 +360,397 @@ def update_order_status(
         "new_status": requested_status,
     }
 
-@router.get("/admin/all", summary="Admin: view all orders")
-def admin_view_all_orders(
+@router.get("/driver/sync", response_model=SyncPullResponse, summary="Driver: pull orders changed since a cursor")
+def driver_sync_pull(
+    cursor: Optional[str] = None,
+    limit: int = 200,
+    current_user: User = Depends(driver_user),
+    db: Session = Depends(get_order_db),
+):
+    """
+    Orders assigned to the driver that changed after `cursor`, plus
+    removals for orders taken off the driver's list. Both streams page
+    together by (change_seq, order_id); keep the returned cursor only
+    after applying the whole page.
+    """
+    limit = max(1, min(limit, 500))
+
+    orders = (
+        db.query(Order)
+        .filter(
+            Order.driver_id == current_user.id,
+            visible_clause(db, Order.change_seq),
+            after_cursor_clause(cursor, Order.change_seq, Order.id),
+        )
+        .order_by(Order.change_seq, Order.id)
+        .limit(limit + 1)
+        .all()
+    )
+    # an order that came back to this driver is sent as data instead
+    still_assigned = (
+        select(Order.id)
+        .where(Order.id == OrderSyncTombstone.order_id, Order.driver_id == current_user.id)
+        .exists()
+    )
+    tombstones = db.execute(
+        select(OrderSyncTombstone.order_id, OrderSyncTombstone.change_seq)
+        .where(
+            OrderSyncTombstone.driver_id == current_user.id,
+            visible_clause(db, OrderSyncTombstone.change_seq),
+            after_cursor_clause(cursor, OrderSyncTombstone.change_seq, OrderSyncTombstone.order_id),
+            ~still_assigned,
+        )
+        .order_by(OrderSyncTombstone.change_seq, OrderSyncTombstone.order_id)
+        .limit(limit + 1)
+    ).all()
+
+    # merge both streams by (change_seq, order_id) and cut one page
+    page = sorted(
+        [(o.change_seq, o.id, o) for o in orders] + [(t.change_seq, t.order_id, None) for t in tombstones],
+        key=lambda item: (item[0], item[1]),
+    )
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    data = [
+        SyncOrder(
+            order_id=o.id,
+            pickup_address=o.pickup_address,
+            pickup_date=o.pickup_date,
+            status=o.status.value,
+            special_instructions=o.special_instructions,
+            driver_id=o.driver_id,
+            customer_id=o.customer_id,
+            change_seq=o.change_seq,
+            updated_at=o.updated_at,
+        )
+        for _, _, o in page if o is not None
+    ]
+    removed = [
+        SyncRemoval(order_id=order_id, change_seq=seq)
+        for seq, order_id, o in page if o is None
+    ]
+
+    return SyncPullResponse(
+        data=data,
+        removed=removed,
+        cursor=encode_sync_cursor(page[-1][0], page[-1][1]) if page else cursor,
+        has_more=has_more,
+    )
+
+
+@router.post("/driver/sync", response_model=SyncPushResponse, summary="Driver: push a batch of queued status changes")
+def driver_sync_push(
+    payload: SyncPushRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(driver_user),
+    db: Session = Depends(get_order_db),
+):
+    """
+    Applies queued changes in order. The response carries no cursor:
+    pushed changes come back through the next pull, from the cursor the
+    client already holds.
+    """
+    order_ids = {c.order_id for c in payload.changes}
+    orders = {
+        o.id: o
+        for o in db.query(Order).filter(Order.id.in_(order_ids)).with_for_update().all()
+    }
+
+    # Items apply in order, so one order can move through several statuses in a batch
+    results = []
+    applied = []
+    for change in payload.changes:
+        order = orders.get(change.order_id)
+        if not order:
+            error = "Order not found"
+        elif order.driver_id != current_user.id:
+            error = "Not your assigned order"
+        else:
+            error = transition_error(order.status.value, change.new_status.value)
+
+        if error:
+            results.append(SyncItemResult(
+                client_ref=change.client_ref,
+                order_id=change.order_id,
+                ok=False,
+                status=order.status.value if order else None,
+                error=error,
+            ))
+            continue
+
+        order.status = change.new_status
+        record_event(db, order.id, OrderEventType.status_changed, change.new_status, current_user.id)
+        applied.append((order.id, change.new_status.value))
+        results.append(SyncItemResult(
+            client_ref=change.client_ref,
+            order_id=change.order_id,
+            ok=True,
+            status=change.new_status.value,
+        ))
+
+    db.commit()
+
+    for order_id, new_status in applied:
+        background_tasks.add_task(send_order_status_update_email, order_id, current_user.email, new_status)
+
+    return SyncPushResponse(results=results, applied=len(applied))
+
+
+@router.get("/admin/query", summary="Admin: query orders with combinable filters, projection and keyset paging")
+def admin_query_orders(
+    status: Optional[List[OrderStatus]] = Query(None),
+    driver_id: Optional[UUID] = None,
+    customer_id: Optional[UUID] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    is_paid: Optional[bool] = None,
+    laundry_type: Optional[SchemaLaundryType] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated, e.g. order_id,status,total_cents"),
+    sort: Optional[str] = Query(None, description="Comma-separated keys, '-' for descending, e.g. -pickup_date"),
+    limit: int = 50,
+    cursor: Optional[str] = None,
     admin: User = Depends(admin_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_order_db),
 ):
-    orders = db.query(Order).order_by(Order.pickup_date.desc()).all()
+    limit = max(1, min(limit, 500))
+
+    try:
+        query = OrderQuery(
+            filters={
+                "statuses": status,
+                "driver_id": driver_id,
+                "customer_id": customer_id,
+                "date_from": date_from,
+                "date_to": date_to,
+                "is_paid": is_paid,
+                "laundry_type": ModelLaundryType(laundry_type.value) if laundry_type else None,
+            },
+            fields=parse_fields(fields),
+            sort=parse_sort(sort),
+            cursor=cursor,
+            limit=limit,
+        )
+        data, next_cursor = run_order_query(db, query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
-        "total_orders": len(orders),
-        "orders": [
-            {
-                "order_id": o.id,
-                "customer_id": o.customer_id,
-                "driver_id": o.driver_id,
-                "pickup_address": o.pickup_address,
-                "pickup_date": o.pickup_date,
-                "status": o.status.value,
-            }
-            for o in orders
-        ],
+        "data": data,
+        "meta": {"limit": limit, "count": len(data), "next_cursor": next_cursor},
     }
 
 
-@router.get("/admin/by-status", summary="Admin: filter orders by status")
-def admin_filter_by_status(
-    status: OrderStatus,
+@router.get("/admin/search", response_model=CursorListResponse, summary="Admin: search orders by address or instructions")
+def admin_search_orders(
+    q: str,
+    status: Optional[List[OrderStatus]] = Query(None),
+    driver_id: Optional[UUID] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
     admin: User = Depends(admin_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_order_db),
 ):
+    limit = max(1, min(limit, 100))
+
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query must contain at least one word")
+
+    base_q = db.query(Order).filter(text_match_clause(db, terms))
+
+    if status:
+        base_q = base_q.filter(Order.status.in_(status))
+    if driver_id:
+        base_q = base_q.filter(Order.driver_id == driver_id)
+    if date_from:
+        base_q = base_q.filter(Order.pickup_date >= date_from)
+    if date_to:
+        base_q = base_q.filter(Order.pickup_date <= date_to)
+
+    after = keyset_after_clause(cursor)
+    if after is not None:
+        base_q = base_q.filter(after)
+
+    # fetch one extra row to know whether another page exists
     orders = (
-        db.query(Order)
-        .filter(Order.status == status)
-        .order_by(Order.pickup_date.desc())
+        base_q.order_by(Order.pickup_date.desc(), Order.id.desc())
+        .limit(limit + 1)
         .all()
     )
+    has_more = len(orders) > limit
+    orders = orders[:limit]
+
+    data = [
+        OrderPublic(
+            order_id=o.id,
+            pickup_address=o.pickup_address,
+            pickup_date=o.pickup_date,
+            status=o.status.value,
+            special_instructions=o.special_instructions,
+            driver_id=o.driver_id,
+            customer_id=o.customer_id,
+        )
+        for o in orders
+    ]
+
+    next_cursor = encode_cursor(orders[-1].pickup_date, orders[-1].id) if has_more else None
+
+    return CursorListResponse(
+        data=data,
+        meta=CursorMeta(limit=limit, count=len(data), next_cursor=next_cursor),
+    )
+
+
+@router.get("/admin/summary", summary="Admin: order summary across all locations")
+def admin_order_summary(
+    admin: User = Depends(admin_user),
+):
+    stmt = select(Order.location, Order.status, func.count()).group_by(Order.location, Order.status)
+    per_shard = shard_router.fan_out(lambda db: db.execute(stmt).all())
+
+    summary = {status.value: 0 for status in OrderStatus}
+    by_location = {}
+    for rows in per_shard:
+        for location, status, count in rows:
+            summary[status.value] += count
+            by_location[location] = by_location.get(location, 0) + count
 
     return {
-        "status": status.value,
-        "count": len(orders),
-        "orders": [
-            {
-                "order_id": o.id,
-                "customer_id": o.customer_id,
-                "driver_id": o.driver_id,
-                "pickup_address": o.pickup_address,
-                "pickup_date": o.pickup_date,
-            }
-            for o in orders
-        ],
+        "total_orders": sum(summary.values()),
+        "by_status": summary,
+        "by_location": by_location,
     }
 
 
-@router.get("/admin/by-driver", summary="Admin: filter orders by driver")
-def admin_filter_by_driver(
-    driver_id: str,
+ANALYTICS_GROUPS = {
+    "status": OrderDailyRollup.status,
+    "laundry_type": OrderDailyRollup.laundry_type,
+    "driver": OrderDailyRollup.driver_id,
+}
+
+
+@router.get("/admin/analytics/daily", summary="Admin: daily revenue and operations time-series")
+def admin_daily_analytics(
+    date_from: date,
+    date_to: date,
+    group_by: Optional[str] = None,
+    status: Optional[List[OrderStatus]] = Query(None),
     admin: User = Depends(admin_user),
-    db: Session = Depends(get_db),
 ):
-    orders = (
-        db.query(Order)
-        .filter(Order.driver_id == driver_id)
-        .order_by(Order.pickup_date.desc())
-        .all()
+    if group_by and group_by not in ANALYTICS_GROUPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"group_by must be one of: {', '.join(ANALYTICS_GROUPS)}",
+        )
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+
+    r = OrderDailyRollup
+    group_cols = [r.day]
+    if group_by:
+        group_cols.append(ANALYTICS_GROUPS[group_by].label("group"))
+
+    stmt = (
+        select(
+            *group_cols,
+            func.sum(r.order_count).label("order_count"),
+            func.sum(r.paid_count).label("paid_count"),
+            func.sum(r.weight_lbs).label("weight_lbs"),
+            func.sum(r.subtotal_cents).label("subtotal_cents"),
+            func.sum(r.tax_cents).label("tax_cents"),
+            func.sum(r.total_cents).label("total_cents"),
+            func.sum(r.paid_total_cents).label("paid_total_cents"),
+        )
+        .where(r.day >= date_from, r.day <= date_to)
+        .group_by(*group_cols)
+        .order_by(*group_cols)
     )
+    if status:
+        stmt = stmt.where(r.status.in_(status))
+
+    # every location's rollups, summed per (day, group)
+    merged = {}
+    for rows in shard_router.fan_out(lambda db: db.execute(stmt).all()):
+        for row in rows:
+            point = dict(row._mapping)
+            if group_by:
+                group = point["group"]
+                point["group"] = group.value if hasattr(group, "value") else str(group)
+            key = (point["day"], point.get("group"))
+            if key in merged:
+                for measure, value in point.items():
+                    if measure not in ("day", "group"):
+                        merged[key][measure] += value
+            else:
+                merged[key] = point
+
+    series = [merged[k] for k in sorted(merged)]
 
     return {
-        "driver_id": driver_id,
-        "count": len(orders),
-        "orders": [
-            {
-                "order_id": o.id,
-                "customer_id": o.customer_id,
-                "status": o.status.value,
-                "pickup_address": o.pickup_address,
-                "pickup_date": o.pickup_date,
-            }
-            for o in orders
-        ],
+        "date_from": date_from,
+        "date_to": date_to,
+        "group_by": group_by,
+        "series": series,
     }
 
 
-@router.get("/admin/summary", summary="Admin: order summary")
-def admin_order_summary(
+@router.get("/admin/sla", summary="Admin: turnaround percentiles from the order event log")
+def admin_sla_percentiles(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
     admin: User = Depends(admin_user),
-    db: Session = Depends(get_db),
 ):
-    summary = {}
+    # defaults to orders created in the last 30 days
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=30)
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
 
-    for status in OrderStatus:
-        summary[status.value] = (
-            db.query(Order).filter(Order.status == status).count()
-        )
+    created_from = datetime.combine(date_from, datetime.min.time())
+    created_to = datetime.combine(date_to + timedelta(days=1), datetime.min.time())
+
+    # percentiles don't merge, but histograms do: add up every location's first
+    histograms = shard_router.fan_out(lambda db: stage_histograms(db, created_from, created_to))
+    stages = summarize_histograms(merge_histograms(histograms))
 
     return {
-        "total_orders": sum(summary.values()),
-        "by_status": summary,
+        "date_from": date_from,
+        "date_to": date_to,
+        "stages": stages,
     }
 
 
 @router.get("/quote", summary="Customer: get pricing quote by weight")
 def quote_price(
     weight_lbs: int,
+    laundry_type: SchemaLaundryType = SchemaLaundryType.regular,
+    zip_code: Optional[str] = None,
+    pickup_date: Optional[date] = None,
     current_user: User = Depends(customer_user),
 ):
-    breakdown = calc_price(weight_lbs)
+    rates = pricing_store.resolve(
+        ModelLaundryType(laundry_type.value),
+        zip_code,
+        pickup_date or date.today(),
+    )
+
+    try:
+        breakdown = calc_price(
+            weight_lbs=weight_lbs,
+            price_per_lb_cents=rates.price_per_lb_cents,
+            service_fee_cents=rates.service_fee_cents,
+            delivery_fee_cents=rates.delivery_fee_cents,
+            tax_rate_bp=rates.tax_rate_bp,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
+        "tax_jurisdiction": rates.tax_jurisdiction,
+        "pricing_version": pricing_store.table.version,
         "weight_lbs": breakdown.weight_lbs,
         "price_per_lb_cents": breakdown.price_per_lb_cents,
         "service_fee_cents": breakdown.service_fee_cents,
@@ -332,22 +764,26 @@ def quote_price(
 
 @router.patch("/admin/set-weight/{order_id}", summary="Admin: set weight and calculate totals")
 def admin_set_weight_and_price(
-    order_id: str,
+    order_id: UUID,
     weight_lbs: int,
     admin: User = Depends(admin_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_order_db),
 ):
     order = db.query(Order).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    breakdown = calc_price(
-        weight_lbs=weight_lbs,
-        price_per_lb_cents=order.price_per_lb_cents,
-        service_fee_cents=order.service_fee_cents,
-        delivery_fee_cents=order.delivery_fee_cents,
-        tax_rate_bp=order.tax_rate_bp,
-    )
+    # price from the rates snapshotted at booking, not today's rules
+    try:
+        breakdown = calc_price(
+            weight_lbs=weight_lbs,
+            price_per_lb_cents=order.price_per_lb_cents,
+            service_fee_cents=order.service_fee_cents,
+            delivery_fee_cents=order.delivery_fee_cents,
+            tax_rate_bp=order.tax_rate_bp,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     order.weight_lbs = breakdown.weight_lbs
     order.subtotal_cents = breakdown.subtotal_cents
@@ -369,9 +805,9 @@ def admin_set_weight_and_price(
 
 @router.post("/pay/{order_id}", summary="Customer: pay for order")
 def pay_for_order(
-    order_id: str,
+    order_id: UUID,
     current_user: User = Depends(customer_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_order_db),
 ):
     order = db.query(Order).filter(Order.id == order_id).first()
     if not order:
@@ -386,7 +822,14 @@ def pay_for_order(
     if order.is_paid:
         raise HTTPException(status_code=400, detail="Order already paid")
 
-    intent = create_payment_intent(order.total_cents, str(order.id))
+    try:
+        intent = create_payment_intent(order.total_cents, str(order.id), order.location)
+    except DependencyUnavailable as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Payments are temporarily unavailable, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
     order.stripe_payment_intent_id = intent.id
     db.commit()
@@ -0,0 +1,86 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, admin_user
+from app.models.order import LaundryType as ModelLaundryType
+from app.models.pricing_rule import PricingRule
+from app.models.user import User
+from app.schemas.pricing import PricingRuleCreate, PricingRulePublic
+from app.services.pricing_rules import pricing_store
+
+router = APIRouter(prefix="/pricing", tags=["Pricing"])
+
+
+def _public(rule: PricingRule) -> PricingRulePublic:
+    return PricingRulePublic(
+        id=rule.id,
+        laundry_type=rule.laundry_type.value if rule.laundry_type else None,
+        zip_prefix=rule.zip_prefix,
+        effective_from=rule.effective_from,
+        effective_to=rule.effective_to,
+        tax_jurisdiction=rule.tax_jurisdiction,
+        price_per_lb_cents=rule.price_per_lb_cents,
+        service_fee_cents=rule.service_fee_cents,
+        delivery_fee_cents=rule.delivery_fee_cents,
+        tax_rate_bp=rule.tax_rate_bp,
+    )
+
+
+@router.get("/rules", response_model=List[PricingRulePublic], summary="Admin: list pricing rules")
+def list_pricing_rules(
+    admin: User = Depends(admin_user),
+    db: Session = Depends(get_db),
+):
+    rules = db.query(PricingRule).order_by(PricingRule.effective_from.desc(), PricingRule.id).all()
+    return [_public(r) for r in rules]
+
+
+@router.post("/rules", response_model=PricingRulePublic, summary="Admin: add a pricing rule")
+def create_pricing_rule(
+    rule_data: PricingRuleCreate,
+    admin: User = Depends(admin_user),
+    db: Session = Depends(get_db),
+):
+    if rule_data.effective_to and rule_data.effective_to < rule_data.effective_from:
+        raise HTTPException(status_code=400, detail="effective_to must not be before effective_from")
+
+    rule = PricingRule(
+        **rule_data.model_dump(exclude={"laundry_type"}),
+        laundry_type=ModelLaundryType(rule_data.laundry_type.value) if rule_data.laundry_type else None,
+    )
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+
+    # this worker picks it up now; others on their next poll
+    pricing_store.reload(db)
+
+    return _public(rule)
+
+
+@router.delete("/rules/{rule_id}", summary="Admin: delete a pricing rule")
+def delete_pricing_rule(
+    rule_id: int,
+    admin: User = Depends(admin_user),
+    db: Session = Depends(get_db),
+):
+    rule = db.query(PricingRule).filter(PricingRule.id == rule_id).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Pricing rule not found")
+
+    db.delete(rule)
+    db.commit()
+    pricing_store.reload(db)
+
+    return {"message": "Pricing rule deleted", "rule_id": rule_id}
+
+
+@router.post("/reload", summary="Admin: reload the in-memory pricing table")
+def reload_pricing_table(
+    admin: User = Depends(admin_user),
+    db: Session = Depends(get_db),
+):
+    pricing_store.reload(db, force=True)
+    table = pricing_store.table
+    return {"version": table.version, "rules": table.rule_count}
@@ -0,0 +1,91 @@
+from datetime import date
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_order_db, customer_user
+from app.models.order import LaundryType as ModelLaundryType
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.schemas.subscription import SubscriptionCreate, SubscriptionPublic
+from app.services.user_mirror import mirror_user
+
+router = APIRouter(prefix="/subscriptions", tags=["Subscriptions"])
+
+
+def _public(sub: Subscription) -> SubscriptionPublic:
+    return SubscriptionPublic(
+        subscription_id=sub.id,
+        cadence=sub.cadence,
+        anchor_date=sub.anchor_date,
+        end_date=sub.end_date,
+        pickup_address=sub.pickup_address,
+        laundry_type=sub.laundry_type.value,
+        special_instructions=sub.special_instructions,
+        is_active=sub.is_active,
+    )
+
+
+@router.post("/", response_model=SubscriptionPublic, summary="Customer: start a recurring pickup")
+def create_subscription(
+    payload: SubscriptionCreate,
+    current_user: User = Depends(customer_user),
+    db: Session = Depends(get_order_db),
+    directory_db: Session = Depends(get_db),
+):
+    if payload.anchor_date < date.today():
+        raise HTTPException(status_code=400, detail="First pickup must not be in the past")
+    if payload.end_date and payload.end_date < payload.anchor_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after anchor_date")
+
+    mirror_user(db, current_user, directory_db)
+
+    sub = Subscription(
+        customer_id=current_user.id,
+        location=current_user.location,
+        cadence=payload.cadence,
+        anchor_date=payload.anchor_date,
+        end_date=payload.end_date,
+        pickup_address=payload.pickup_address,
+        laundry_type=ModelLaundryType(payload.laundry_type.value),
+        special_instructions=payload.special_instructions,
+    )
+    db.add(sub)
+    db.commit()
+    db.refresh(sub)
+    return _public(sub)
+
+
+@router.get("/my", response_model=List[SubscriptionPublic], summary="Customer: my recurring pickups")
+def list_my_subscriptions(
+    current_user: User = Depends(customer_user),
+    db: Session = Depends(get_order_db),
+):
+    subs = (
+        db.query(Subscription)
+        .filter(Subscription.customer_id == current_user.id)
+        .order_by(Subscription.created_at.desc())
+        .all()
+    )
+    return [_public(s) for s in subs]
+
+
+@router.delete("/{subscription_id}", summary="Customer: cancel a recurring pickup")
+def cancel_subscription(
+    subscription_id: UUID,
+    current_user: User = Depends(customer_user),
+    db: Session = Depends(get_order_db),
+):
+    """
+    Stops future generation; orders already generated are kept.
+    """
+    sub = db.query(Subscription).filter(Subscription.id == subscription_id).first()
+    if not sub:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    if sub.customer_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not your subscription")
+
+    sub.is_active = False
+    db.commit()
+    return {"message": "Subscription cancelled", "subscription_id": str(sub.id)}
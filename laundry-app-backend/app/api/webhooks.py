@@ -1,17 +1,18 @@
 import stripe
 import os
+from uuid import UUID
 from fastapi import APIRouter, Request, HTTPException
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import shard_router
 from app.models.order import Order
-from sqlalchemy.orm import Session
-from fastapi import Depends
+from app.models.order_event import OrderEventType
+from app.services.order_events import record_event
 
 router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
 
 @router.post("/stripe")
 async def stripe_webhook(
     request: Request,
-    db: Session = Depends(get_db),
 ):
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
@@ -28,10 +29,20 @@ async def stripe_webhook(
     if event["type"] == "payment_intent.succeeded":
         intent = event["data"]["object"]
         order_id = intent["metadata"].get("order_id")
+        # intents created before sharding carry no location
+        location = intent["metadata"].get("location", settings.DEFAULT_LOCATION)
+        if not order_id:
+            return {"status": "ok"}
 
-        order = db.query(Order).filter(Order.id == order_id).first()
-        if order:
-            order.is_paid = True
-            db.commit()
+        db = shard_router.session_for(location)
+        try:
+            order = db.query(Order).filter(Order.id == UUID(order_id)).first()
+            # Stripe redelivers events; only the first delivery marks it paid
+            if order and not order.is_paid:
+                order.is_paid = True
+                record_event(db, order.id, OrderEventType.paid, order.status)
+                db.commit()
+        finally:
+            db.close()
 
     return {"status": "ok"}
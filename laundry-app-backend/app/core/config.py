@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     # JWT & Auth
@@ -7,15 +7,88 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
+    JWT_BACKEND: str = "jose"  # "jose" or "pyjwt" (see app/core/jwt_backend.py)
+    TOKEN_CACHE_SIZE: int = 10000  # verified tokens kept in memory, per worker
     FRONTEND_BASE_URL: str
     
     # Database
     DATABASE_URL: str
 
+    # Multi-location sharding: JSON map of location -> database URL.
+    # Locations not listed (and DEFAULT_LOCATION) use DATABASE_URL.
+    DEFAULT_LOCATION: str = "main"
+    SHARD_DATABASE_URLS: Dict[str, str] = {}
+
+    # Order archiving (hot/cold split)
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 500
+
+    # Rate limiting ("requests/seconds") and load shedding
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORE: str = "memory"  # "memory" (per worker) or "shared"
+    TRUST_PROXY_HEADERS: bool = False  # use X-Forwarded-For for the client IP
+    LOGIN_RATE_PER_IP: str = "10/60"
+    LOGIN_RATE_PER_ROUTE: str = "50/1"
+    LOGIN_RATE_PER_USERNAME: str = "10/300"  # attempts on one account, from any IP
+    REGISTER_RATE_PER_IP: str = "5/60"
+    REGISTER_RATE_PER_ROUTE: str = "20/1"
+    ORDER_CREATE_RATE_PER_USER: str = "30/60"
+    SHED_MAX_IN_FLIGHT: int = 256
+    SHED_RETRY_AFTER_SECONDS: int = 2
+    SHED_MAX_POOL_WAIT_MS: int = 250  # mean DB checkout wait that triggers shedding; 0 = off
+
+    # Query instrumentation (see app/db/query_stats.py)
+    QUERY_DEBUG_HEADERS: bool = False
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Logging (see app/core/structured_logging.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    # fraction of INFO records kept per logger, e.g. {"app.access": 0.1}
+    LOG_SAMPLE_RATES: Dict[str, float] = {"app.access": 0.1}
+    SLOW_REQUEST_MS: int = 1000
+    SLOW_QUERY_MS: int = 200
+    SQL_ECHO: bool = False  # full statement echo, for local debugging only
+
+    # Single-request profiles (X-Profile: 1, see app/core/profiler.py).
+    # Written to this directory so whichever worker serves
+    # /admin/profiles/{id} can read them: with several hosts it must be a
+    # volume they all mount
+    PROFILE_DIR: str = "/tmp/laundroapp-profiles"
+    PROFILE_TTL_SECONDS: int = 600
+    PROFILE_MAX_STORED: int = 20
+
+    # Pricing rules hot reload
+    PRICING_RELOAD_SECONDS: int = 30
+
+    # Pickup slots
+    SLOT_AVAILABILITY_TTL_SECONDS: int = 15
+
+    # Driver manifests: dropped on commit in the worker that made the
+    # change; other workers serve their copy for at most this long
+    MANIFEST_CACHE_TTL_SECONDS: int = 10
+
+    # Recurring pickups: subscriptions per bulk insert
+    SUBSCRIPTION_BATCH_SIZE: int = 1000
+
+    # Pickup addresses: in-memory geocode cache entries, orders per resolver batch
+    ADDRESS_CACHE_SIZE: int = 10000
+    ADDRESS_RESOLVE_BATCH_SIZE: int = 1000
+    ADDRESS_GEOCODE_RETRY_DAYS: int = 7  # addresses not found are tried again after this
+
+    # Outbound calls (see app/core/resilience.py)
+    STRIPE_TIMEOUT_SECONDS: float = 10
+    STRIPE_MAX_CONCURRENCY: int = 20
+    SENDGRID_MAX_CONCURRENCY: int = 10
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_RESET_SECONDS: float = 30
+
     # SendGrid
     # Using Optional allows the app to start even if the key is missing
     sendgrid_api_key: Optional[str] = None
     from_email: Optional[str] = "youtvtosin01@gmail.com"
+    SENDGRID_TIMEOUT_SECONDS: float = 10
+    CAMPAIGN_BATCH_SIZE: int = 1000
 
     # New Pydantic V2 configuration style
     model_config = SettingsConfigDict(
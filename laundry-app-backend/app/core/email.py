@@ -1,11 +1,15 @@
+import logging
 import sendgrid
 from sendgrid.helpers.mail import Mail
 from app.core.config import settings
+from app.core.resilience import DependencyUnavailable, sendgrid_dependency
+
+logger = logging.getLogger(__name__)
 
 def send_order_status_update_email(order_id: int, recipient_email: str, status: str):
     # This pulls the key we fixed in your config.py
     if not settings.sendgrid_api_key:
-        print("SYSTEM ERROR: SENDGRID_API_KEY is not set in environment variables.")
+        logger.error("SENDGRID_API_KEY is not set; status email for order %s not sent", order_id)
         return
 
     message = Mail(
@@ -17,7 +21,11 @@ def send_order_status_update_email(order_id: int, recipient_email: str, status:
 
     try:
         sg = sendgrid.SendGridAPIClient(settings.sendgrid_api_key)
-        response = sg.send(message)
-        print(f"Email sent! Status code: {response.status_code}")
-    except Exception as e:
-        print(f"Failed to send email: {str(e)}")
\ No newline at end of file
+        sg.client.timeout = settings.SENDGRID_TIMEOUT_SECONDS
+        response = sendgrid_dependency.call(sg.send, message)
+        logger.info("Status email sent", extra={"order_id": str(order_id), "status_code": response.status_code})
+    except DependencyUnavailable as e:
+        # best effort: the status change itself already succeeded
+        logger.warning("Status email for order %s skipped: %s", order_id, e)
+    except Exception:
+        logger.exception("Failed to send status email for order %s", order_id)
\ No newline at end of file
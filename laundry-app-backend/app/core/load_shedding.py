@@ -0,0 +1,54 @@
+from starlette.responses import JSONResponse
+
+
+class LoadSheddingMiddleware:
+    """
+    Rejects requests with 503 + Retry-After once too many are in flight or
+    checkouts from any database pool (directory or shard) wait longer than
+    `max_pool_wait_ms`, instead of letting them queue behind a saturated
+    worker. Plain ASGI so the check costs almost nothing on the happy path.
+    """
+
+    def __init__(self, app, max_in_flight: int, retry_after_seconds: int, engines=(), max_pool_wait_ms: int = 0,
+                 exempt_paths=("/health",)):
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.retry_after_seconds = retry_after_seconds
+        self.engines = list(engines)
+        self.max_pool_wait = max_pool_wait_ms / 1000
+        self.exempt_paths = set(exempt_paths)
+        self.in_flight = 0
+        self.shed_count = 0
+
+    def _pool_saturated(self) -> bool:
+        if not self.max_pool_wait:
+            return False
+        for engine in self.engines:
+            # engine.pool, not a saved pool: dispose() swaps in a new one.
+            # Only WaitTimedQueuePool (app/db/pool.py) reports waits.
+            wait_seconds = getattr(engine.pool, "wait_seconds", None)
+            if wait_seconds and wait_seconds() >= self.max_pool_wait:
+                return True
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if self.in_flight >= self.max_in_flight or self._pool_saturated():
+            self.shed_count += 1
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+
+        # single event loop thread: no lock needed
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
@@ -0,0 +1,302 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+# (function name, file, first line) - one entry per Python frame
+Frame = Tuple[str, str, int]
+
+# Leaf functions that mean "this thread is parked", skipped unless include_idle
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py", "thread.py", "logging/handlers.py")
+_IDLE_FUNCTIONS = {"wait", "select", "poll", "accept", "get", "sleep", "_worker", "dequeue"}
+
+_ROOT = os.getcwd() + os.sep
+
+
+def _short_path(path: str) -> str:
+    if path.startswith(_ROOT):
+        return path[len(_ROOT):]
+    # site-packages/stdlib: the last two components are enough to recognise
+    return os.sep.join(path.split(os.sep)[-2:])
+
+
+class Profile:
+    """
+    Aggregated samples: {stack (root first): count}.
+    """
+
+    def __init__(self, stacks: Counter, interval: float, duration: float, samples: int):
+        self.stacks = stacks
+        self.interval = interval
+        self.duration = duration
+        self.samples = samples
+
+    def to_dict(self) -> dict:
+        return {
+            "interval": self.interval,
+            "duration": self.duration,
+            "samples": self.samples,
+            "stacks": [[[list(f) for f in stack], count] for stack, count in self.stacks.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Profile":
+        stacks = Counter({tuple(tuple(f) for f in stack): count for stack, count in data["stacks"]})
+        return cls(stacks, data["interval"], data["duration"], data["samples"])
+
+    @staticmethod
+    def _label(frame: Frame) -> str:
+        name, path, line = frame
+        return f"{name} ({path}:{line})" if path else name
+
+    def collapsed(self) -> str:
+        """
+        Brendan Gregg's collapsed format, for flamegraph.pl / speedscope.
+        """
+        lines = [
+            ";".join(self._label(f) for f in stack) + f" {count}"
+            for stack, count in self.stacks.most_common()
+        ]
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str = "laundroapp") -> dict:
+        """
+        speedscope's "sampled" file format (https://www.speedscope.app).
+        """
+        frame_index: Dict[Frame, int] = {}
+        frames, samples, weights = [], [], []
+        for stack, count in self.stacks.most_common():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1] or None, "line": frame[2] or None})
+                indices.append(frame_index[frame])
+            samples.append(indices)
+            weights.append(round(count * self.interval, 6))
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "laundroapp",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's Python stack with sys._current_frames() from a
+    background thread. Nothing runs between start() and stop() other than
+    that thread, so there is no cost when no profile is being taken.
+    """
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False, exclude_threads=()):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.exclude_threads = set(exclude_threads)
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self):
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return Profile(self._stacks, self.interval, time.monotonic() - self._started, self._samples)
+
+    def _run(self):
+        skip = self.exclude_threads | {threading.get_ident()}
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id in skip:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, _short_path(code.co_filename), code.co_firstlineno))
+                    frame = frame.f_back
+                if not stack or (not self.include_idle and self._is_idle(stack[0])):
+                    continue
+                stack.append((f"thread:{names.get(thread_id, thread_id)}", "", 0))
+                self._stacks[tuple(reversed(stack))] += 1
+            self._samples += 1
+
+    @staticmethod
+    def _is_idle(leaf: Frame) -> bool:
+        name, path, _ = leaf
+        return name in _IDLE_FUNCTIONS and path.endswith(_IDLE_FILES)
+
+
+def profile_for(seconds: float, interval: float, include_idle: bool = False) -> Profile:
+    # the calling thread only sleeps; leave it out
+    profiler = SamplingProfiler(interval, include_idle, exclude_threads=[threading.get_ident()])
+    profiler.start()
+    time.sleep(seconds)
+    return profiler.stop()
+
+
+# One live sampler per worker: /admin/profile and X-Profile requests share
+# it, so concurrent profile requests can't stack up sampler threads
+profiling_lock = threading.Lock()
+
+
+# --------------------
+# Single-request profiling
+# --------------------
+_PROFILE_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+
+class ProfileStore:
+    """
+    Finished request profiles as JSON files in a directory shared by the
+    workers, so /admin/profiles/{id} works whichever worker took the
+    profile. Files older than `ttl_seconds` are ignored and swept on the
+    next save, which also keeps only the newest `max_entries`.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float, max_entries: int):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.json")
+
+    def save(self, profile_id: str, profile: Profile):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self._path(profile_id) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(profile.to_dict(), f)
+        os.replace(tmp, self._path(profile_id))  # readers never see half a file
+        self._sweep()
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        if not _PROFILE_ID_RE.fullmatch(profile_id):
+            return None
+        path = self._path(profile_id)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with open(path) as f:
+                return Profile.from_dict(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def _sweep(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                entries.append((os.path.getmtime(os.path.join(self.directory, name)), name))
+            except OSError:
+                continue  # removed by another worker's sweep
+        entries.sort(reverse=True)
+        cutoff = time.time() - self.ttl_seconds
+        for n, (mtime, name) in enumerate(entries):
+            if n >= self.max_entries or mtime < cutoff:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+request_profiles = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_TTL_SECONDS, settings.PROFILE_MAX_STORED)
+
+
+class RequestProfilerMiddleware:
+    """
+    Profiles one request when it carries `X-Profile: 1` and `authorize`
+    (given the bearer token) accepts it. The response is unchanged apart
+    from an X-Profile-Id header naming the stored profile. Every thread is
+    sampled while the request runs, so busy concurrent requests can show
+    up too. Requests without the header only pay for a header lookup.
+
+    Only one sampler runs per worker (profiling_lock): while one is busy,
+    further X-Profile requests are served unprofiled with
+    `X-Profile-Status: busy`.
+    """
+
+    def __init__(self, app, authorize: Callable[[str], bool], interval: float = 0.001):
+        self.app = app
+        self.authorize = authorize
+        self.interval = interval
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", []))
+        if headers.get(b"x-profile") not in (b"1", b"true"):
+            await self.app(scope, receive, send)
+            return
+
+        auth = headers.get(b"authorization", b"").decode("latin-1")
+        token = auth[7:] if auth.lower().startswith("bearer ") else ""
+        if not token or not await run_in_threadpool(self.authorize, token):
+            await self.app(scope, receive, send)
+            return
+
+        if not profiling_lock.acquire(blocking=False):
+            await self.app(scope, receive, _with_header(send, b"x-profile-status", b"busy"))
+            return
+
+        profile_id = uuid.uuid4().hex
+        send_with_id = _with_header(send, b"x-profile-id", profile_id.encode())
+        final_message = None
+
+        async def hold_final_body(message):
+            # the client may fetch the profile as soon as the response ends,
+            # so the last body message waits until the profile is stored
+            nonlocal final_message
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                final_message = message
+                return
+            await send_with_id(message)
+
+        try:
+            profiler = SamplingProfiler(self.interval)
+            profiler.start()
+            try:
+                await self.app(scope, receive, hold_final_body)
+            finally:
+                profile = profiler.stop()
+        finally:
+            profiling_lock.release()
+        await run_in_threadpool(request_profiles.save, profile_id, profile)
+        if final_message is not None:
+            await send_with_id(final_message)
+
+
+def _with_header(send, name: bytes, value: bytes):
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": list(message.get("headers", [])) + [(name, value)]}
+        await send(message)
+    return wrapped
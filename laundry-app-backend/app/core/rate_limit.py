@@ -0,0 +1,155 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Rate:
+    """
+    Token bucket: `capacity` requests per `per_seconds`, refilled continuously.
+    """
+    capacity: int
+    per_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+def parse_rate(value: str) -> Rate:
+    """
+    "10/60" -> 10 requests per 60 seconds.
+    """
+    count, seconds = value.split("/", 1)
+    return Rate(capacity=int(count), per_seconds=float(seconds))
+
+
+def _refill(tokens: float, last: float, now: float, rate: Rate) -> float:
+    return min(float(rate.capacity), tokens + (now - last) * rate.refill_per_second)
+
+
+def _take(tokens: float, cost: int, rate: Rate) -> Tuple[float, float]:
+    """
+    (tokens left, seconds to wait). Wait is 0 when the request is allowed.
+    """
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / rate.refill_per_second
+
+
+# --------------------
+# Stores
+# --------------------
+class RateLimitStore(ABC):
+    @abstractmethod
+    def consume(self, key: str, rate: Rate, cost: int = 1) -> float:
+        """
+        Take `cost` tokens from the bucket at `key`. Returns 0 when allowed,
+        otherwise the seconds until enough tokens are available.
+        """
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """
+    Per-process buckets. Fast, but each worker counts separately.
+    Least recently used keys are evicted past `max_keys`.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, rate: Rate, cost: int = 1) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (float(rate.capacity), now))
+            tokens, wait = _take(_refill(tokens, last, now, rate), cost, rate)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class SharedKV(ABC):
+    """
+    Minimal contract a shared store (Redis, Memcached, ...) must offer
+    for buckets to be counted across workers.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def compare_and_set(self, key: str, expected: Optional[str], value: str, ttl_seconds: float) -> bool:
+        """
+        Store `value` only if the current value is still `expected`.
+        """
+
+
+class LocalSharedKV(SharedKV):
+    """
+    In-process stand-in for a shared store, for local runs and tests.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def compare_and_set(self, key: str, expected: Optional[str], value: str, ttl_seconds: float) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            current = entry[0] if entry and entry[1] >= time.time() else None
+            if current != expected:
+                return False
+            self._data[key] = (value, time.time() + ttl_seconds)
+            return True
+
+
+class SharedRateLimitStore(RateLimitStore):
+    """
+    Buckets kept in a SharedKV as "tokens:timestamp", updated with an
+    optimistic compare-and-set loop so all workers share one count.
+    """
+
+    def __init__(self, kv: SharedKV, max_retries: int = 5):
+        self.kv = kv
+        self.max_retries = max_retries
+
+    def consume(self, key: str, rate: Rate, cost: int = 1) -> float:
+        for _ in range(self.max_retries):
+            now = time.time()
+            raw = self.kv.get(key)
+            if raw is None:
+                tokens, last = float(rate.capacity), now
+            else:
+                t, ts = raw.split(":", 1)
+                tokens, last = float(t), float(ts)
+
+            tokens, wait = _take(_refill(tokens, last, now, rate), cost, rate)
+            if self.kv.compare_and_set(key, raw, f"{tokens}:{now}", rate.per_seconds):
+                return wait
+
+        # Heavy contention on one key: fail closed for a moment
+        return 1.0 / rate.refill_per_second
+
+
+def build_store(kind: str) -> RateLimitStore:
+    if kind == "shared":
+        return SharedRateLimitStore(LocalSharedKV())
+    return InMemoryRateLimitStore()
@@ -0,0 +1,309 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, Type
+from urllib.error import URLError
+
+import httpx
+import stripe
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class DependencyUnavailable(Exception):
+    """
+    Raised instead of calling an upstream that is failing, saturated or
+    too slow. `retry_after` is a hint in seconds for 503 responses.
+    """
+
+    def __init__(self, dependency: str, reason: str, retry_after: int = 1):
+        super().__init__(f"{dependency} unavailable: {reason}")
+        self.dependency = dependency
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def is_timeout(exc: BaseException) -> bool:
+    """
+    TimeoutError/socket.timeout or an httpx/requests timeout class, also
+    when wrapped by a client library (Stripe raises APIConnectionError).
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, TimeoutError) or "timeout" in type(exc).__name__.lower():
+            return True
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+# --------------------
+# Circuit breaker
+# --------------------
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures. After
+    `reset_seconds` it lets `half_open_probes` calls through; one probe
+    success closes it again, one probe failure re-opens it.
+
+    allow() hands each admitted call a permit to pass back to
+    record_success/record_failure/release: 0 for an ordinary call, or the
+    half-open round number for a probe. Only a probe of the current round
+    can move the breaker out of half-open; calls admitted while it was
+    closed that finish later are ignored once it has opened.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, half_open_probes: int = 1):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.transitions: Dict[str, int] = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+        self._failures = 0
+        self._opened_at = 0.0
+        self._round = 0  # half-open rounds so far
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            self.state = state
+            self.transitions[state] += 1
+
+    def _open(self):
+        self._failures = 0
+        self._opened_at = time.monotonic()
+        self._set_state(OPEN)
+
+    def _current_probe(self, permit: int) -> bool:
+        return permit != 0 and permit == self._round and self.state == HALF_OPEN
+
+    def retry_after(self) -> int:
+        remaining = self.reset_seconds - (time.monotonic() - self._opened_at)
+        return max(1, int(remaining + 0.999))
+
+    def allow(self) -> Optional[int]:
+        """
+        None if the call must be rejected, else its permit.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    return None
+                self._set_state(HALF_OPEN)
+                self._round += 1
+                self._probes_in_flight = 0
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    return None
+                self._probes_in_flight += 1
+                return self._round
+            return 0
+
+    def record_success(self, permit: int):
+        with self._lock:
+            if self._current_probe(permit):
+                self._probes_in_flight -= 1
+                self._failures = 0
+                self._set_state(CLOSED)
+            elif permit == 0 and self.state == CLOSED:
+                self._failures = 0
+
+    def record_failure(self, permit: int):
+        with self._lock:
+            if self._current_probe(permit):
+                self._probes_in_flight -= 1
+                self._open()
+            elif permit == 0 and self.state == CLOSED:
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    self._open()
+
+    def release(self, permit: int):
+        """
+        A call that ended without a verdict (e.g. a client error) frees
+        its probe slot, if it held one.
+        """
+        with self._lock:
+            if self._current_probe(permit):
+                self._probes_in_flight -= 1
+
+
+# --------------------
+# Dependency wrapper
+# --------------------
+class Dependency:
+    """
+    Guards calls to one upstream with a bulkhead (at most `max_concurrent`
+    calls in flight; extra callers wait `queue_timeout` seconds, then are
+    rejected) and a circuit breaker. Per-call timeouts are enforced by the
+    client (see `timeout`); calls that still overrun it count as failures.
+
+    Only exceptions matching `failure_types` (and `is_failure`, when
+    given) trip the breaker, so e.g. a declined card does not take
+    payments offline.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        max_concurrent: int,
+        breaker: CircuitBreaker,
+        queue_timeout: float = 0.05,
+        failure_types: Tuple[Type[BaseException], ...] = (Exception,),
+        is_failure: Optional[Callable[[BaseException], bool]] = None,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.max_concurrent = max_concurrent
+        self.breaker = breaker
+        self.queue_timeout = queue_timeout
+        self.failure_types = failure_types
+        self.is_failure = is_failure
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.counters = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "timeouts": 0,  # counted separately from failures
+            "rejected_open": 0,
+            "rejected_bulkhead": 0,
+            "fallbacks": 0,
+        }
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counters[key] += 1
+
+    def call(self, fn: Callable, *args, fallback: Optional[Callable] = None, **kwargs):
+        """
+        Run fn(*args, **kwargs). Rejections and upstream failures raise
+        DependencyUnavailable, or return fallback() when one is given.
+        Other exceptions (e.g. a declined card) propagate unchanged.
+        """
+        self._count("calls")
+        try:
+            return self._guarded(fn, *args, **kwargs)
+        except DependencyUnavailable as exc:
+            if fallback is None:
+                raise
+            logger.warning("%s, using fallback", exc)
+        self._count("fallbacks")
+        return fallback()
+
+    def _counts_as_failure(self, exc: BaseException) -> bool:
+        return isinstance(exc, self.failure_types) and (self.is_failure is None or self.is_failure(exc))
+
+    def _guarded(self, fn, *args, **kwargs):
+        permit = self.breaker.allow()
+        if permit is None:
+            self._count("rejected_open")
+            raise DependencyUnavailable(self.name, "circuit open", self.breaker.retry_after())
+
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._count("rejected_bulkhead")
+            self.breaker.release(permit)
+            raise DependencyUnavailable(self.name, "too many concurrent calls")
+
+        with self._lock:
+            self._in_flight += 1
+        start = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as exc:
+            if not self._counts_as_failure(exc):
+                self.breaker.release(permit)
+                raise
+            timed_out = is_timeout(exc)
+            self._count("timeouts" if timed_out else "failures")
+            self.breaker.record_failure(permit)
+            raise DependencyUnavailable(self.name, "timed out" if timed_out else "upstream error") from exc
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+        if time.monotonic() - start > self.timeout:
+            # the client returned, but too late to count as healthy
+            self._count("timeouts")
+            self.breaker.record_failure(permit)
+        else:
+            self._count("successes")
+            self.breaker.record_success(permit)
+        return result
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self.breaker.state,
+                "in_flight": self._in_flight,
+                "max_concurrent": self.max_concurrent,
+                "timeout_seconds": self.timeout,
+                "state_transitions": dict(self.breaker.transitions),
+                **self.counters,
+            }
+
+
+# --------------------
+# Registry
+# --------------------
+_registry: Dict[str, Dependency] = {}
+
+
+def register(dependency: Dependency) -> Dependency:
+    _registry[dependency.name] = dependency
+    return dependency
+
+
+def dependency_metrics() -> list:
+    return [d.snapshot() for d in _registry.values()]
+
+
+# --------------------
+# Upstreams
+# --------------------
+def _breaker() -> CircuitBreaker:
+    return CircuitBreaker(settings.BREAKER_FAILURE_THRESHOLD, settings.BREAKER_RESET_SECONDS)
+
+
+stripe_dependency = register(Dependency(
+    "stripe",
+    timeout=settings.STRIPE_TIMEOUT_SECONDS,
+    max_concurrent=settings.STRIPE_MAX_CONCURRENCY,
+    breaker=_breaker(),
+    # server-side trouble only; card and validation errors are the caller's problem
+    failure_types=(stripe.APIConnectionError, stripe.APIError, stripe.RateLimitError, TimeoutError),
+))
+
+def is_server_side(exc: BaseException) -> bool:
+    """
+    5xx responses, connection errors and timeouts, from either SendGrid
+    client (python_http_client raises HTTPError with `status_code`; httpx
+    raises HTTPStatusError with `response`). 4xx responses, such as a
+    rejected address or a bad API key, are not an outage.
+    """
+    status = getattr(exc, "status_code", None)
+    if status is None and isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+    if isinstance(status, int):
+        return status >= 500
+    return isinstance(exc, (httpx.TransportError, URLError, ConnectionError)) or is_timeout(exc)
+
+
+sendgrid_dependency = register(Dependency(
+    "sendgrid",
+    timeout=settings.SENDGRID_TIMEOUT_SECONDS,
+    max_concurrent=settings.SENDGRID_MAX_CONCURRENCY,
+    breaker=_breaker(),
+    is_failure=is_server_side,
+))
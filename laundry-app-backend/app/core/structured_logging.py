@@ -0,0 +1,190 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "sample_rate"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+# --------------------
+# Formatting
+# --------------------
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: timestamp, level, logger, message, request id
+    and any `extra={...}` fields passed to the log call.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+# --------------------
+# Filters (run on the calling thread)
+# --------------------
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of INFO/DEBUG records from high-volume loggers.
+    Rates come from `rates` ({logger name: 0..1}) or a per-call
+    `extra={"sample_rate": ...}`. Warnings and above are never dropped.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = getattr(record, "sample_rate", None)
+        if rate is None:
+            rate = self.rates.get(record.name, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class _StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Like QueueHandler, but leaves the message unformatted and keeps
+    `extra` fields, so the listener thread can render JSON.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(level: str = "INFO", json_output: bool = True, sample_rates: Optional[Dict[str, float]] = None):
+    """
+    Route all logging through an in-memory queue. Request threads only
+    enqueue records; a background listener formats and writes them to
+    stdout. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if json_output else logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+    ))
+
+    handler = _StructuredQueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(SamplingFilter(sample_rates or {}))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """
+    Drain the queue and stop the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# --------------------
+# Request correlation
+# --------------------
+access_logger = logging.getLogger("app.access")
+
+
+class RequestContextMiddleware:
+    """
+    Tags every log record emitted while handling a request with its id
+    (the caller's X-Request-ID, or a new one), echoes the id back in the
+    response, and writes one access log line per request.
+    """
+
+    def __init__(self, app, slow_request_ms: int):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope.get("headers", [])).get(b"x-request-id")
+        request_id = incoming.decode("latin-1")[:64] if incoming else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            # errors and slow requests are always kept; the rest is sampled
+            keep_all = status_code >= 500 or duration_ms >= self.slow_request_ms
+            access_logger.info(
+                "%s %s %d",
+                scope["method"],
+                scope["path"],
+                status_code,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": duration_ms,
+                    **({"sample_rate": 1.0} if keep_all else {}),
+                },
+            )
+            request_id_var.reset(token)
@@ -1,6 +1,38 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
+from types import MappingProxyType
+from typing import Mapping
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.jwt_backend import InvalidTokenError, build_backend
+
+jwt_backend = build_backend(settings.JWT_BACKEND, settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM)
+
+# --------------------
+# Verified-claims cache
+# --------------------
+# sha256(token) -> claims, kept until the token's own exp, so a client
+# reusing its bearer token is verified once rather than on every call.
+_claims_cache = TTLCache(ttl_seconds=0, max_entries=settings.TOKEN_CACHE_SIZE)
+
+
+def decode_token(token: str) -> Mapping:
+    """
+    Verified (read-only) claims of `token`. Raises InvalidTokenError.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _claims_cache.get(key)
+    if claims is not None:
+        return claims
+
+    claims = MappingProxyType(jwt_backend.decode(token))
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        remaining = exp - time.time()
+        if remaining > 0:
+            _claims_cache.set(key, claims, ttl_seconds=remaining)
+    return claims
 
 
 def create_email_verification_token(user_id: str) -> str:
@@ -10,16 +42,16 @@ def create_email_verification_token(user_id: str) -> str:
         "exp": expire,
         "scope": "email_verification"
     }
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return jwt_backend.encode(payload)
 
 
 def verify_email_token(token: str):
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = decode_token(token)
         if payload.get("scope") != "email_verification":
             return None
         return payload.get("sub")  # user_id
-    except JWTError:
+    except InvalidTokenError:
         return None
 
 
@@ -34,7 +66,7 @@ def create_access_token(user_id: str, role: str) -> str:
         "scope": "access_token",
         "exp": expire,
     }
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return jwt_backend.encode(payload)
 
 
 def create_refresh_token(user_id: str) -> str:
@@ -47,4 +79,4 @@ def create_refresh_token(user_id: str) -> str:
         "scope": "refresh_token",
         "exp": expire,
     }
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return jwt_backend.encode(payload)
@@ -0,0 +1,11 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_insert(bind, table):
+    """
+    INSERT construct supporting ON CONFLICT for the bind's dialect
+    (Postgres in production, SQLite locally).
+    """
+    if bind.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
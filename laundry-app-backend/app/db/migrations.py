@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Table, UniqueConstraint, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.models.order import Order, _SQLITE_FTS_DDL
+from app.models.order_archive import ArchivedOrder
+from app.models.user import User
+
+# --------------------
+# Schema upgrades
+# --------------------
+# create_all() only creates missing tables; it never touches a table that
+# already exists. Columns and indexes added to existing tables since the
+# first release are brought in here. Every step checks the live schema
+# first, so migrate() runs at each startup (after create_all) and on every
+# shard, and does nothing once a database is current.
+#
+# New columns are added nullable, with existing rows backfilled; on
+# Postgres NOT NULL is set afterwards. SQLite cannot add a NOT NULL column
+# without a constant default, and the ORM always writes these columns, so
+# they stay nullable there.
+
+
+def _column_names(conn: Connection, table: str) -> set:
+    return {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+def add_column(conn: Connection, table: Table, name: str, backfill=None) -> bool:
+    """
+    ALTER TABLE ... ADD COLUMN for a model column the live table lacks.
+    Returns True if the column was added.
+    """
+    if name in _column_names(conn, table.name):
+        return False
+
+    column = table.c[name]
+    ddl = f"ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(dialect=conn.dialect)}"
+    for fk in column.foreign_keys:
+        ddl += f" REFERENCES {fk.column.table.name} ({fk.column.name})"
+    conn.execute(text(ddl))
+
+    if backfill is not None:
+        conn.execute(table.update().values({name: backfill}))
+    if not column.nullable and conn.dialect.name == "postgresql":
+        conn.execute(text(f"ALTER TABLE {table.name} ALTER COLUMN {name} SET NOT NULL"))
+    return True
+
+
+def ensure_indexes(conn: Connection, table: Table) -> None:
+    """
+    Create the model's indexes and named unique constraints that the live
+    table is missing (unique constraints become unique indexes).
+    """
+    existing = {i["name"] for i in inspect(conn).get_indexes(table.name)}
+    existing |= {u["name"] for u in inspect(conn).get_unique_constraints(table.name)}
+
+    for index in table.indexes:
+        if index.name not in existing:
+            index.create(conn)
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and constraint.name and constraint.name not in existing:
+            columns = ", ".join(c.name for c in constraint.columns)
+            conn.execute(text(f"CREATE UNIQUE INDEX {constraint.name} ON {table.name} ({columns})"))
+
+
+# --------------------
+# Steps
+# --------------------
+def _users_location(conn: Connection) -> None:
+    add_column(conn, User.__table__, "location", backfill=settings.DEFAULT_LOCATION)
+    ensure_indexes(conn, User.__table__)
+
+
+def _orders_columns(conn: Connection) -> None:
+    orders = Order.__table__
+    add_column(conn, orders, "updated_at", backfill=datetime.utcnow())
+    add_column(conn, orders, "change_seq", backfill=0)  # older than any sync cursor
+    add_column(conn, orders, "location", backfill=settings.DEFAULT_LOCATION)
+    for name in ("pickup_slot_id", "subscription_id", "route_sequence", "address_id"):
+        add_column(conn, orders, name)
+
+
+def _orders_indexes(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        # before the trigram indexes
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    ensure_indexes(conn, Order.__table__)
+
+
+def _orders_search(conn: Connection) -> None:
+    if conn.dialect.name != "sqlite":
+        return
+    fts_sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'orders_fts'")).scalar()
+    if fts_sql and "content=" in fts_sql:
+        return
+    # missing, or the first layout (its own copy of the text plus an
+    # UNINDEXED order_id that every trigger delete had to scan for)
+    for trigger in ("orders_fts_ai", "orders_fts_ad", "orders_fts_au"):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    conn.execute(text("DROP TABLE IF EXISTS orders_fts"))
+    for stmt in _SQLITE_FTS_DDL:
+        conn.execute(text(stmt))
+    conn.execute(text("INSERT INTO orders_fts (orders_fts) VALUES ('rebuild')"))
+
+
+def _orders_archive_columns(conn: Connection) -> None:
+    archive = ArchivedOrder.__table__
+    add_column(conn, archive, "location", backfill=settings.DEFAULT_LOCATION)
+    add_column(conn, archive, "subscription_id")
+    add_column(conn, archive, "address_id")
+
+
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("users_location", _users_location),
+    ("orders_columns", _orders_columns),
+    ("orders_indexes", _orders_indexes),
+    ("orders_search", _orders_search),
+    ("orders_archive_columns", _orders_archive_columns),
+]
+
+
+def migrate(engine: Engine) -> None:
+    """
+    Bring an existing database up to the current models. One transaction
+    per step, so a failed step leaves the ones before it applied.
+    """
+    for _, step in MIGRATIONS:
+        with engine.begin() as conn:
+            step(conn)
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+
+class WaitTimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited for a
+    connection. LoadSheddingMiddleware sheds on wait_seconds() rather
+    than on checked-out counts: a pool can be fully checked out and still
+    turn connections over quickly.
+    """
+
+    def __init__(self, *args, wait_window_seconds: float = 5.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_window_seconds = wait_window_seconds
+        self._waits = deque()  # (finished at, seconds waited)
+        self._waiting = {}  # id -> started at, checkouts still blocked
+        self._wait_lock = threading.Lock()
+
+    def _do_get(self):
+        token = object()
+        started = time.monotonic()
+        with self._wait_lock:
+            self._waiting[id(token)] = started
+        try:
+            return super()._do_get()
+        finally:
+            finished = time.monotonic()
+            with self._wait_lock:
+                del self._waiting[id(token)]
+                self._waits.append((finished, finished - started))
+
+    def wait_seconds(self) -> float:
+        """
+        The longer of: the mean checkout wait over the last
+        `wait_window_seconds`, and how long the oldest checkout still
+        blocked has waited so far. Drops back to 0 once checkouts stop
+        waiting, so shedding ends on its own.
+        """
+        now = time.monotonic()
+        with self._wait_lock:
+            while self._waits and self._waits[0][0] < now - self.wait_window_seconds:
+                self._waits.popleft()
+            recent = sum(w for _, w in self._waits) / len(self._waits) if self._waits else 0.0
+            blocked = now - min(self._waiting.values()) if self._waiting else 0.0
+        return max(recent, blocked)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_window_seconds = self.wait_window_seconds
+        return pool
+
+
+def create_timed_engine(url: str, **kwargs) -> Engine:
+    """
+    create_engine() that swaps the dialect's QueuePool for a
+    WaitTimedQueuePool. Other pool classes (e.g. in-memory SQLite's) are
+    left alone and simply not watched.
+    """
+    parsed = make_url(url)
+    if issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+        kwargs.setdefault("poolclass", WaitTimedQueuePool)
+    return create_engine(url, **kwargs)
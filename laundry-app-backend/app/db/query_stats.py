@@ -0,0 +1,207 @@
+import functools
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+# Process-wide collectors used by test budgets: TestClient runs the app on
+# another thread that does not inherit the caller's context.
+_global_collectors: list = []
+_global_lock = threading.Lock()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:\?|%\(\w+\)s|%s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)", re.IGNORECASE)
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalise a SQL statement so executions that differ only in literal
+    values or IN-list length share one fingerprint.
+    """
+    s = _WHITESPACE_RE.sub(" ", statement).strip()
+    s = _STRING_RE.sub("?", s)
+    s = _NUMBER_RE.sub("?", s)
+    s = _IN_LIST_RE.sub("IN (...)", s)
+    return s
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.by_fingerprint: Counter = Counter()
+        self._exact: Counter = Counter()
+
+    def record(self, statement: str, parameters):
+        self.count += 1
+        self.by_fingerprint[fingerprint(statement)] += 1
+        self._exact[(statement, repr(parameters))] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """
+        Executions that repeated an identical statement with identical parameters.
+        """
+        return sum(n - 1 for n in self._exact.values() if n > 1)
+
+    def repeated(self, threshold: int) -> dict:
+        """
+        Fingerprints executed at least `threshold` times: likely N+1 loops.
+        """
+        return {fp: n for fp, n in self.by_fingerprint.items() if n >= threshold}
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, parameters)
+    if _global_collectors:
+        with _global_lock:
+            for collector in _global_collectors:
+                collector.record(statement, parameters)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _log_slow_statement(conn, cursor, statement, parameters, context, executemany):
+    """
+    Log statements slower than SLOW_QUERY_MS. Only the fingerprint is
+    logged, never parameter values.
+    """
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    if elapsed_ms >= settings.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms)",
+            elapsed_ms,
+            extra={
+                "duration_ms": round(elapsed_ms, 2),
+                "statement": fingerprint(statement),
+                "executemany": executemany,
+                "rowcount": cursor.rowcount,
+            },
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_failed_statement(context):
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+@contextmanager
+def collect_queries():
+    """
+    Count every statement executed in this context (and threads it hands
+    work to, e.g. FastAPI's threadpool) on any engine.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# --------------------
+# Budgets for tests
+# --------------------
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _check_budget(stats: QueryStats, max_queries: int, allow_duplicates: bool):
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} queries executed, budget is {max_queries}")
+    if not allow_duplicates and stats.duplicates:
+        problems.append(f"{stats.duplicates} identical statements repeated")
+    repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        problems.append("possible N+1: " + "; ".join(f"{n}x {fp}" for fp, n in repeated.items()))
+    if problems:
+        raise QueryBudgetExceeded("\n".join(problems))
+
+
+@contextmanager
+def query_budget(max_queries: int, allow_duplicates: bool = False):
+    """
+    Fail if the block runs more than `max_queries` statements, repeats an
+    identical statement, or loops one statement shape N+1 style:
+
+        with query_budget(3):
+            client.get("/api/v1/orders/my", headers=auth)
+
+    Counts statements from every thread, so run it one test at a time.
+    """
+    stats = QueryStats()
+    with _global_lock:
+        _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        with _global_lock:
+            _global_collectors.remove(stats)
+    _check_budget(stats, max_queries, allow_duplicates)
+
+
+def max_queries(limit: int, allow_duplicates: bool = False):
+    """
+    Decorator form of query_budget, for test functions.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with query_budget(limit, allow_duplicates):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --------------------
+# Debug headers
+# --------------------
+class QueryCountMiddleware:
+    """
+    Adds X-Query-Count / X-Query-Duplicates to every response and logs
+    suspected N+1 patterns. Enabled with QUERY_DEBUG_HEADERS.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_queries() as stats:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-query-count", str(stats.count).encode()))
+                    headers.append((b"x-query-duplicates", str(stats.duplicates).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
+        repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            logger.warning("Possible N+1 on %s %s: %s", scope["method"], scope["path"], repeated)
@@ -1,9 +1,16 @@
-from sqlalchemy import create_engine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, TypeVar
+
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
+from app.db import query_stats  # registers the per-request statement counter
+from app.db.pool import create_timed_engine
+
+T = TypeVar("T")
 
 
-engine = create_engine(settings.DATABASE_URL, echo=True)
+engine = create_timed_engine(settings.DATABASE_URL, echo=settings.SQL_ECHO)
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -15,3 +22,68 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# --------------------
+# Shard Router
+# --------------------
+class ShardRouter:
+    """
+    Maps each laundromat location to the database holding its orders.
+    Users and pricing stay in the main (directory) database; locations
+    without their own URL in SHARD_DATABASE_URLS use it too.
+    """
+
+    def __init__(self, default_engine: Engine, shard_urls: Dict[str, str], default_location: str):
+        self.default_engine = default_engine
+        self.default_location = default_location
+        self._engines: Dict[str, Engine] = {default_location: default_engine}
+        for location, url in shard_urls.items():
+            self._engines[location] = (
+                default_engine if url == settings.DATABASE_URL else create_timed_engine(url, echo=settings.SQL_ECHO)
+            )
+        self._sessionmakers = {
+            e: sessionmaker(autocommit=False, autoflush=False, bind=e)
+            for e in set(self._engines.values())
+        }
+
+    @property
+    def locations(self) -> List[str]:
+        return list(self._engines)
+
+    def is_known(self, location: str) -> bool:
+        return location in self._engines
+
+    def engine_for(self, location: str) -> Engine:
+        return self._engines.get(location, self.default_engine)
+
+    def session_for(self, location: str) -> Session:
+        return self._sessionmakers[self.engine_for(location)]()
+
+    def session_for_engine(self, e: Engine) -> Session:
+        return self._sessionmakers[e]()
+
+    def engines(self) -> List[Engine]:
+        # distinct databases; several locations may share one
+        return list(self._sessionmakers)
+
+    def fan_out(self, fn: Callable[[Session], T]) -> List[T]:
+        """
+        Run `fn` against every distinct shard database in parallel and
+        return the results for the caller to merge.
+        """
+        def run(e: Engine):
+            db = self.session_for_engine(e)
+            try:
+                return fn(db)
+            finally:
+                db.close()
+
+        engines = self.engines()
+        if len(engines) == 1:
+            return [run(engines[0])]
+        with ThreadPoolExecutor(max_workers=len(engines)) as pool:
+            return list(pool.map(run, engines))
+
+
+shard_router = ShardRouter(engine, settings.SHARD_DATABASE_URLS, settings.DEFAULT_LOCATION)
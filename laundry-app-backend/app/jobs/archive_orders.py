@@ -0,0 +1,27 @@
+"""
+Move old delivered + paid orders into orders_archive.
+
+    python -m app.jobs.archive_orders --days 90 --batch-size 500
+"""
+import argparse
+
+from app.core.config import settings
+from app.db.session import shard_router
+from app.services.order_archive import archive_delivered_orders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive delivered, paid orders")
+    parser.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    moved = sum(
+        shard_router.fan_out(lambda db: archive_delivered_orders(db, args.days, args.batch_size))
+    )
+
+    print(f"Archived {moved} orders older than {args.days} days")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Rebuild order_daily_rollups from live and archived orders, on every shard.
+
+    python -m app.jobs.backfill_rollups [--from 2024-01-01] [--to 2024-12-31]
+"""
+import argparse
+from datetime import date
+
+from app.db.session import shard_router
+from app.services.rollups import rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill daily order rollups")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, default=None)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    buckets = sum(
+        shard_router.fan_out(lambda db: rebuild_rollups(db, args.date_from, args.date_to))
+    )
+
+    print(f"Rebuilt {buckets} rollup buckets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Create the coming week's orders for every active subscription, on every shard.
+
+    python -m app.jobs.generate_subscription_orders [--from 2026-10-20] [--days 7]
+
+Safe to rerun: existing (subscription, pickup_date) orders are skipped.
+"""
+import argparse
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.db.session import SessionLocal, shard_router
+from app.services.pricing_rules import pricing_store
+from app.services.subscriptions import generate_subscription_orders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate orders for recurring pickups")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, default=date.today() + timedelta(days=1))
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--batch-size", type=int, default=settings.SUBSCRIPTION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    window_end = args.date_from + timedelta(days=args.days - 1)
+
+    # pricing rules live in the main database
+    db = SessionLocal()
+    try:
+        pricing_store.reload(db)
+    finally:
+        db.close()
+
+    results = shard_router.fan_out(
+        lambda db: generate_subscription_orders(db, args.date_from, window_end, args.batch_size)
+    )
+
+    created = sum(r[0] for r in results)
+    skipped = sum(r[1] for r in results)
+    print(f"{args.date_from}..{window_end}: created {created} orders, {skipped} already existed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Bulk-load orders from a CSV file (see app/services/order_import.py for columns).
+
+    python -m app.jobs.import_orders orders.csv [--location main] [--chunk-size 5000]
+"""
+import argparse
+import json
+
+from app.core.config import settings
+from app.db.session import SessionLocal, shard_router
+from app.services.order_import import import_orders_csv
+from app.services.pricing_rules import pricing_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import orders from CSV")
+    parser.add_argument("path")
+    parser.add_argument("--location", default=settings.DEFAULT_LOCATION)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--errors", action="store_true", help="print every reported row error")
+    args = parser.parse_args()
+
+    if not shard_router.is_known(args.location):
+        raise SystemExit(f"Unknown location '{args.location}'")
+
+    directory_db = SessionLocal()
+    shard_db = shard_router.session_for(args.location)
+    try:
+        pricing_store.reload(directory_db)
+        with open(args.path, "rb") as f:
+            result = import_orders_csv(f, shard_db, directory_db, args.location, args.chunk_size)
+    finally:
+        shard_db.close()
+        directory_db.close()
+
+    print(f"{result.imported}/{result.total_rows} rows imported, {result.failed} failed, "
+          f"{result.seconds:.1f}s ({result.rows_per_second} rows/sec)")
+    if args.errors:
+        for error in result.errors:
+            print(json.dumps(error))
+
+
+if __name__ == "__main__":
+    main()
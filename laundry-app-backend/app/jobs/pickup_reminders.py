@@ -0,0 +1,46 @@
+"""
+Remind every customer with a scheduled pickup on a given day (default: tomorrow).
+
+    python -m app.jobs.pickup_reminders [--date 2026-10-20] [--dry-run]
+
+Safe to rerun: progress is checkpointed in campaign_runs (one run per shard).
+A dry run reads the checkpoint but never writes one.
+"""
+import argparse
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.db.session import shard_router
+from app.services.campaigns import SendGridTransport, StubTransport, send_pickup_reminders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send pickup reminder emails")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today() + timedelta(days=1))
+    parser.add_argument("--batch-size", type=int, default=settings.CAMPAIGN_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="build payloads without sending or checkpointing")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        transport = StubTransport()
+    else:
+        if not settings.sendgrid_api_key:
+            raise SystemExit("SENDGRID_API_KEY is not set")
+        transport = SendGridTransport(settings.sendgrid_api_key, settings.SENDGRID_TIMEOUT_SECONDS)
+
+    try:
+        # shards run one after another so batches share the transport's connection
+        for shard_engine in shard_router.engines():
+            db = shard_router.session_for_engine(shard_engine)
+            try:
+                run = send_pickup_reminders(db, args.date, transport, args.batch_size, dry_run=args.dry_run)
+                print(f"{shard_engine.url.database}: {run.campaign_key}: {run.status}, "
+                      f"{run.sent_count} reminders in {run.batch_count} batches")
+            finally:
+                db.close()
+    finally:
+        transport.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Link orders to their normalized address and geocode new addresses, on every shard.
+
+    python -m app.jobs.resolve_addresses [--batch-size 1000]
+
+Orders get their address_id when they are created; this job backfills
+older orders and fills in coordinates, so geocoding stays off the request path.
+"""
+import argparse
+
+from app.core.config import settings
+from app.db.session import shard_router
+from app.services.addresses import default_geocoder, geocode_pending, link_orders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve pickup addresses")
+    parser.add_argument("--batch-size", type=int, default=settings.ADDRESS_RESOLVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    def resolve(db):
+        linked = link_orders(db, args.batch_size)
+        geocoded, not_found = geocode_pending(db, default_geocoder, args.batch_size)
+        return linked, geocoded, not_found
+
+    results = shard_router.fan_out(resolve)
+    linked, geocoded, not_found = (sum(r[i] for r in results) for i in range(3))
+    print(f"linked {linked} orders, geocoded {geocoded} addresses, {not_found} not found")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,36 @@ from fastapi.security import OAuth2PasswordBearer
 
 
 # DB & Models
-from app.db.session import engine
+from app.db.session import SessionLocal, shard_router
+from app.core.config import settings
+from app.core.structured_logging import RequestContextMiddleware, configure_logging
+from app.core.profiler import RequestProfilerMiddleware
+from app.api.deps import is_admin_token
+from app.core.load_shedding import LoadSheddingMiddleware
+from app.db.query_stats import QueryCountMiddleware
 from app.db.base import Base
+from app.db.migrations import migrate
 from app.models.user import User
 
 # Routers
-from app.models import user, order
+from app.models import user, order, order_archive, order_rollup, order_event, change_counter, pricing_rule, pickup_slot, campaign_run, subscription, address, order_sync_tombstone
+from app.services import rollups  # registers the order rollup flush hook
+from app.services import change_feed  # registers the order change_seq flush hook
+from app.services import driver_manifest  # registers manifest cache invalidation
+from app.services.pricing_rules import pricing_store
 
 from app.api.auth import router as auth_router
 from app.api.test_secure import router as secure_test_router
 from app.api.orders import router as orders_router
+from app.api.pricing import router as pricing_router
+from app.api.admin import router as admin_router
+from app.api.subscriptions import router as subscriptions_router
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
 
+configure_logging(settings.LOG_LEVEL, settings.LOG_JSON, settings.LOG_SAMPLE_RATES)
+
 # ========= CREATE APP FIRST =========
 app = FastAPI(
     title="Tradon Clothing Laundry Pickup & Delivery API",
@@ -45,12 +61,31 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 # ========= STARTUP DB INIT =========
 @app.on_event("startup")
 def startup():
-    Base.metadata.create_all(bind=engine)
+    # the main database plus every location shard gets the full schema;
+    # migrate() adds what create_all can't to tables that already exist
+    for shard_engine in shard_router.engines():
+        Base.metadata.create_all(bind=shard_engine)
+        migrate(shard_engine)
+
+    db = SessionLocal()
+    try:
+        pricing_store.reload(db)
+    finally:
+        db.close()
+    pricing_store.start_polling(SessionLocal, settings.PRICING_RELOAD_SECONDS)
+
+
+@app.on_event("shutdown")
+def shutdown():
+    pricing_store.stop_polling()
 
 
 # ========= ROUTES =========
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(orders_router, prefix="/api/v1")
+app.include_router(pricing_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+app.include_router(subscriptions_router, prefix="/api/v1")
 app.include_router(secure_test_router, prefix="/api/v1")
 
 
@@ -100,6 +135,24 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(SecurityHeadersMiddleware)
 
+if settings.QUERY_DEBUG_HEADERS:
+    app.add_middleware(QueryCountMiddleware)
+
+# X-Profile: 1 from an admin profiles that single request
+app.add_middleware(RequestProfilerMiddleware, authorize=is_admin_token)
+
+# request id is set before the query/debug middleware so their logs carry it
+app.add_middleware(RequestContextMiddleware, slow_request_ms=settings.SLOW_REQUEST_MS)
+
+# outermost: shed load before any other work is done
+app.add_middleware(
+    LoadSheddingMiddleware,
+    max_in_flight=settings.SHED_MAX_IN_FLIGHT,
+    retry_after_seconds=settings.SHED_RETRY_AFTER_SECONDS,
+    engines=shard_router.engines(),
+    max_pool_wait_ms=settings.SHED_MAX_POOL_WAIT_MS,
+)
+
 @app.get("/health", tags=["Health"])
 def health_check():
     return {"status": "ok"}
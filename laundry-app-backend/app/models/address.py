@@ -0,0 +1,29 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Float, DateTime, BigInteger, Integer, Index
+from app.db.base import Base
+
+
+class Address(Base):
+    """
+    One row per distinct pickup address, keyed by its normalized form
+    (see services/addresses.py). Orders point here via address_id; the
+    coordinates are filled in by app/jobs/resolve_addresses.py.
+    """
+    __tablename__ = "addresses"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+
+    normalized = Column(String, nullable=False, unique=True)
+    zip_code = Column(String, nullable=True)
+
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geocoder = Column(String, nullable=True)  # which geocoder produced the coordinates
+    geocoded_at = Column(DateTime, nullable=True)  # NULL = not tried yet
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # the resolver retries addresses that have no coordinates yet
+        Index("ix_addresses_geocoded_at", "geocoded_at"),
+    )
@@ -0,0 +1,26 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+
+class CampaignRun(Base):
+    """
+    Progress checkpoint for a notification campaign (e.g.
+    "pickup_reminder:2026-10-20"), so a rerun resumes after the last
+    order that was sent instead of starting over.
+    """
+    __tablename__ = "campaign_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    campaign_key = Column(String, unique=True, nullable=False)
+    status = Column(String, nullable=False, default="running")  # running | completed | failed
+
+    last_order_id = Column(UUID(as_uuid=True), nullable=True)  # keyset cursor
+    sent_count = Column(Integer, nullable=False, default=0)
+    batch_count = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, BigInteger, DDL, event
+from app.db.base import Base
+
+
+class ChangeCounter(Base):
+    """
+    Named monotonic counters. `orders` stamps Order.change_seq for
+    the driver delta-sync feed on SQLite; Postgres uses transaction ids
+    instead (see services/change_feed.py).
+    """
+    __tablename__ = "change_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+
+event.listen(
+    ChangeCounter.__table__,
+    "after_create",
+    DDL("INSERT INTO change_counters (name, value) VALUES ('orders', 0)"),
+)
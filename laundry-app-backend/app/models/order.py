@@ -1,9 +1,11 @@
 import uuid
-from sqlalchemy import Column, String, Enum, Date, ForeignKey, Integer, Boolean
+from datetime import datetime
+from sqlalchemy import Column, String, Enum, Date, DateTime, ForeignKey, Integer, BigInteger, Boolean, Index, UniqueConstraint, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.models.user import User
 from app.db.base import Base
+from app.core.config import settings
 from enum import Enum as PyEnum
 
 
@@ -33,6 +35,11 @@ class Order(Base):
     pickup_date = Column(Date, nullable=False)
     status = Column(Enum(OrderStatus), default=OrderStatus.scheduled, nullable=False)
     special_instructions = Column(String, nullable=True)
+    location = Column(String, nullable=False, default=lambda: settings.DEFAULT_LOCATION)
+    pickup_slot_id = Column(Integer, ForeignKey("pickup_slots.id"), nullable=True)
+    subscription_id = Column(UUID(as_uuid=True), ForeignKey("subscriptions.id"), nullable=True)
+    route_sequence = Column(Integer, nullable=True)  # stop order in the driver's day, set on assignment
+    address_id = Column(BigInteger().with_variant(Integer, "sqlite"), ForeignKey("addresses.id"), nullable=True)  # NULL until resolved
 
     weight_lbs = Column(Integer, nullable=True)
 
@@ -47,6 +54,69 @@ class Order(Base):
     is_paid = Column(Boolean, default=False)
     stripe_payment_intent_id = Column(String, nullable=True)
 
+    # Delta sync: every insert/update is stamped with its transaction's change_seq
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_seq = Column(BigInteger, nullable=True)
+
     # Explicit relationships to resolve ambiguity
     customer = relationship("User", foreign_keys=[customer_id])
     driver = relationship("User", foreign_keys=[driver_id])
+
+    __table_args__ = (
+        # Listing / filtering paths all sort by pickup_date desc, id desc
+        Index("ix_orders_customer_pickup", "customer_id", "pickup_date", "id"),
+        Index("ix_orders_driver_pickup", "driver_id", "pickup_date", "id"),
+        Index("ix_orders_status_pickup", "status", "pickup_date", "id"),
+        Index("ix_orders_driver_change_seq", "driver_id", "change_seq"),
+        # the address backfill walks orders with address_id IS NULL in id order
+        Index("ix_orders_address_id", "address_id", "id"),
+        # one generated order per subscription and day (NULLs don't collide)
+        UniqueConstraint("subscription_id", "pickup_date", name="uq_orders_subscription_pickup"),
+        # Trigram indexes back ILIKE search on Postgres (see services/order_search.py)
+        Index(
+            "ix_orders_pickup_address_trgm",
+            "pickup_address",
+            postgresql_using="gin",
+            postgresql_ops={"pickup_address": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_orders_special_instructions_trgm",
+            "special_instructions",
+            postgresql_using="gin",
+            postgresql_ops={"special_instructions": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# --------------------
+# Full-text search DDL
+# --------------------
+# Postgres: pg_trgm must exist before the trigram indexes above are created.
+event.listen(
+    Order.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# SQLite (local dev): an external-content FTS5 index over orders, keyed
+# by the orders rowid so trigger deletes are index lookups. orders has no
+# INTEGER PRIMARY KEY, so VACUUM may renumber rowids; run
+# INSERT INTO orders_fts(orders_fts) VALUES('rebuild') after a VACUUM.
+_SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS orders_fts USING fts5("
+    "pickup_address, special_instructions, content='orders', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS orders_fts_ai AFTER INSERT ON orders BEGIN "
+    "INSERT INTO orders_fts (rowid, pickup_address, special_instructions) "
+    "VALUES (new.rowid, new.pickup_address, new.special_instructions); END",
+    "CREATE TRIGGER IF NOT EXISTS orders_fts_ad AFTER DELETE ON orders BEGIN "
+    "INSERT INTO orders_fts (orders_fts, rowid, pickup_address, special_instructions) "
+    "VALUES ('delete', old.rowid, old.pickup_address, old.special_instructions); END",
+    "CREATE TRIGGER IF NOT EXISTS orders_fts_au AFTER UPDATE OF pickup_address, special_instructions ON orders BEGIN "
+    "INSERT INTO orders_fts (orders_fts, rowid, pickup_address, special_instructions) "
+    "VALUES ('delete', old.rowid, old.pickup_address, old.special_instructions); "
+    "INSERT INTO orders_fts (rowid, pickup_address, special_instructions) "
+    "VALUES (new.rowid, new.pickup_address, new.special_instructions); END",
+]
+
+for _stmt in _SQLITE_FTS_DDL:
+    event.listen(Order.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
@@ -0,0 +1,46 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Enum, Date, DateTime, ForeignKey, Integer, BigInteger, Boolean, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.order import LaundryType, OrderStatus
+from app.db.base import Base
+
+
+class ArchivedOrder(Base):
+    """
+    Cold storage for delivered + paid orders moved out of `orders`
+    by services/order_archive.py. Columns mirror Order.
+    """
+    __tablename__ = "orders_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+
+    customer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    driver_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+
+    pickup_address = Column(String, nullable=False)
+    laundry_type = Column(Enum(LaundryType), nullable=False)
+    pickup_date = Column(Date, nullable=False)
+    status = Column(Enum(OrderStatus), nullable=False)
+    special_instructions = Column(String, nullable=True)
+    location = Column(String, nullable=False)
+    subscription_id = Column(UUID(as_uuid=True), nullable=True)
+    address_id = Column(BigInteger().with_variant(Integer, "sqlite"), nullable=True)
+
+    weight_lbs = Column(Integer, nullable=True)
+
+    price_per_lb_cents = Column(Integer, nullable=False)
+    service_fee_cents = Column(Integer, nullable=False)
+    delivery_fee_cents = Column(Integer, nullable=False)
+    tax_rate_bp = Column(Integer, nullable=False)
+
+    subtotal_cents = Column(Integer, nullable=True)
+    tax_cents = Column(Integer, nullable=True)
+    total_cents = Column(Integer, nullable=True)
+    is_paid = Column(Boolean, default=False)
+    stripe_payment_intent_id = Column(String, nullable=True)
+
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_orders_archive_customer_pickup", "customer_id", "pickup_date", "id"),
+    )
@@ -0,0 +1,34 @@
+from datetime import datetime
+from enum import Enum as PyEnum
+from sqlalchemy import Column, BigInteger, Integer, Enum, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.order import OrderStatus
+from app.db.base import Base
+
+
+class OrderEventType(PyEnum):
+    created = "created"
+    assigned = "assigned"
+    status_changed = "status_changed"
+    paid = "paid"
+
+
+class OrderEvent(Base):
+    """
+    Append-only log of order lifecycle events. No FK to orders so rows
+    survive archiving; written in the same transaction as the change
+    they record (see services/order_events.py).
+    """
+    __tablename__ = "order_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    order_id = Column(UUID(as_uuid=True), nullable=False)
+    event_type = Column(Enum(OrderEventType), nullable=False)
+    status = Column(Enum(OrderStatus), nullable=True)  # order status after the event
+    actor_id = Column(UUID(as_uuid=True), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_order_events_order_created", "order_id", "created_at"),
+        Index("ix_order_events_created", "created_at"),
+    )
@@ -0,0 +1,31 @@
+import uuid
+from sqlalchemy import Column, Enum, Date, Integer, BigInteger
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.order import LaundryType, OrderStatus
+from app.db.base import Base
+
+# driver_id is part of the primary key, so unassigned orders use a sentinel.
+# The max UUID (all f's) rather than nil: SQLite's NUMERIC affinity would
+# store an all-zero hex string as the integer 0.
+UNASSIGNED_DRIVER_ID = uuid.UUID(int=(1 << 128) - 1)
+
+
+class OrderDailyRollup(Base):
+    """
+    Pre-aggregated order totals per pickup day, status, laundry type and driver.
+    Maintained incrementally by services/rollups.py.
+    """
+    __tablename__ = "order_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    status = Column(Enum(OrderStatus), primary_key=True)
+    laundry_type = Column(Enum(LaundryType), primary_key=True)
+    driver_id = Column(UUID(as_uuid=True), primary_key=True, default=UNASSIGNED_DRIVER_ID)
+
+    order_count = Column(Integer, nullable=False, default=0)
+    paid_count = Column(Integer, nullable=False, default=0)
+    weight_lbs = Column(BigInteger, nullable=False, default=0)
+    subtotal_cents = Column(BigInteger, nullable=False, default=0)
+    tax_cents = Column(BigInteger, nullable=False, default=0)
+    total_cents = Column(BigInteger, nullable=False, default=0)
+    paid_total_cents = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import Column, BigInteger, Integer, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+
+class OrderSyncTombstone(Base):
+    """
+    "This order left your list" marker for the driver delta-sync feed:
+    written when an order is reassigned away from a driver, unassigned,
+    or deleted/archived (see services/change_feed.py). No FK to orders so
+    rows survive the order itself.
+    """
+    __tablename__ = "order_sync_tombstones"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    driver_id = Column(UUID(as_uuid=True), nullable=False)  # the driver who lost the order
+    order_id = Column(UUID(as_uuid=True), nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_order_sync_tombstones_driver_seq", "driver_id", "change_seq", "order_id"),
+    )
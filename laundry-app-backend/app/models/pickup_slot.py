@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Date, Time, Index, UniqueConstraint, CheckConstraint
+from app.db.base import Base
+
+
+class PickupSlot(Base):
+    """
+    Bookable pickup capacity for a date, time window and zone (zip prefix,
+    "" = everywhere). `booked` only ever changes through the conditional
+    increment in services/pickup_slots.py.
+    """
+    __tablename__ = "pickup_slots"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    slot_date = Column(Date, nullable=False)
+    window_start = Column(Time, nullable=False)
+    window_end = Column(Time, nullable=False)
+    zone = Column(String, nullable=False, default="")
+
+    capacity = Column(Integer, nullable=False)
+    booked = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("slot_date", "window_start", "zone", name="uq_pickup_slots_date_window_zone"),
+        CheckConstraint("booked >= 0 AND booked <= capacity", name="ck_pickup_slots_capacity"),
+        Index("ix_pickup_slots_date_zone", "slot_date", "zone"),
+    )
@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Enum, Date, DateTime
+from app.models.order import LaundryType
+from app.db.base import Base
+
+
+class PricingRule(Base):
+    """
+    Price and tax settings for a laundry type / zip zone / date range.
+    NULL laundry_type or zip_prefix matches anything. Compiled into an
+    in-memory table by services/pricing_rules.py.
+    """
+    __tablename__ = "pricing_rules"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    laundry_type = Column(Enum(LaundryType), nullable=True)
+    zip_prefix = Column(String, nullable=True)  # "100" matches 10001, 10002, ...
+    effective_from = Column(Date, nullable=False)
+    effective_to = Column(Date, nullable=True)  # inclusive; NULL = open-ended
+    tax_jurisdiction = Column(String, nullable=True)
+
+    price_per_lb_cents = Column(Integer, nullable=False)
+    service_fee_cents = Column(Integer, nullable=False)
+    delivery_fee_cents = Column(Integer, nullable=False)
+    tax_rate_bp = Column(Integer, nullable=False)  # basis points: 700 = 7.00%
+
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
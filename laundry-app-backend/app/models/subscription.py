@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+from enum import Enum as PyEnum
+from sqlalchemy import Column, String, Enum, Date, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+from app.core.config import settings
+from app.models.order import LaundryType
+
+
+class SubscriptionCadence(PyEnum):
+    weekly = "weekly"
+    biweekly = "biweekly"
+
+
+CADENCE_DAYS = {
+    SubscriptionCadence.weekly: 7,
+    SubscriptionCadence.biweekly: 14,
+}
+
+
+class Subscription(Base):
+    """
+    A recurring pickup. Orders are generated ahead of time by
+    app/jobs/generate_subscription_orders.py, on every `anchor_date` +
+    n * cadence; (subscription_id, pickup_date) is unique on orders.
+    """
+    __tablename__ = "subscriptions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    customer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    location = Column(String, nullable=False, default=lambda: settings.DEFAULT_LOCATION)
+
+    cadence = Column(Enum(SubscriptionCadence), nullable=False)
+    anchor_date = Column(Date, nullable=False)  # first pickup; sets the weekday
+    end_date = Column(Date, nullable=True)
+
+    pickup_address = Column(String, nullable=False)
+    laundry_type = Column(Enum(LaundryType), nullable=False)
+    special_instructions = Column(String, nullable=True)
+
+    is_active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # the generator walks active subscriptions in id order
+        Index("ix_subscriptions_active_id", "is_active", "id"),
+    )
@@ -2,6 +2,7 @@ import uuid
 from sqlalchemy import Column, String, Boolean, Enum
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
+from app.core.config import settings
 import enum
 
 class UserRole(str, enum.Enum):
@@ -17,4 +18,6 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     role = Column(Enum(UserRole), default=UserRole.customer, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
-    is_verified = Column(Boolean, default=False, nullable=False)
\ No newline at end of file
+    is_verified = Column(Boolean, default=False, nullable=False)
+    # laundromat site; decides which shard holds this user's orders
+    location = Column(String, nullable=False, default=lambda: settings.DEFAULT_LOCATION, index=True)
\ No newline at end of file
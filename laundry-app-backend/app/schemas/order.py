@@ -1,6 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
 from enum import Enum
+from typing import List
+from uuid import UUID
+from app.models.order import OrderStatus
 
 
 class LaundryType(str, Enum):
@@ -13,3 +16,14 @@ class OrderCreate(BaseModel):
     laundry_type: LaundryType
     pickup_date: date
     special_instructions: str | None = None
+    pickup_slot_id: int | None = None  # from /orders/slots/available
+
+
+class SyncStatusChange(BaseModel):
+    client_ref: str  # echoed back so the app can match results to its queue
+    order_id: UUID
+    new_status: OrderStatus
+
+
+class SyncPushRequest(BaseModel):
+    changes: List[SyncStatusChange] = Field(..., max_length=200)
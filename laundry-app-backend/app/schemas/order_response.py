@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, datetime
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 from pydantic import BaseModel, Field
@@ -10,6 +10,13 @@ class OrderTimeline(BaseModel):
     ready_for_delivery: bool
     delivered: bool
 
+    # first time the order reached each status (from the order event log)
+    scheduled_at: Optional[datetime] = None
+    picked_up_at: Optional[datetime] = None
+    in_cleaning_at: Optional[datetime] = None
+    ready_for_delivery_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
+
 class OrderPublic(BaseModel):
     order_id: UUID
     pickup_address: str
@@ -40,3 +47,54 @@ class ListResponse(BaseModel):
 
 class SingleResponse(BaseModel):
     data: OrderPublic
+
+class CursorMeta(BaseModel):
+    limit: int
+    count: int
+    next_cursor: Optional[str] = None
+
+class CursorListResponse(BaseModel):
+    data: List[OrderPublic]
+    meta: CursorMeta
+
+class SyncOrder(OrderPublic):
+    change_seq: int
+    updated_at: datetime
+
+class SyncItemResult(BaseModel):
+    client_ref: str
+    order_id: UUID
+    ok: bool
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+class SyncPushResponse(BaseModel):
+    results: List[SyncItemResult]
+    applied: int
+
+class ManifestStop(BaseModel):
+    order_id: UUID
+    seq: Optional[int] = None
+    address: str
+    status: str
+    laundry_type: str
+    notes: Optional[str] = None
+    is_paid: bool
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+class DriverManifest(BaseModel):
+    driver_id: UUID
+    pickup_date: date
+    generated_at: datetime
+    stops: List[ManifestStop]
+
+class SyncRemoval(BaseModel):
+    order_id: UUID
+    change_seq: int
+
+class SyncPullResponse(BaseModel):
+    data: List[SyncOrder]
+    removed: List[SyncRemoval]  # orders no longer assigned to this driver; apply before `data`
+    cursor: Optional[str] = None  # opaque; pass back as `cursor` on the next pull
+    has_more: bool
@@ -0,0 +1,25 @@
+from datetime import date, time
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class SlotWindow(BaseModel):
+    start: time
+    end: time
+
+
+class PickupSlotBatchCreate(BaseModel):
+    date_from: date
+    date_to: date
+    windows: List[SlotWindow] = Field(..., min_length=1)
+    zone: str = Field("", pattern=r"^\d{0,5}$")  # zip prefix, "" = everywhere
+    capacity: int = Field(..., gt=0)
+
+
+class PickupSlotPublic(BaseModel):
+    slot_id: int
+    slot_date: date
+    window_start: time
+    window_end: time
+    zone: str
+    remaining: int
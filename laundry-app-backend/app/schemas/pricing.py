@@ -0,0 +1,21 @@
+from datetime import date
+from typing import Optional
+from pydantic import BaseModel, Field
+from app.schemas.order import LaundryType
+
+
+class PricingRuleCreate(BaseModel):
+    laundry_type: Optional[LaundryType] = None
+    zip_prefix: Optional[str] = Field(None, pattern=r"^\d{1,5}$")
+    effective_from: date
+    effective_to: Optional[date] = None
+    tax_jurisdiction: Optional[str] = None
+
+    price_per_lb_cents: int = Field(..., ge=0)
+    service_fee_cents: int = Field(..., ge=0)
+    delivery_fee_cents: int = Field(..., ge=0)
+    tax_rate_bp: int = Field(..., ge=0, le=10_000)
+
+
+class PricingRulePublic(PricingRuleCreate):
+    id: int
@@ -0,0 +1,20 @@
+from datetime import date
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+from app.models.subscription import SubscriptionCadence
+from app.schemas.order import LaundryType
+
+
+class SubscriptionCreate(BaseModel):
+    cadence: SubscriptionCadence
+    anchor_date: date  # first pickup; later pickups fall on the same weekday
+    end_date: Optional[date] = None
+    pickup_address: str
+    laundry_type: LaundryType
+    special_instructions: Optional[str] = None
+
+
+class SubscriptionPublic(SubscriptionCreate):
+    subscription_id: UUID
+    is_active: bool
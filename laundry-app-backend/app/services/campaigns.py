@@ -0,0 +1,205 @@
+import logging
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Iterator, List, Optional
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.resilience import sendgrid_dependency
+from app.models.campaign_run import CampaignRun
+from app.models.order import Order, OrderStatus
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# SendGrid accepts at most 1000 personalizations per /v3/mail/send request
+MAX_PERSONALIZATIONS = 1000
+
+REMINDER_SUBJECT = "Reminder: laundry pickup tomorrow"
+REMINDER_BODY = (
+    "Hello! This is a reminder that your laundry pickup (order #-order_id-) "
+    "is scheduled for -pickup_date- at -pickup_address-."
+)
+
+
+# --------------------
+# Transports
+# --------------------
+class MailTransport(ABC):
+    @abstractmethod
+    def send(self, payload: dict) -> int:
+        """
+        Deliver one /v3/mail/send payload; returns the HTTP status code.
+        """
+
+    def close(self):
+        pass
+
+
+class SendGridTransport(MailTransport):
+    """
+    One pooled HTTP client for the whole run, so every batch reuses the
+    same keep-alive connection instead of a new SendGridAPIClient per email.
+    Sends go through the shared SendGrid circuit breaker: while it is open
+    the campaign stops at its checkpoint and can be rerun later.
+    """
+
+    def __init__(self, api_key: str, timeout_seconds: float, base_url: str = "https://api.sendgrid.com"):
+        self._client = httpx.Client(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout_seconds,
+        )
+
+    def send(self, payload: dict) -> int:
+        return sendgrid_dependency.call(self._post, payload)
+
+    def _post(self, payload: dict) -> int:
+        response = self._client.post("/v3/mail/send", json=payload)
+        response.raise_for_status()
+        return response.status_code
+
+    def close(self):
+        self._client.close()
+
+
+class StubTransport(MailTransport):
+    """
+    Records payloads instead of sending them (dry runs and tests).
+    """
+
+    def __init__(self):
+        self.payloads: List[dict] = []
+
+    def send(self, payload: dict) -> int:
+        self.payloads.append(payload)
+        return 202
+
+
+# --------------------
+# Campaign
+# --------------------
+def _reminder_targets(db: Session, pickup_date: date, after_id, chunk_size: int) -> Iterator[list]:
+    """
+    Yield chunks of (order_id, pickup_address, pickup_date, email) for
+    scheduled orders on `pickup_date`, keyset-paginated on order id so
+    memory stays flat however many orders there are.
+    """
+    while True:
+        stmt = (
+            select(Order.id, Order.pickup_address, Order.pickup_date, User.email)
+            .join(User, User.id == Order.customer_id)
+            .where(Order.status == OrderStatus.scheduled, Order.pickup_date == pickup_date)
+            .order_by(Order.id)
+            .limit(chunk_size)
+        )
+        if after_id is not None:
+            stmt = stmt.where(Order.id > after_id)
+
+        rows = db.execute(stmt).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        after_id = rows[-1].id
+
+
+def build_reminder_payload(rows, from_email: str) -> dict:
+    return {
+        "from": {"email": from_email},
+        "subject": REMINDER_SUBJECT,
+        "content": [{"type": "text/plain", "value": REMINDER_BODY}],
+        "personalizations": [
+            {
+                "to": [{"email": r.email}],
+                "substitutions": {
+                    "-order_id-": str(r.id),
+                    "-pickup_date-": r.pickup_date.isoformat(),
+                    "-pickup_address-": r.pickup_address,
+                },
+                "custom_args": {"order_id": str(r.id)},
+            }
+            for r in rows
+        ],
+    }
+
+
+def _dry_run(db: Session, key: str, checkpoint: Optional[CampaignRun], pickup_date: date,
+             transport: MailTransport, batch_size: int, from_email: str) -> CampaignRun:
+    preview = CampaignRun(
+        campaign_key=key,
+        status="dry_run",
+        last_order_id=checkpoint.last_order_id if checkpoint else None,
+        sent_count=0,
+        batch_count=0,
+    )
+    if checkpoint and checkpoint.status == "completed":
+        return preview
+    for rows in _reminder_targets(db, pickup_date, preview.last_order_id, batch_size):
+        transport.send(build_reminder_payload(rows, from_email))
+        preview.last_order_id = rows[-1].id
+        preview.sent_count += len(rows)
+        preview.batch_count += 1
+    return preview
+
+
+def send_pickup_reminders(
+    db: Session,
+    pickup_date: date,
+    transport: MailTransport,
+    batch_size: int = MAX_PERSONALIZATIONS,
+    from_email: Optional[str] = None,
+    dry_run: bool = False,
+) -> CampaignRun:
+    """
+    Email every customer with a scheduled pickup on `pickup_date`, up to
+    `batch_size` recipients per SendGrid request. Progress is checkpointed
+    after each batch; rerunning resumes from the checkpoint and a completed
+    campaign is not sent twice. A crash between a send and its checkpoint
+    re-sends that one batch on resume.
+
+    With `dry_run`, the batches a real run would send from the current
+    checkpoint go to `transport` and nothing is written: the returned run
+    is not saved, so a later real run is unaffected.
+    """
+    batch_size = max(1, min(batch_size, MAX_PERSONALIZATIONS))
+    from_email = from_email or settings.from_email
+    key = f"pickup_reminder:{pickup_date.isoformat()}"
+
+    run = db.query(CampaignRun).filter(CampaignRun.campaign_key == key).first()
+    if dry_run:
+        return _dry_run(db, key, run, pickup_date, transport, batch_size, from_email)
+    if run and run.status == "completed":
+        logger.info("Campaign %s already completed (%d sent)", key, run.sent_count)
+        return run
+    if not run:
+        run = CampaignRun(campaign_key=key)
+        db.add(run)
+    run.status = "running"
+    run.last_error = None
+    db.commit()
+
+    try:
+        for rows in _reminder_targets(db, pickup_date, run.last_order_id, batch_size):
+            transport.send(build_reminder_payload(rows, from_email))
+
+            run.last_order_id = rows[-1].id
+            run.sent_count += len(rows)
+            run.batch_count += 1
+            db.commit()
+            logger.info("Campaign %s: batch %d sent (%d total)", key, run.batch_count, run.sent_count)
+    except Exception as e:
+        db.rollback()
+        run.status = "failed"
+        run.last_error = str(e)[:500]
+        db.commit()
+        raise
+
+    run.status = "completed"
+    run.completed_at = datetime.utcnow()
+    db.commit()
+    return run
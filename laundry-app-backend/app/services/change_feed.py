@@ -0,0 +1,146 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, event, inspect, literal, or_, select, text, true, update
+from sqlalchemy.orm import Session
+
+from app.models.change_counter import ChangeCounter
+from app.models.order import Order
+from app.models.order_sync_tombstone import OrderSyncTombstone
+
+_STAMP_KEY = "order_change_stamp"
+
+
+def allocate(conn, name: str, count: int) -> int:
+    """
+    Reserve `count` values from a named counter; returns the last one.
+    The UPDATE holds the counter's row lock until commit, so values become
+    visible in allocation order and a reader's cursor never skips a row
+    committed later with a smaller number.
+    """
+    return conn.execute(
+        update(ChangeCounter)
+        .where(ChangeCounter.name == name)
+        .values(value=ChangeCounter.value + count)
+        .returning(ChangeCounter.value)
+    ).scalar_one()
+
+
+# --------------------
+# Change stamps
+# --------------------
+# Every order row a transaction writes gets the same change_seq: the
+# transaction's stamp, taken on its first order write.
+#
+# Postgres: the transaction id. Nothing is locked, so order writes don't
+# queue behind one counter row. Ids are handed out at transaction start,
+# not at commit, so readers only see stamps below the oldest transaction
+# still running (see visible_clause); a cursor can then never pass a
+# stamp that commits later.
+#
+# SQLite: one writer at a time anyway, so the `orders` counter row gives
+# stamps in commit order at no extra cost.
+
+def change_stamp(session: Session) -> int:
+    stamp = session.info.get(_STAMP_KEY)
+    if stamp is None:
+        conn = session.connection()
+        if conn.dialect.name == "postgresql":
+            stamp = conn.execute(text("SELECT pg_current_xact_id()::text::bigint")).scalar_one()
+        else:
+            stamp = allocate(conn, "orders", 1)
+        session.info[_STAMP_KEY] = stamp
+    return stamp
+
+
+def visible_clause(db: Session, seq_column):
+    """
+    Rows whose stamp is safe to hand out: on Postgres, stamps of
+    transactions that have all finished. A long-running order transaction
+    holds the feed back (never loses rows) until it ends.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return seq_column < text("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+    return true()
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _drop_stamp(session):
+    session.info.pop(_STAMP_KEY, None)
+
+
+# driver_id's old value must be loaded when it is reassigned, so the
+# flush hook below knows which driver to send a tombstone to
+@event.listens_for(Order.driver_id, "set", active_history=True)
+def _load_previous_driver(target, value, oldvalue, initiator):
+    pass
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_order_changes(session, flush_context, instances):
+    changed = [obj for obj in session.new if isinstance(obj, Order)]
+    changed += [
+        obj for obj in session.dirty
+        if isinstance(obj, Order) and session.is_modified(obj, include_collections=False)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Order)]
+    if not changed and not deleted:
+        return
+
+    stamp = change_stamp(session)
+    for order in changed:
+        order.change_seq = stamp
+
+    removed = []
+    for order in changed:
+        old = inspect(order).attrs.driver_id.history.deleted
+        if old and old[0] is not None and old[0] != order.driver_id:
+            removed.append((old[0], order.id))
+    removed += [(order.driver_id, order.id) for order in deleted if order.driver_id is not None]
+    for driver_id, order_id in removed:
+        session.add(OrderSyncTombstone(driver_id=driver_id, order_id=order_id, change_seq=stamp))
+
+
+def tombstone_deleted_orders(db: Session, order_ids) -> None:
+    """
+    Tombstones for orders about to be deleted with a Core DELETE (which
+    the flush hook never sees). Call before the delete.
+    """
+    stamp = change_stamp(db)
+    db.execute(
+        OrderSyncTombstone.__table__.insert().from_select(
+            ["driver_id", "order_id", "change_seq", "created_at"],
+            select(Order.driver_id, Order.id, literal(stamp), literal(datetime.utcnow()))
+            .where(Order.id.in_(order_ids), Order.driver_id.is_not(None)),
+        )
+    )
+
+
+# --------------------
+# Sync cursors
+# --------------------
+# Several orders share a stamp, so the feed pages by (change_seq, order_id).
+
+def encode_sync_cursor(change_seq: int, order_id: uuid.UUID) -> str:
+    raw = f"{change_seq}|{order_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_cursor(cursor: str) -> Tuple[int, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        seq, order_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return int(seq), uuid.UUID(order_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_cursor_clause(cursor: Optional[str], seq_column, id_column):
+    if not cursor:
+        return true()
+    seq, order_id = decode_sync_cursor(cursor)
+    return or_(seq_column > seq, and_(seq_column == seq, id_column > order_id))
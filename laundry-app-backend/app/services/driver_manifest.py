@@ -0,0 +1,140 @@
+from datetime import date, datetime
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.address import Address
+from app.models.order import Order
+from app.services.pricing_rules import extract_zip
+
+# (driver_id, pickup_date) -> manifest dict. Per process: a commit drops
+# the entries it touched in its own worker only, so the TTL is kept short
+# (MANIFEST_CACHE_TTL_SECONDS) to bound what other workers serve. It still
+# absorbs drivers' apps polling the same manifest.
+manifest_cache = TTLCache(ttl_seconds=settings.MANIFEST_CACHE_TTL_SECONDS, max_entries=4096)
+
+_STOP_COLUMNS = (
+    Order.id,
+    Order.route_sequence,
+    Order.pickup_address,
+    Order.status,
+    Order.laundry_type,
+    Order.special_instructions,
+    Order.is_paid,
+)
+
+# Order attributes shown on (or deciding membership of) a manifest
+_MANIFEST_ATTRS = ("driver_id", "pickup_date") + tuple(c.key for c in _STOP_COLUMNS if c.key != "id")
+
+_PENDING_KEY = "manifest_invalidations"
+
+
+def _route_key(order: Order):
+    # zip first, then street: a cheap stand-in for real routing
+    return (extract_zip(order.pickup_address) or "99999", order.pickup_address.lower(), str(order.id))
+
+
+def resequence_route(db: Session, driver_id, pickup_date: date):
+    """
+    Number a driver's stops for the day in route order. Called at
+    assignment time for the new driver and the previous one, inside the
+    caller's transaction.
+    """
+    stops = db.query(Order).filter(Order.driver_id == driver_id, Order.pickup_date == pickup_date).all()
+    for seq, order in enumerate(sorted(stops, key=_route_key), start=1):
+        if order.route_sequence != seq:
+            order.route_sequence = seq
+
+
+def build_manifest(db: Session, driver_id, pickup_date: date) -> dict:
+    """
+    A driver's stops for one day, cached until one of them changes.
+    """
+    key = (driver_id, pickup_date)
+    cached = manifest_cache.get(key)
+    if cached is not None:
+        return cached
+
+    rows = db.execute(
+        select(*_STOP_COLUMNS, Address.latitude, Address.longitude)
+        .outerjoin(Address, Address.id == Order.address_id)
+        .where(Order.driver_id == driver_id, Order.pickup_date == pickup_date)
+        .order_by(Order.route_sequence.asc().nulls_last(), Order.id)
+    ).all()
+
+    manifest = {
+        "driver_id": driver_id,
+        "pickup_date": pickup_date,
+        "generated_at": datetime.utcnow(),
+        "stops": [
+            {
+                "order_id": r.id,
+                "seq": r.route_sequence,
+                "address": r.pickup_address,
+                "status": r.status.value,
+                "laundry_type": r.laundry_type.value,
+                "notes": r.special_instructions,
+                "is_paid": bool(r.is_paid),
+                # NULL until the resolver job has geocoded the address
+                "latitude": r.latitude,
+                "longitude": r.longitude,
+            }
+            for r in rows
+        ],
+    }
+    manifest_cache.set(key, manifest)
+    return manifest
+
+
+# --------------------
+# Invalidation
+# --------------------
+def _affected(order: Order, deleted: bool = False):
+    """
+    (driver_id, pickup_date) manifests that show this order before or
+    after the flush, if a manifest field changed.
+    """
+    state = inspect(order)
+    if not deleted and state.persistent and not any(
+        state.attrs[name].history.has_changes() for name in _MANIFEST_ATTRS
+    ):
+        return set()
+
+    keys = set()
+    driver_hist = state.attrs.driver_id.history
+    date_hist = state.attrs.pickup_date.history
+    drivers = set(driver_hist.sum()) - {None}
+    dates = set(date_hist.sum()) - {None}
+    for driver_id in drivers:
+        for day in dates:
+            keys.add((driver_id, day))
+    return keys
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_manifest_changes(session, flush_context):
+    keys = set()
+    for obj in session.new:
+        if isinstance(obj, Order):
+            keys |= _affected(obj)
+    for obj in session.dirty:
+        if isinstance(obj, Order):
+            keys |= _affected(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Order):
+            keys |= _affected(obj, deleted=True)
+    if keys:
+        session.info.setdefault(_PENDING_KEY, set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_manifests(session):
+    for key in session.info.pop(_PENDING_KEY, ()):
+        manifest_cache.invalidate(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_manifest_changes(session):
+    session.info.pop(_PENDING_KEY, None)
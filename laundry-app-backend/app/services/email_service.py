@@ -1,8 +1,13 @@
+import logging
 import os
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.resilience import DependencyUnavailable, sendgrid_dependency
+
+logger = logging.getLogger(__name__)
 
 # Fully corrected send_verification_email
 async def send_verification_email(email: str, token: str):
@@ -30,10 +35,15 @@ async def send_email(to_email: str, subject: str, content: str):
     
     try:
         sg = SendGridAPIClient(api_key)
-        response = sg.send(message)
+        sg.client.timeout = settings.SENDGRID_TIMEOUT_SECONDS
+        # the client is blocking: keep it off the event loop
+        response = await run_in_threadpool(sendgrid_dependency.call, sg.send, message)
         return response.status_code
-    except Exception as e:
-        print(f"SendGrid Error: {e}")
+    except DependencyUnavailable as e:
+        logger.warning("Email to %s skipped: %s", to_email, e)
+        return None
+    except Exception:
+        logger.exception("SendGrid send failed", extra={"subject": subject})
         return None
 
 
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import select, insert, delete, union_all
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, OrderStatus
+from app.models.order_archive import ArchivedOrder
+from app.services.change_feed import tombstone_deleted_orders
+
+# Columns copied verbatim from orders -> orders_archive
+_ARCHIVED_COLUMNS = [
+    c.name for c in ArchivedOrder.__table__.columns if c.name in Order.__table__.columns
+]
+
+# Columns exposed by customer history (see OrderPublic)
+HISTORY_COLUMNS = (
+    "id",
+    "customer_id",
+    "driver_id",
+    "pickup_address",
+    "pickup_date",
+    "status",
+    "special_instructions",
+    "weight_lbs",
+    "subtotal_cents",
+    "tax_cents",
+    "total_cents",
+)
+
+
+def archive_delivered_orders(db: Session, older_than_days: int, batch_size: int = 500) -> int:
+    """
+    Move delivered, paid orders with a pickup_date older than `older_than_days`
+    into orders_archive. Each batch is its own transaction so locks stay short
+    and a crash only loses the in-flight batch. Returns the number moved.
+    """
+    cutoff = date.today() - timedelta(days=older_than_days)
+    moved = 0
+
+    while True:
+        ids = db.execute(
+            select(Order.id)
+            .where(
+                Order.status == OrderStatus.delivered,
+                Order.is_paid.is_(True),
+                Order.pickup_date < cutoff,
+            )
+            .order_by(Order.pickup_date, Order.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+
+        if not ids:
+            break
+
+        source_cols = [Order.__table__.c[name] for name in _ARCHIVED_COLUMNS]
+        db.execute(
+            insert(ArchivedOrder).from_select(
+                _ARCHIVED_COLUMNS,
+                select(*source_cols).where(Order.id.in_(ids)),
+            )
+        )
+        # drivers still holding these orders drop them on their next sync
+        tombstone_deleted_orders(db, ids)
+        db.execute(delete(Order).where(Order.id.in_(ids)))
+        db.commit()
+
+        moved += len(ids)
+        if len(ids) < batch_size:
+            break
+
+    return moved
+
+
+def customer_history(customer_id, status: Optional[OrderStatus] = None):
+    """
+    Subquery over live and archived orders for one customer. The archive only
+    ever holds delivered orders, so other status filters skip it entirely.
+    """
+    models = [Order]
+    if status is None or status == OrderStatus.delivered:
+        models.append(ArchivedOrder)
+
+    selects = []
+    for model in models:
+        stmt = select(*[model.__table__.c[name] for name in HISTORY_COLUMNS]).where(
+            model.customer_id == customer_id
+        )
+        if status:
+            stmt = stmt.where(model.status == status)
+        selects.append(stmt)
+
+    if len(selects) == 1:
+        return selects[0].subquery("order_history")
+    return union_all(*selects).subquery("order_history")
@@ -0,0 +1,85 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db.dialect import dialect_insert
+from app.models.order import Order, OrderStatus
+from app.models.order_event import OrderEventType
+from app.services.change_feed import change_stamp
+from app.services.order_events import record_event
+from app.services.rollups import MEASURES, apply_deltas, contribution
+
+# Columns every bulk row carries, so one executemany covers the batch
+_DEFAULTS = {
+    "driver_id": None,
+    "status": OrderStatus.scheduled,
+    "special_instructions": None,
+    "pickup_slot_id": None,
+    "subscription_id": None,
+    "route_sequence": None,
+    "address_id": None,
+    "weight_lbs": None,
+    "subtotal_cents": None,
+    "tax_cents": None,
+    "total_cents": None,
+    "is_paid": False,
+    "stripe_payment_intent_id": None,
+}
+
+
+def prepare_rows(db: Session, rows: List[dict]) -> List[dict]:
+    """
+    Fill ids, defaults and the transaction's change stamp into plain
+    order dicts. Core inserts bypass the ORM flush hooks (change_feed, rollups),
+    so callers stamp what those hooks would have done themselves.
+    """
+    if not rows:
+        return rows
+
+    now = datetime.utcnow()
+    stamp = change_stamp(db)
+
+    prepared = []
+    for row in rows:
+        full = {**_DEFAULTS, **row}
+        full.setdefault("id", uuid.uuid4())
+        full["change_seq"] = stamp
+        full["updated_at"] = now
+        prepared.append(full)
+    return prepared
+
+
+def insert_orders(db: Session, rows: List[dict], conflict_columns: Optional[Sequence[str]] = None) -> List[dict]:
+    """
+    Insert prepared rows with one executemany and return the rows that
+    were actually inserted. With `conflict_columns`, rows that collide on
+    that unique key are skipped (idempotent reruns).
+    """
+    if not rows:
+        return []
+
+    table = Order.__table__
+    if conflict_columns:
+        stmt = dialect_insert(db.get_bind(), table).on_conflict_do_nothing(index_elements=list(conflict_columns))
+    else:
+        stmt = insert(table)
+    inserted_ids = set(db.execute(stmt.returning(table.c.id), rows).scalars())
+    return [r for r in rows if r["id"] in inserted_ids]
+
+
+def after_bulk_insert(db: Session, rows: List[dict], actor_id=None):
+    """
+    What the flush hooks and create_order do per order, done once for the
+    batch: rollup deltas in one upsert and a `created` event per order
+    (inserted with the batch by the before_commit hook in order_events).
+    """
+    deltas = defaultdict(lambda: (0,) * len(MEASURES))
+    for row in rows:
+        key, measures = contribution(row)
+        deltas[key] = tuple(a + b for a, b in zip(deltas[key], measures))
+        record_event(db, row["id"], OrderEventType.created, row["status"], actor_id)
+    apply_deltas(db.connection(), deltas)
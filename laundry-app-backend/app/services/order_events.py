@@ -0,0 +1,177 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event, insert, select, func, case, cast, literal, union_all, Integer
+from sqlalchemy.orm import Session
+
+from app.models.order import OrderStatus
+from app.models.order_event import OrderEvent, OrderEventType
+
+_PENDING_KEY = "pending_order_events"
+
+
+# --------------------
+# Recording
+# --------------------
+def record_event(
+    db: Session,
+    order_id,
+    event_type: OrderEventType,
+    status: Optional[OrderStatus] = None,
+    actor_id=None,
+):
+    """
+    Stage an event on the session. Staged events are inserted with one
+    executemany just before the session commits, in the same transaction
+    as the change they describe: the change and its events are durable
+    together or not at all.
+    """
+    db.info.setdefault(_PENDING_KEY, []).append(
+        {
+            "order_id": order_id,
+            "event_type": event_type,
+            "status": status,
+            "actor_id": actor_id,
+            "created_at": datetime.utcnow(),
+        }
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _write_staged_events(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        session.flush()
+        session.connection().execute(insert(OrderEvent.__table__), pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back_events(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# --------------------
+# Reading
+# --------------------
+def status_timestamps(db: Session, order_ids) -> dict:
+    """
+    {order_id: {status: first time the order reached it}} for a page of
+    orders, in a single grouped query.
+    """
+    if not order_ids:
+        return {}
+
+    rows = db.execute(
+        select(OrderEvent.order_id, OrderEvent.status, func.min(OrderEvent.created_at))
+        .where(OrderEvent.order_id.in_(order_ids), OrderEvent.status.isnot(None))
+        .group_by(OrderEvent.order_id, OrderEvent.status)
+    )
+
+    stamps = defaultdict(dict)
+    for order_id, status, at in rows:
+        stamps[order_id][status] = at
+    return stamps
+
+
+SLA_STAGES = (
+    ("pickup", OrderStatus.scheduled, OrderStatus.picked_up),
+    ("cleaning", OrderStatus.picked_up, OrderStatus.in_cleaning),
+    ("ready", OrderStatus.in_cleaning, OrderStatus.ready_for_delivery),
+    ("delivery", OrderStatus.ready_for_delivery, OrderStatus.delivered),
+    ("end_to_end", OrderStatus.scheduled, OrderStatus.delivered),
+)
+
+
+# Durations are counted in buckets of this many seconds, so the database
+# returns a histogram instead of one row per order
+SLA_BUCKET_SECONDS = 60
+
+
+def _seconds_between(db: Session, start, end):
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * 86400
+    return func.extract("epoch", end - start)
+
+
+def stage_histograms(db: Session, created_from: datetime, created_to: datetime) -> dict:
+    """
+    {stage: {bucket: orders}} for orders created in the window, where
+    bucket n holds durations in [n, n + 1) * SLA_BUCKET_SECONDS. Computed
+    from the first time each order reached each status, entirely in SQL.
+    """
+    created = (
+        select(OrderEvent.order_id)
+        .where(
+            OrderEvent.event_type == OrderEventType.created,
+            OrderEvent.created_at >= created_from,
+            OrderEvent.created_at < created_to,
+        )
+        .scalar_subquery()
+    )
+    firsts = (
+        select(OrderEvent.order_id, OrderEvent.status, func.min(OrderEvent.created_at).label("at"))
+        .where(OrderEvent.order_id.in_(created), OrderEvent.status.isnot(None))
+        .group_by(OrderEvent.order_id, OrderEvent.status)
+        .subquery()
+    )
+    # one row per order, one column per status
+    per_order = (
+        select(*[
+            func.max(case((firsts.c.status == status, firsts.c.at))).label(status.value)
+            for status in OrderStatus
+        ])
+        .group_by(firsts.c.order_id)
+        .subquery()
+    )
+
+    per_stage = []
+    for name, start, end in SLA_STAGES:
+        seconds = _seconds_between(db, per_order.c[start.value], per_order.c[end.value])
+        bucket = cast(func.floor(seconds / SLA_BUCKET_SECONDS), Integer).label("bucket")
+        per_stage.append(
+            select(literal(name).label("stage"), bucket, func.count().label("orders"))
+            .where(per_order.c[start.value].isnot(None), per_order.c[end.value].isnot(None))
+            .group_by(bucket)
+        )
+
+    histograms = {name: {} for name, _, _ in SLA_STAGES}
+    for stage, bucket, orders in db.execute(union_all(*per_stage)):
+        histograms[stage][bucket] = orders
+    return histograms
+
+
+def merge_histograms(histograms: list) -> dict:
+    """
+    Add up stage_histograms() results from several shards.
+    """
+    merged = {name: defaultdict(int) for name, _, _ in SLA_STAGES}
+    for shard in histograms:
+        for stage, buckets in shard.items():
+            for bucket, orders in buckets.items():
+                merged[stage][bucket] += orders
+    return merged
+
+
+def summarize_histograms(histograms: dict, percentiles=(50, 90, 95, 99)) -> dict:
+    """
+    Nearest-rank percentiles per stage, reported as the upper edge of the
+    bucket holding that rank (so accurate to SLA_BUCKET_SECONDS).
+    """
+    result = {}
+    for name, buckets in histograms.items():
+        total = sum(buckets.values())
+        summary = {"count": total}
+        for p in percentiles:
+            summary[f"p{p}_seconds"] = None
+            if not total:
+                continue
+            rank = max(1, -(-p * total // 100))
+            seen = 0
+            for bucket in sorted(buckets):
+                seen += buckets[bucket]
+                if seen >= rank:
+                    summary[f"p{p}_seconds"] = (bucket + 1) * SLA_BUCKET_SECONDS
+                    break
+        result[name] = summary
+    return result
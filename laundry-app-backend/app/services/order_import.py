@@ -0,0 +1,246 @@
+import csv
+import io
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.models.order import LaundryType, Order
+from app.models.user import User, UserRole
+from app.schemas.order import OrderCreate
+from app.services.addresses import get_address_ids
+from app.services.order_bulk import after_bulk_insert, insert_orders, prepare_rows
+from app.services.pricing_rules import extract_zip, pricing_store
+from app.services.user_mirror import mirror_user
+
+REQUIRED_COLUMNS = ("customer_email", "pickup_address", "laundry_type", "pickup_date")
+
+# Keep memory bounded on badly broken files: count every error, keep the first N
+MAX_REPORTED_ERRORS = 1000
+
+_REPLACEMENT_CHAR = "\ufffd"
+
+# Column order used for COPY; every prepared row has all of these keys
+_COPY_COLUMNS = [c.name for c in Order.__table__.columns]
+
+
+@dataclass
+class ImportResult:
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[dict] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return round(self.total_rows / self.seconds, 1) if self.seconds else 0.0
+
+    def add_error(self, row_number: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "total_rows": self.total_rows,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+def _numbered_rows(reader: Iterator[dict], result: "ImportResult") -> Iterator[Tuple[int, dict]]:
+    """
+    (row number, row) pairs; row numbers count the header as row 1, like
+    a spreadsheet. A record the csv module cannot parse (e.g. a field
+    over the size limit) is reported and skipped; the reader resumes on
+    the next line.
+    """
+    row_number = 1
+    while True:
+        row_number += 1
+        try:
+            raw = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            result.total_rows += 1
+            result.add_error(row_number, f"unreadable CSV record: {e}")
+            continue
+        yield row_number, raw
+
+
+def _chunks(rows: Iterator[Tuple[int, dict]], size: int):
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+
+
+def _copy_payload(rows: List[dict]) -> io.StringIO:
+    """
+    Rows as COPY CSV input, columns in _COPY_COLUMNS order.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        out = []
+        for name in _COPY_COLUMNS:
+            value = row[name]
+            if value is None:
+                out.append("")  # unquoted empty field is NULL in CSV mode
+            elif hasattr(value, "name") and hasattr(value, "value"):
+                out.append(value.name)  # SQLAlchemy stores enum names
+            elif isinstance(value, bool):
+                out.append("true" if value else "false")
+            else:
+                out.append(str(value))
+        writer.writerow(out)
+    buffer.seek(0)
+    return buffer
+
+
+def _copy_rows(db: Session, rows: List[dict]):
+    """
+    Stream rows into orders with COPY ... FROM STDIN (psycopg2).
+    """
+    # the session's own DBAPI connection, so COPY joins its transaction
+    dbapi_conn = db.connection().connection.driver_connection
+    with dbapi_conn.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY orders ({', '.join(_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            _copy_payload(rows),
+        )
+
+
+def _load(db: Session, rows: List[dict]):
+    if db.get_bind().dialect.name == "postgresql":
+        _copy_rows(db, rows)
+    else:
+        insert_orders(db, rows)
+
+
+def import_orders_csv(
+    stream: IO[bytes],
+    shard_db: Session,
+    directory_db: Session,
+    location: str,
+    chunk_size: int = 5000,
+    actor_id=None,
+) -> ImportResult:
+    """
+    Stream-parse a CSV of orders and load it into `shard_db` one chunk at
+    a time (one transaction per chunk). Only one chunk is held in memory.
+    Customers are looked up by email in the directory database and must
+    belong to `location`. Invalid rows (including bytes that are not
+    UTF-8 and records the csv module rejects) are reported and skipped; a
+    chunk the database rejects is reported row by row and the import
+    goes on. Only a missing or unreadable header raises (ValueError).
+    """
+    result = ImportResult()
+    start = time.perf_counter()
+
+    # undecodable bytes become U+FFFD and fail their own row below, so a
+    # bad byte deep in the file cannot abort the import after earlier
+    # chunks have committed
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    reader = csv.DictReader(text)
+    try:
+        fieldnames = reader.fieldnames or []
+    except csv.Error as e:
+        raise ValueError(f"Unreadable CSV header: {e}")
+    missing = [c for c in REQUIRED_COLUMNS if c not in fieldnames]
+    if missing:
+        raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+
+    for chunk in _chunks(_numbered_rows(reader, result), chunk_size):
+        result.total_rows += len(chunk)
+
+        # one directory query per chunk for its customers
+        # (exact and lower-cased, so the email index still serves the lookup)
+        raw_emails = {(r.get("customer_email") or "").strip() for _, r in chunk}
+        emails = raw_emails | {e.lower() for e in raw_emails}
+        customers: Dict[str, Optional[User]] = {
+            user.email.lower(): user
+            for user in directory_db.query(User).filter(User.email.in_(emails))
+        }
+
+        rows, row_numbers = [], []
+        for row_number, raw in chunk:
+            if any(_REPLACEMENT_CHAR in value for value in raw.values() if isinstance(value, str)):
+                result.add_error(row_number, "not valid UTF-8")
+                continue
+            # an empty field would reach COPY as NULL and fail the whole chunk
+            if not (raw.get("pickup_address") or "").strip():
+                result.add_error(row_number, "pickup_address: must not be blank")
+                continue
+            try:
+                data = OrderCreate(
+                    pickup_address=raw.get("pickup_address"),
+                    laundry_type=(raw.get("laundry_type") or "").strip(),
+                    pickup_date=(raw.get("pickup_date") or "").strip(),
+                    special_instructions=raw.get("special_instructions") or None,
+                )
+            except ValidationError as e:
+                result.add_error(row_number, _format_validation_error(e))
+                continue
+
+            customer = customers.get((raw.get("customer_email") or "").strip().lower())
+            if customer is None or customer.role != UserRole.customer:
+                result.add_error(row_number, "customer_email: no customer with this email")
+                continue
+            if customer.location != location:
+                result.add_error(row_number, f"customer_email: customer belongs to location '{customer.location}'")
+                continue
+
+            laundry_type = LaundryType(data.laundry_type.value)
+            rates = pricing_store.resolve(laundry_type, extract_zip(data.pickup_address), data.pickup_date)
+            rows.append({
+                "customer_id": customer.id,
+                "location": location,
+                "pickup_address": data.pickup_address,
+                "laundry_type": laundry_type,
+                "pickup_date": data.pickup_date,
+                "special_instructions": data.special_instructions,
+                "price_per_lb_cents": rates.price_per_lb_cents,
+                "service_fee_cents": rates.service_fee_cents,
+                "delivery_fee_cents": rates.delivery_fee_cents,
+                "tax_rate_bp": rates.tax_rate_bp,
+            })
+            row_numbers.append(row_number)
+
+        if not rows:
+            continue
+
+        try:
+            by_id = {u.id: u for u in customers.values() if u is not None}
+            for customer_id in {r["customer_id"] for r in rows}:
+                mirror_user(shard_db, by_id[customer_id], directory_db)
+            address_ids = get_address_ids(shard_db, [r["pickup_address"] for r in rows])
+            for row in rows:
+                row["address_id"] = address_ids[row["pickup_address"]]
+            prepared = prepare_rows(shard_db, rows)
+            _load(shard_db, prepared)
+            after_bulk_insert(shard_db, prepared, actor_id)
+            shard_db.commit()
+            result.imported += len(prepared)
+        except Exception as e:
+            shard_db.rollback()
+            message = f"chunk rejected by the database: {str(e).splitlines()[0][:200]}"
+            for row_number in row_numbers:
+                result.add_error(row_number, message)
+
+    result.seconds = time.perf_counter() - start
+    return result
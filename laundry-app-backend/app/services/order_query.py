@@ -0,0 +1,191 @@
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.order import LaundryType, Order, OrderStatus
+
+# Public field name -> column. "order_id" keeps the name used by OrderPublic.
+FIELDS = {
+    "order_id": Order.id,
+    "customer_id": Order.customer_id,
+    "driver_id": Order.driver_id,
+    "pickup_address": Order.pickup_address,
+    "pickup_date": Order.pickup_date,
+    "status": Order.status,
+    "laundry_type": Order.laundry_type,
+    "special_instructions": Order.special_instructions,
+    "weight_lbs": Order.weight_lbs,
+    "subtotal_cents": Order.subtotal_cents,
+    "tax_cents": Order.tax_cents,
+    "total_cents": Order.total_cents,
+    "is_paid": Order.is_paid,
+    "updated_at": Order.updated_at,
+}
+DEFAULT_FIELDS = ("order_id", "customer_id", "driver_id", "pickup_address", "pickup_date", "status")
+
+# Sortable keys must be NOT NULL so keyset comparisons stay exact.
+# Each key maps to (column, cursor value parser).
+SORT_KEYS = {
+    "pickup_date": (Order.pickup_date, date.fromisoformat),
+    "status": (Order.status, OrderStatus),
+    "laundry_type": (Order.laundry_type, LaundryType),
+    "updated_at": (Order.updated_at, datetime.fromisoformat),
+}
+DEFAULT_SORT = ("-pickup_date",)
+
+# Filter name -> predicate over a bind parameter of the same name
+_FILTERS = {
+    "statuses": lambda: Order.status.in_(bindparam("statuses", expanding=True, type_=Order.status.type)),
+    "driver_id": lambda: Order.driver_id == bindparam("driver_id", type_=Order.driver_id.type),
+    "customer_id": lambda: Order.customer_id == bindparam("customer_id", type_=Order.customer_id.type),
+    "date_from": lambda: Order.pickup_date >= bindparam("date_from", type_=Order.pickup_date.type),
+    "date_to": lambda: Order.pickup_date <= bindparam("date_to", type_=Order.pickup_date.type),
+    "is_paid": lambda: Order.is_paid == bindparam("is_paid", type_=Order.is_paid.type),
+    "laundry_type": lambda: Order.laundry_type == bindparam("laundry_type", type_=Order.laundry_type.type),
+}
+
+
+@dataclass(frozen=True)
+class OrderQuery:
+    filters: Dict[str, object]
+    fields: Tuple[str, ...] = DEFAULT_FIELDS
+    sort: Tuple[str, ...] = DEFAULT_SORT
+    cursor: Optional[str] = None
+    limit: int = 50
+
+
+def parse_fields(raw: Optional[str]) -> Tuple[str, ...]:
+    if not raw:
+        return DEFAULT_FIELDS
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(FIELDS)}")
+    return fields
+
+
+def parse_sort(raw: Optional[str]) -> Tuple[str, ...]:
+    """
+    "-pickup_date,status" -> ("-pickup_date", "status"); "-" means descending.
+    """
+    if not raw:
+        return DEFAULT_SORT
+    keys = tuple(k.strip() for k in raw.split(",") if k.strip())
+    names = [k.lstrip("-") for k in keys]
+    unknown = [n for n in names if n not in SORT_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown sort keys: {', '.join(unknown)}. Allowed: {', '.join(SORT_KEYS)}")
+    if len(set(names)) != len(names):
+        raise ValueError("Sort keys must not repeat")
+    return keys
+
+
+# --------------------
+# Statement cache
+# --------------------
+def _sort_spec(sort: Tuple[str, ...]):
+    """
+    [(name, column, descending)] with order id appended as the tiebreaker,
+    following the direction of the first key.
+    """
+    spec = [(k.lstrip("-"), SORT_KEYS[k.lstrip("-")][0], k.startswith("-")) for k in sort]
+    spec.append(("id", Order.id, spec[0][2]))
+    return spec
+
+
+@lru_cache(maxsize=256)
+def _statement(filter_names: Tuple[str, ...], fields: Tuple[str, ...], sort: Tuple[str, ...], paged: bool):
+    """
+    Build the SELECT for one query shape. All values are bind parameters,
+    so each shape is built once and SQLAlchemy's compiled cache (and the
+    server) see one SQL text per shape.
+    """
+    spec = _sort_spec(sort)
+
+    columns = [FIELDS[f].label(f) for f in fields]
+    # sort columns are needed to build the next cursor even when not projected
+    columns += [col.label(f"_sort_{name}") for name, col, _ in spec]
+
+    stmt = select(*columns)
+    for name in filter_names:
+        stmt = stmt.where(_FILTERS[name]())
+
+    if paged:
+        # (k1, k2, ...) strictly after the cursor, honouring each key's direction
+        clauses = []
+        for i, (name, col, desc) in enumerate(spec):
+            param = bindparam(f"_after_{name}", type_=col.type)
+            step = col < param if desc else col > param
+            equal_prefix = [
+                c == bindparam(f"_after_{n}", type_=c.type) for n, c, _ in spec[:i]
+            ]
+            clauses.append(and_(*equal_prefix, step))
+        stmt = stmt.where(or_(*clauses))
+
+    order_by = [col.desc() if desc else col.asc() for _, col, desc in spec]
+    return stmt.order_by(*order_by).limit(bindparam("_limit"))
+
+
+def _encode_cursor(row, spec) -> str:
+    values = []
+    for name, _, _ in spec:
+        v = getattr(row, f"_sort_{name}")
+        if hasattr(v, "value"):
+            v = v.value
+        elif isinstance(v, (date, datetime, uuid.UUID)):
+            v = v.isoformat() if not isinstance(v, uuid.UUID) else str(v)
+        values.append(v)
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, spec) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if len(values) != len(spec):
+            raise ValueError
+        params = {}
+        for (name, _, _), raw in zip(spec, values):
+            parse = uuid.UUID if name == "id" else SORT_KEYS[name][1]
+            params[f"_after_{name}"] = parse(raw)
+        return params
+    except Exception:
+        raise ValueError("Invalid cursor for this sort order")
+
+
+def run_order_query(db: Session, query: OrderQuery) -> Tuple[List[dict], Optional[str]]:
+    """
+    Execute a query; returns (rows as {field: value}, next cursor or None).
+    """
+    filters = {k: v for k, v in query.filters.items() if v is not None and v != []}
+    filter_names = tuple(sorted(filters))
+    spec = _sort_spec(query.sort)
+
+    stmt = _statement(filter_names, query.fields, query.sort, bool(query.cursor))
+
+    params = dict(filters)
+    params["_limit"] = query.limit + 1
+    if query.cursor:
+        params.update(_decode_cursor(query.cursor, spec))
+
+    rows = db.execute(stmt, params).all()
+    has_more = len(rows) > query.limit
+    rows = rows[:query.limit]
+
+    data = []
+    for row in rows:
+        item = {}
+        for f in query.fields:
+            v = getattr(row, f)
+            item[f] = v.value if isinstance(v, (OrderStatus, LaundryType)) else v
+        data.append(item)
+
+    next_cursor = _encode_cursor(rows[-1], spec) if has_more else None
+    return data, next_cursor
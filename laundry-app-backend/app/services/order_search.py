@@ -0,0 +1,75 @@
+import base64
+import re
+import uuid
+from datetime import date
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Session
+
+from app.models.order import Order
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(q: str) -> list[str]:
+    """
+    Split a free-form query into word terms. Punctuation is dropped so the
+    same query behaves identically on FTS5 and trigram ILIKE.
+    """
+    return _TERM_RE.findall(q.lower())[:8]
+
+
+def text_match_clause(db: Session, terms: list[str]):
+    """
+    WHERE clause matching every term against pickup_address or
+    special_instructions, using the index available on the current dialect.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        # FTS5: implicit AND between quoted prefix terms
+        fts_query = " ".join(f'"{t}"*' for t in terms)
+        return text(
+            "orders.rowid IN (SELECT rowid FROM orders_fts WHERE orders_fts MATCH :fts_query)"
+        ).bindparams(fts_query=fts_query)
+
+    # Postgres: ILIKE '%term%' is served by the gin_trgm_ops indexes
+    clauses = []
+    for t in terms:
+        pattern = "%" + t.replace("_", "\\_") + "%"
+        clauses.append(
+            or_(
+                Order.pickup_address.ilike(pattern, escape="\\"),
+                Order.special_instructions.ilike(pattern, escape="\\"),
+            )
+        )
+    return and_(*clauses)
+
+
+# --------------------
+# Keyset pagination
+# --------------------
+# Order lists sort by (pickup_date desc, id desc); the cursor is the last row's key.
+
+def encode_cursor(pickup_date: date, order_id: uuid.UUID) -> str:
+    raw = f"{pickup_date.isoformat()}|{order_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        day, order_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return date.fromisoformat(day), uuid.UUID(order_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_after_clause(cursor: Optional[str]):
+    if not cursor:
+        return None
+    day, order_id = decode_cursor(cursor)
+    return or_(
+        Order.pickup_date < day,
+        and_(Order.pickup_date == day, Order.id < order_id),
+    )
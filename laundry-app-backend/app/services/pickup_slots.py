@@ -0,0 +1,116 @@
+from datetime import date, time, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, update, literal
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.dialect import dialect_insert
+from app.models.pickup_slot import PickupSlot
+
+availability_cache = TTLCache(ttl_seconds=settings.SLOT_AVAILABILITY_TTL_SECONDS)
+
+
+def _zone_matches(zip_code: Optional[str]):
+    # slot zone is a zip prefix; "" serves every address
+    return literal(zip_code or "").like(PickupSlot.zone + "%")
+
+
+def book_slot(db: Session, slot_id: int, pickup_date: date, zip_code: Optional[str]) -> bool:
+    """
+    Take one unit of slot capacity with a single conditional UPDATE. The
+    row lock serialises concurrent bookings, and the `booked < capacity`
+    guard is re-checked against the committed row, so a slot can never be
+    overbooked. Returns False when the slot is full or does not apply.
+    """
+    result = db.execute(
+        update(PickupSlot)
+        .where(
+            PickupSlot.id == slot_id,
+            PickupSlot.slot_date == pickup_date,
+            PickupSlot.booked < PickupSlot.capacity,
+            _zone_matches(zip_code),
+        )
+        .values(booked=PickupSlot.booked + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def available_slots(db: Session, start: date, days: int, zip_code: Optional[str]) -> Tuple[dict, ...]:
+    """
+    Slots with free capacity over the next `days` days, cached briefly per
+    (shard, start, days, zip) so availability polling doesn't hit the DB.
+    """
+    key = (db.get_bind(), start, days, zip_code or "")
+    cached = availability_cache.get(key)
+    if cached is not None:
+        return cached
+
+    slots = db.execute(
+        select(PickupSlot)
+        .where(
+            PickupSlot.slot_date >= start,
+            PickupSlot.slot_date < start + timedelta(days=days),
+            PickupSlot.booked < PickupSlot.capacity,
+            _zone_matches(zip_code),
+        )
+        .order_by(PickupSlot.slot_date, PickupSlot.window_start)
+    ).scalars().all()
+
+    result = tuple(
+        {
+            "slot_id": s.id,
+            "slot_date": s.slot_date,
+            "window_start": s.window_start,
+            "window_end": s.window_end,
+            "zone": s.zone,
+            "remaining": s.capacity - s.booked,
+        }
+        for s in slots
+    )
+    availability_cache.set(key, result)
+    return result
+
+
+def create_slots(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    windows: List[Tuple[time, time]],
+    zone: str,
+    capacity: int,
+) -> int:
+    """
+    Create a slot per day and window; existing (date, window, zone) slots
+    are left untouched. Returns the number created.
+    """
+    rows = []
+    day = date_from
+    while day <= date_to:
+        for start, end in windows:
+            rows.append({
+                "slot_date": day,
+                "window_start": start,
+                "window_end": end,
+                "zone": zone,
+                "capacity": capacity,
+                "booked": 0,
+            })
+        day += timedelta(days=1)
+
+    if not rows:
+        return 0
+
+    stmt = (
+        dialect_insert(db.get_bind(), PickupSlot.__table__)
+        .on_conflict_do_nothing(index_elements=["slot_date", "window_start", "zone"])
+        .returning(PickupSlot.id)
+    )
+    # RETURNING only yields rows actually inserted; executemany rowcount isn't reliable
+    created = len(db.execute(stmt, rows).all())
+    db.commit()
+    bind = db.get_bind()
+    availability_cache.invalidate_where(lambda key: key[0] is bind)
+    return created
@@ -0,0 +1,176 @@
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date
+from types import MappingProxyType
+from typing import Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.models.order import LaundryType
+from app.models.pricing_rule import PricingRule
+
+logger = logging.getLogger(__name__)
+
+_ZIP_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+
+
+def extract_zip(address: Optional[str]) -> Optional[str]:
+    """
+    Last 5-digit zip code in a free-form address, if any.
+    """
+    if not address:
+        return None
+    matches = _ZIP_RE.findall(address)
+    return matches[-1] if matches else None
+
+
+@dataclass(frozen=True)
+class Rates:
+    price_per_lb_cents: int
+    service_fee_cents: int
+    delivery_fee_cents: int
+    tax_rate_bp: int
+    tax_jurisdiction: Optional[str] = None
+    rule_id: Optional[int] = None
+
+
+# Used when no rule matches; same as the calc_price defaults
+DEFAULT_RATES = Rates(
+    price_per_lb_cents=175,
+    service_fee_cents=300,
+    delivery_fee_cents=500,
+    tax_rate_bp=700,
+)
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    zip_prefix: str
+    effective_from: date
+    effective_to: Optional[date]
+    rates: Rates
+
+    def matches(self, zip_code: str, on: date) -> bool:
+        return (
+            zip_code.startswith(self.zip_prefix)
+            and self.effective_from <= on
+            and (self.effective_to is None or on <= self.effective_to)
+        )
+
+
+class PricingTable:
+    """
+    Immutable lookup built from all pricing rules. For each laundry type the
+    candidate rules are pre-sorted most specific first (own type over
+    wildcard, longer zip prefix, later start date, then the newest rule
+    id so overlapping rules resolve the same way on every worker), so
+    resolving is a short scan with no DB access.
+    """
+
+    def __init__(self, rules, version: int, token: Tuple = ()):
+        self.version = version
+        self.token = token
+
+        def specificity(r):
+            return (r.laundry_type is not None, len(r.zip_prefix or ""), r.effective_from, r.id)
+
+        by_type = {}
+        for laundry_type in LaundryType:
+            candidates = [r for r in rules if r.laundry_type in (None, laundry_type)]
+            candidates.sort(key=specificity, reverse=True)
+            by_type[laundry_type] = tuple(
+                _CompiledRule(
+                    zip_prefix=r.zip_prefix or "",
+                    effective_from=r.effective_from,
+                    effective_to=r.effective_to,
+                    rates=Rates(
+                        price_per_lb_cents=r.price_per_lb_cents,
+                        service_fee_cents=r.service_fee_cents,
+                        delivery_fee_cents=r.delivery_fee_cents,
+                        tax_rate_bp=r.tax_rate_bp,
+                        tax_jurisdiction=r.tax_jurisdiction,
+                        rule_id=r.id,
+                    ),
+                )
+                for r in candidates
+            )
+        self._by_type = MappingProxyType(by_type)
+        self.rule_count = len(rules)
+
+    def resolve(self, laundry_type: LaundryType, zip_code: Optional[str], on: date) -> Rates:
+        zip_code = zip_code or ""
+        for rule in self._by_type.get(laundry_type, ()):
+            if rule.matches(zip_code, on):
+                return rule.rates
+        return DEFAULT_RATES
+
+
+class PricingRuleStore:
+    """
+    Holds the current PricingTable. Readers grab the reference without
+    locking; reload() compiles a new table and swaps it in only when the
+    rules changed, bumping the version.
+    """
+
+    def __init__(self):
+        self._table = PricingTable([], version=0)
+        self._reload_lock = threading.Lock()
+        self._poller: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def table(self) -> PricingTable:
+        return self._table
+
+    def resolve(self, laundry_type: LaundryType, zip_code: Optional[str], on: date) -> Rates:
+        return self._table.resolve(laundry_type, zip_code, on)
+
+    @staticmethod
+    def _token(db: Session) -> Tuple:
+        return tuple(db.execute(
+            select(func.count(PricingRule.id), func.max(PricingRule.id), func.max(PricingRule.updated_at))
+        ).one())
+
+    def reload(self, db: Session, force: bool = False) -> bool:
+        """
+        Recompile if the rules changed since the last load. Returns True
+        when a new table was swapped in.
+        """
+        with self._reload_lock:
+            token = self._token(db)
+            if not force and token == self._table.token:
+                return False
+            rules = db.execute(select(PricingRule)).scalars().all()
+            self._table = PricingTable(rules, version=self._table.version + 1, token=token)
+            logger.info("Pricing table v%d loaded (%d rules)", self._table.version, len(rules))
+            return True
+
+    def start_polling(self, session_factory, interval_seconds: float):
+        """
+        Pick up rule changes made through other workers.
+        """
+        if self._poller and self._poller.is_alive():
+            return
+
+        def run():
+            while not self._stop.wait(interval_seconds):
+                db = session_factory()
+                try:
+                    self.reload(db)
+                except Exception:
+                    logger.exception("Pricing table reload failed")
+                finally:
+                    db.close()
+
+        self._stop.clear()
+        self._poller = threading.Thread(target=run, name="pricing-reload", daemon=True)
+        self._poller.start()
+
+    def stop_polling(self):
+        self._stop.set()
+
+
+pricing_store = PricingRuleStore()
@@ -0,0 +1,222 @@
+from collections import defaultdict
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import event, inspect, select, delete, insert, func, case, literal, text, union_all
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from app.db.dialect import dialect_insert
+from app.models.order import Order
+from app.models.order_archive import ArchivedOrder
+from app.models.order_rollup import OrderDailyRollup, UNASSIGNED_DRIVER_ID
+
+KEY_FIELDS = ("day", "status", "laundry_type", "driver_id")
+MEASURES = (
+    "order_count",
+    "paid_count",
+    "weight_lbs",
+    "subtotal_cents",
+    "tax_cents",
+    "total_cents",
+    "paid_total_cents",
+)
+
+# Order attributes that feed a rollup row
+_TRACKED = (
+    "pickup_date",
+    "status",
+    "laundry_type",
+    "driver_id",
+    "is_paid",
+    "weight_lbs",
+    "subtotal_cents",
+    "tax_cents",
+    "total_cents",
+)
+
+
+def contribution(values: dict):
+    """
+    (key, measures) one order adds to its rollup bucket.
+    """
+    key = (
+        values["pickup_date"],
+        values["status"],
+        values["laundry_type"],
+        values["driver_id"] or UNASSIGNED_DRIVER_ID,
+    )
+    paid = bool(values["is_paid"])
+    total = values["total_cents"] or 0
+    measures = (
+        1,
+        1 if paid else 0,
+        values["weight_lbs"] or 0,
+        values["subtotal_cents"] or 0,
+        values["tax_cents"] or 0,
+        total,
+        total if paid else 0,
+    )
+    return key, measures
+
+
+def _old_and_new(order: Order):
+    """
+    Tracked attribute values before and after this flush. Attributes left
+    untouched are read from the order (loading them if expired); changed
+    ones come from history, whose old value is always loaded (see
+    _load_previous_value).
+    """
+    attrs = inspect(order).attrs
+    old, new = {}, {}
+    for name in _TRACKED:
+        hist = attrs[name].history
+        if hist.has_changes():
+            old[name] = hist.deleted[0] if hist.deleted else None
+            new[name] = hist.added[0] if hist.added else None
+        else:
+            old[name] = new[name] = getattr(order, name)
+    return old, new
+
+
+# Without active history, setting an attribute that was expired (e.g. by
+# a commit) or never loaded records no old value, and the flush hook
+# would subtract the order from the wrong bucket.
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+for _name in _TRACKED:
+    event.listen(getattr(Order, _name), "set", _load_previous_value, active_history=True)
+
+
+def apply_deltas(conn, deltas: dict):
+    """
+    Upsert-add `deltas` ({key: measures}) into order_daily_rollups in one
+    executemany. Runs on the caller's connection, i.e. inside its transaction.
+    """
+    rows = []
+    for key, measures in deltas.items():
+        if not any(measures):
+            continue
+        row = dict(zip(KEY_FIELDS, key))
+        row.update(zip(MEASURES, measures))
+        rows.append(row)
+
+    if not rows:
+        return
+
+    table = OrderDailyRollup.__table__
+    stmt = dialect_insert(conn, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(KEY_FIELDS),
+        set_={m: table.c[m] + stmt.excluded[m] for m in MEASURES},
+    )
+    conn.execute(stmt, rows)
+
+
+def _add(deltas, key, measures, sign):
+    current = deltas[key]
+    deltas[key] = tuple(c + sign * m for c, m in zip(current, measures))
+
+
+@event.listens_for(Session, "after_flush")
+def _rollup_order_changes(session, flush_context):
+    deltas = defaultdict(lambda: (0,) * len(MEASURES))
+
+    for obj in session.new:
+        if isinstance(obj, Order):
+            _, new = _old_and_new(obj)
+            _add(deltas, *contribution(new), 1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Order) and session.is_modified(obj, include_collections=False):
+            old, new = _old_and_new(obj)
+            if old == new:
+                continue
+            _add(deltas, *contribution(old), -1)
+            _add(deltas, *contribution(new), 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Order):
+            old, _ = _old_and_new(obj)
+            _add(deltas, *contribution(old), -1)
+
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+# --------------------
+# Backfill
+# --------------------
+def _lock_rollups(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        # EXCLUSIVE: conflicts with writers' ROW EXCLUSIVE, not with plain reads
+        db.execute(text("LOCK TABLE order_daily_rollups IN EXCLUSIVE MODE"))
+    # SQLite: the DELETE below takes the database write lock before the
+    # aggregate reads, which is the same guarantee
+
+
+def rebuild_rollups(db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None) -> int:
+    """
+    Recompute rollups from live + archived orders for the given pickup_date
+    range (all history when omitted). Returns the number of buckets written.
+
+    Order writes upsert deltas into the same rows while this runs, so the
+    rebuild holds the rollup table's write lock from before its delete
+    until commit. A writer that already added its delta is waited for and
+    its order change is then visible to the aggregate; a writer that comes
+    later waits and adds its delta on top of the rebuilt rows. Order writes
+    stall for the duration, so rebuild long histories in date ranges.
+    """
+    _lock_rollups(db)
+    nil_driver = literal(UNASSIGNED_DRIVER_ID, UUID(as_uuid=True))
+
+    sources = []
+    for model in (Order, ArchivedOrder):
+        stmt = select(
+            model.pickup_date.label("day"),
+            model.status.label("status"),
+            model.laundry_type.label("laundry_type"),
+            func.coalesce(model.driver_id, nil_driver).label("driver_id"),
+            model.is_paid.label("is_paid"),
+            model.weight_lbs.label("weight_lbs"),
+            model.subtotal_cents.label("subtotal_cents"),
+            model.tax_cents.label("tax_cents"),
+            model.total_cents.label("total_cents"),
+        )
+        if date_from:
+            stmt = stmt.where(model.pickup_date >= date_from)
+        if date_to:
+            stmt = stmt.where(model.pickup_date <= date_to)
+        sources.append(stmt)
+
+    src = union_all(*sources).subquery("rollup_source")
+    paid = src.c.is_paid.is_(True)
+
+    aggregate = select(
+        src.c.day,
+        src.c.status,
+        src.c.laundry_type,
+        src.c.driver_id,
+        func.count().label("order_count"),
+        func.sum(case((paid, 1), else_=0)).label("paid_count"),
+        func.coalesce(func.sum(src.c.weight_lbs), 0).label("weight_lbs"),
+        func.coalesce(func.sum(src.c.subtotal_cents), 0).label("subtotal_cents"),
+        func.coalesce(func.sum(src.c.tax_cents), 0).label("tax_cents"),
+        func.coalesce(func.sum(src.c.total_cents), 0).label("total_cents"),
+        func.sum(case((paid, func.coalesce(src.c.total_cents, 0)), else_=0)).label("paid_total_cents"),
+    ).group_by(src.c.day, src.c.status, src.c.laundry_type, src.c.driver_id)
+
+    clear = delete(OrderDailyRollup)
+    if date_from:
+        clear = clear.where(OrderDailyRollup.day >= date_from)
+    if date_to:
+        clear = clear.where(OrderDailyRollup.day <= date_to)
+
+    db.execute(clear)
+    result = db.execute(
+        insert(OrderDailyRollup).from_select(list(KEY_FIELDS) + list(MEASURES), aggregate)
+    )
+    db.commit()
+    return result.rowcount
@@ -1,12 +1,24 @@
 import stripe
 import os
+from app.core.config import settings
+from app.core.resilience import stripe_dependency
 
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
+# the library default is 80s, far longer than any request should wait
+stripe.default_http_client = stripe.RequestsClient(timeout=settings.STRIPE_TIMEOUT_SECONDS)
+# one attempt per call: the library's own retries would stretch a stalled
+# call to several timeouts; the breaker deals with outages
+stripe.max_network_retries = 0
 
-def create_payment_intent(amount_cents: int, order_id: str):
-    return stripe.PaymentIntent.create(
+def create_payment_intent(amount_cents: int, order_id: str, location: str):
+    """
+    Raises DependencyUnavailable when Stripe is down, slow or saturated.
+    """
+    # location tells the webhook which shard holds the order
+    return stripe_dependency.call(
+        stripe.PaymentIntent.create,
         amount=amount_cents,
         currency="usd",
-        metadata={"order_id": order_id},
+        metadata={"order_id": order_id, "location": location},
         automatic_payment_methods={"enabled": True},
     )
@@ -0,0 +1,150 @@
+from datetime import date, timedelta
+from typing import Iterator, List, Set, Tuple
+
+from sqlalchemy import select, or_
+from sqlalchemy.orm import Session
+
+from app.models.order import Order
+from app.models.subscription import Subscription, CADENCE_DAYS
+from app.services.addresses import get_address_ids
+from app.services.order_bulk import after_bulk_insert, insert_orders, prepare_rows
+from app.services.pricing_rules import extract_zip, pricing_store
+
+_SUBSCRIPTION_COLUMNS = (
+    Subscription.id,
+    Subscription.customer_id,
+    Subscription.location,
+    Subscription.cadence,
+    Subscription.anchor_date,
+    Subscription.end_date,
+    Subscription.pickup_address,
+    Subscription.laundry_type,
+    Subscription.special_instructions,
+)
+
+
+def occurrences(anchor_date: date, cadence, end_date, window_start: date, window_end: date) -> Iterator[date]:
+    """
+    Pickup dates of one subscription inside [window_start, window_end].
+    """
+    step = CADENCE_DAYS[cadence]
+    first = max(anchor_date, window_start)
+    offset = (first - anchor_date).days % step
+    if offset:
+        first += timedelta(days=step - offset)
+
+    last = min(window_end, end_date) if end_date else window_end
+    day = first
+    while day <= last:
+        yield day
+        day += timedelta(days=step)
+
+
+def _active_batches(db: Session, window_start: date, window_end: date, batch_size: int):
+    """
+    Keyset-paginated batches of subscriptions that can have a pickup in the window.
+    """
+    after_id = None
+    while True:
+        stmt = (
+            select(*_SUBSCRIPTION_COLUMNS)
+            .where(
+                Subscription.is_active.is_(True),
+                Subscription.anchor_date <= window_end,
+                or_(Subscription.end_date.is_(None), Subscription.end_date >= window_start),
+            )
+            .order_by(Subscription.id)
+            .limit(batch_size)
+        )
+        if after_id is not None:
+            stmt = stmt.where(Subscription.id > after_id)
+
+        batch = db.execute(stmt).all()
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        after_id = batch[-1].id
+
+
+def _existing_pickups(db: Session, subscriptions, window_start: date, window_end: date) -> Set[Tuple]:
+    """
+    (subscription_id, pickup_date) pairs in the window that already have an order.
+    """
+    return set(db.execute(
+        select(Order.subscription_id, Order.pickup_date).where(
+            Order.subscription_id.in_([sub.id for sub in subscriptions]),
+            Order.pickup_date.between(window_start, window_end),
+        )
+    ).all())
+
+
+def _order_rows(db: Session, subscriptions, window_start: date, window_end: date) -> Tuple[List[dict], int]:
+    """
+    Rows for the pickups in the window that have no order yet, and how
+    many already had one.
+    """
+    existing = _existing_pickups(db, subscriptions, window_start, window_end)
+    due = [
+        (sub, day)
+        for sub in subscriptions
+        for day in occurrences(sub.anchor_date, sub.cadence, sub.end_date, window_start, window_end)
+    ]
+    missing = [(sub, day) for sub, day in due if (sub.id, day) not in existing]
+    if not missing:
+        return [], len(due)
+
+    address_ids = get_address_ids(db, {sub.pickup_address for sub, _ in missing})
+    rows = []
+    for sub, day in missing:
+        zip_code = extract_zip(sub.pickup_address)
+        rates = pricing_store.resolve(sub.laundry_type, zip_code, day)
+        rows.append({
+            "customer_id": sub.customer_id,
+            "location": sub.location,
+            "subscription_id": sub.id,
+            "pickup_address": sub.pickup_address,
+            "address_id": address_ids[sub.pickup_address],
+            "laundry_type": sub.laundry_type,
+            "pickup_date": day,
+            "special_instructions": sub.special_instructions,
+            "price_per_lb_cents": rates.price_per_lb_cents,
+            "service_fee_cents": rates.service_fee_cents,
+            "delivery_fee_cents": rates.delivery_fee_cents,
+            "tax_rate_bp": rates.tax_rate_bp,
+        })
+    return rows, len(due) - len(missing)
+
+
+def generate_subscription_orders(
+    db: Session,
+    window_start: date,
+    window_end: date,
+    batch_size: int = 1000,
+) -> Tuple[int, int]:
+    """
+    Create the orders due in [window_start, window_end] for every active
+    subscription, one bulk insert and one commit per batch of
+    subscriptions. Dates that already have an order are filtered out
+    before the insert, so a rerun only reads: no writes and no change
+    stamp. The (subscription_id, pickup_date) unique key still catches
+    a concurrent run inserting the same dates.
+    Returns (orders created, orders already present).
+    """
+    created = skipped = 0
+    for subscriptions in _active_batches(db, window_start, window_end, batch_size):
+        rows, present = _order_rows(db, subscriptions, window_start, window_end)
+        skipped += present
+        if not rows:
+            db.commit()  # ends the read transaction; nothing was written
+            continue
+
+        rows = prepare_rows(db, rows)
+        inserted = insert_orders(db, rows, conflict_columns=("subscription_id", "pickup_date"))
+        after_bulk_insert(db, inserted)
+        db.commit()
+
+        created += len(inserted)
+        skipped += len(rows) - len(inserted)
+    return created, skipped
@@ -0,0 +1,83 @@
+import threading
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.db.dialect import dialect_insert
+from app.db.session import shard_router
+from app.models.user import User
+
+# (database, user id, identity fields) already copied by this process; a
+# user whose fields changed no longer matches, so the next call refreshes
+_mirrored = set()
+_lock = threading.Lock()
+
+
+def _identity(user: User) -> dict:
+    return {
+        "email": user.email,
+        "role": user.role,
+        "is_active": user.is_active,
+        "is_verified": user.is_verified,
+        "location": user.location,
+    }
+
+
+def mirror_user(shard_db: Session, user: User, directory_db: Session):
+    """
+    Make sure `user` exists, with current identity fields, in a shard's
+    users table so orders there keep their foreign keys and joins (e.g.
+    reminder emails) see the right values. The password hash never leaves
+    the directory database. No-op when the shard *is* the directory
+    database.
+    """
+    bind = shard_db.get_bind()
+    if bind is directory_db.get_bind():
+        return
+
+    identity = _identity(user)
+    key = (bind.url, user.id, tuple(identity.values()))
+    with _lock:
+        if key in _mirrored:
+            return
+
+    stmt = dialect_insert(bind, User.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={name: stmt.excluded[name] for name in identity},
+    )
+    shard_db.execute(stmt, {
+        "id": user.id,
+        "hashed_password": "!",  # not a valid hash: shard copies can't log in
+        **identity,
+    })
+
+    # remembered only once the copy is committed
+    shard_db.info.setdefault("mirrored_users", set()).add(key)
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_mirrored(session):
+    keys = session.info.pop("mirrored_users", None)
+    if keys:
+        with _lock:
+            _mirrored.update(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_mirrored(session):
+    session.info.pop("mirrored_users", None)
+
+
+def refresh_mirrors(user: User, directory_db: Session):
+    """
+    Push `user`'s identity fields to every shard that holds a copy, right
+    after the directory row changed (shards without a copy are left
+    alone). Call after the directory commit.
+    """
+    directory = directory_db.get_bind()
+    for engine in shard_router.engines():
+        if engine is directory:
+            continue
+        with engine.begin() as conn:
+            conn.execute(update(User.__table__).where(User.__table__.c.id == user.id).values(**_identity(user)))
@@ -0,0 +1,122 @@
+"""
+Before/after benchmark for the hot/cold split (services/order_archive.py):
+times /orders/my and the admin order routes with years of delivered
+orders in the live table, then again after archiving them.
+
+    python -m benchmarks.archive_split [--customers 200] [--history 250] [--repeat 50]
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+from benchmarks.harness import configure, make_user, print_table, timed
+
+configure()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.models.order import LaundryType, OrderStatus  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+from app.services.order_archive import archive_delivered_orders  # noqa: E402
+from app.services.order_bulk import insert_orders, prepare_rows  # noqa: E402
+
+STREETS = ["Main St", "Elm Street", "Oak Ave", "Pine Rd", "Maple Dr", "Cedar Ln"]
+
+
+def seed(db, customers: int, history: int, live: int):
+    """
+    `history` delivered, paid orders (30 days to 3 years old) and `live`
+    in-flight orders per customer. Returns headers for one customer, one
+    driver with live stops, and an admin.
+    """
+    rng = random.Random(42)
+    today = date.today()
+    driver, driver_headers = make_user(db, UserRole.driver, "driver@bench.example")
+    _, admin_headers = make_user(db, UserRole.admin, "admin@bench.example")
+
+    customer_headers = None
+    for c in range(customers):
+        customer, headers = make_user(db, UserRole.customer, f"customer{c}@bench.example")
+        customer_headers = customer_headers or headers
+        rows = []
+        for i in range(history + live):
+            old = i < history
+            rows.append({
+                "customer_id": customer.id,
+                "driver_id": driver.id if not old and i % 2 else None,
+                "pickup_address": f"{rng.randint(1, 999)} {rng.choice(STREETS)} 10001",
+                "laundry_type": LaundryType.regular,
+                "pickup_date": today - timedelta(days=rng.randint(31, 3 * 365)) if old else today + timedelta(days=i % 3),
+                "status": OrderStatus.delivered if old else OrderStatus.scheduled,
+                "is_paid": old,
+                "location": "main",
+            })
+        insert_orders(db, prepare_rows(db, rows))
+        db.commit()
+    return customer_headers, driver_headers, admin_headers
+
+
+def measure(client, headers, repeat):
+    customer, driver, admin = headers
+    routes = [
+        ("GET /orders/my", customer, "/api/v1/orders/my", {}),
+        ("GET /orders/my?status=scheduled", customer, "/api/v1/orders/my", {"status": "scheduled"}),
+        ("GET /orders/driver/assigned", driver, "/api/v1/orders/driver/assigned", {}),
+        ("GET /orders/admin/query?status=scheduled", admin, "/api/v1/orders/admin/query", {"status": "scheduled"}),
+        ("GET /orders/admin/search?q=elm", admin, "/api/v1/orders/admin/search", {"q": "elm"}),
+        ("GET /orders/admin/summary", admin, "/api/v1/orders/admin/summary", {}),
+    ]
+    results = {}
+    for name, auth, path, params in routes:
+        def call():
+            r = client.get(path, headers=auth, params=params)
+            assert r.status_code == 200, r.text
+        results[name] = timed(call, repeat)
+    return results
+
+
+def analyze(db):
+    # fresh planner statistics for both runs
+    db.execute(text("ANALYZE"))
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark order routes before/after archiving")
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--history", type=int, default=250, help="delivered orders per customer")
+    parser.add_argument("--live", type=int, default=4, help="in-flight orders per customer")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        db = SessionLocal()
+        try:
+            headers = seed(db, args.customers, args.history, args.live)
+            analyze(db)
+            before = measure(client, headers, args.repeat)
+
+            moved = archive_delivered_orders(db, older_than_days=30, batch_size=5000)
+            analyze(db)
+            after = measure(client, headers, args.repeat)
+        finally:
+            db.close()
+
+    print(f"{args.customers * (args.history + args.live)} orders, {moved} archived; "
+          f"median / p95 ms over {args.repeat} requests\n")
+    print_table(
+        ["route", "before med", "before p95", "after med", "after p95", "speedup"],
+        [
+            (name, before[name]["median_ms"], before[name]["p95_ms"],
+             after[name]["median_ms"], after[name]["p95_ms"],
+             f"{before[name]['median_ms'] / after[name]['median_ms']:.1f}x")
+            for name in before
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
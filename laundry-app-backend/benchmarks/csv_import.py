@@ -0,0 +1,91 @@
+"""
+Rows/sec of the CSV order import (services/order_import.py) at several
+chunk sizes. Each run loads the same generated file into an empty
+orders table. On SQLite the chunks go through one executemany; point
+BENCH_DATABASE_URL at a scratch Postgres database to time the COPY path.
+
+    python -m benchmarks.csv_import [--rows 50000] [--customers 500] [--chunk-sizes 1000,5000,20000]
+"""
+import argparse
+import io
+import random
+from datetime import date, timedelta
+
+from benchmarks.harness import configure, make_user, print_table
+
+configure()
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+from app.services.addresses import address_cache  # noqa: E402
+from app.services.order_import import import_orders_csv  # noqa: E402
+
+STREETS = ["Main St", "Elm Street", "Oak Ave", "Pine Rd", "Maple Dr", "Cedar Ln"]
+
+# everything the import writes; users, pricing and counters stay
+_KEEP_TABLES = {"users", "pricing_rules", "change_counters"}
+
+
+def make_csv(emails, rows: int) -> bytes:
+    rng = random.Random(42)
+    today = date.today()
+    out = io.StringIO()
+    out.write("customer_email,pickup_address,laundry_type,pickup_date,special_instructions\n")
+    for i in range(rows):
+        out.write(
+            f"{rng.choice(emails)},{rng.randint(1, 999)} {rng.choice(STREETS)} 1000{rng.randint(1, 9)},"
+            f"{rng.choice(('regular', 'dry_clean'))},{today + timedelta(days=rng.randint(1, 30))},"
+            f"{'ring twice' if i % 7 == 0 else ''}\n"
+        )
+    return out.getvalue().encode()
+
+
+def reset():
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name not in _KEEP_TABLES:
+                conn.execute(table.delete())
+    address_cache.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV order import throughput")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--chunk-sizes", default="1000,5000,20000")
+    args = parser.parse_args()
+    chunk_sizes = [int(size) for size in args.chunk_sizes.split(",")]
+
+    with TestClient(app):
+        db = SessionLocal()
+        try:
+            emails = [f"customer{c}@bench.example" for c in range(args.customers)]
+            for email in emails:
+                make_user(db, UserRole.customer, email)
+        finally:
+            db.close()
+        body = make_csv(emails, args.rows)
+
+        results = []
+        for chunk_size in chunk_sizes:
+            reset()
+            shard_db, directory_db = SessionLocal(), SessionLocal()
+            try:
+                result = import_orders_csv(io.BytesIO(body), shard_db, directory_db, "main", chunk_size)
+            finally:
+                shard_db.close()
+                directory_db.close()
+            assert result.imported == args.rows, result.as_dict()
+            results.append((chunk_size, result.imported, result.seconds, result.rows_per_second))
+
+    print(f"{args.rows} rows, {args.customers} customers, {len(body) / 1e6:.1f} MB, "
+          f"{engine.dialect.name} ({'COPY' if engine.dialect.name == 'postgresql' else 'executemany'})\n")
+    print_table(["chunk size", "imported", "seconds", "rows/sec"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Shared setup for the benchmarks in this directory. They run the app
+in-process (FastAPI TestClient) against throwaway SQLite databases, or
+against BENCH_DATABASE_URL when it is set (use a scratch database: the
+benchmarks seed and delete data). Call configure() before anything from
+`app` is imported, since settings are read at import time.
+
+    python -m benchmarks.archive_split
+"""
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List, Sequence
+
+
+def configure(**overrides: str) -> str:
+    """
+    Set the environment for a benchmark run; returns the temp directory
+    holding the SQLite databases.
+    """
+    db_dir = tempfile.mkdtemp(prefix="laundroapp-bench-")
+    env = {
+        "DATABASE_URL": os.environ.get("BENCH_DATABASE_URL", f"sqlite:///{db_dir}/main.db"),
+        "SHARD_DATABASE_URLS": "{}",
+        "RATE_LIMIT_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+    env.update(overrides)
+    os.environ.update(env)
+    for name, value in {
+        "JWT_SECRET_KEY": "bench-secret",
+        "JWT_ALGORITHM": "HS256",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+        "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+        "FRONTEND_BASE_URL": "http://localhost",
+    }.items():
+        os.environ.setdefault(name, value)
+    return db_dir
+
+
+def make_user(db, role, email: str, location: str = "main"):
+    """
+    Insert a verified user; returns (user, auth headers).
+    """
+    from app.core.token import create_access_token
+    from app.models.user import User
+
+    user = User(email=email, hashed_password="x", role=role, is_verified=True, location=location)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    token = create_access_token(user_id=user.id, role=user.role.value)
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+def timed(fn: Callable[[], object], repeat: int, warmup: int = 3) -> Dict[str, float]:
+    """
+    Wall time of `fn` in milliseconds: median and p95 over `repeat` calls.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[int(0.95 * (len(samples) - 1))],
+    }
+
+
+def print_table(headers: Sequence[str], rows: List[Sequence[object]]) -> None:
+    cells = [[str(h) for h in headers]] + [
+        [f"{v:.2f}" if isinstance(v, float) else str(v) for v in row] for row in rows
+    ]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for n, row in enumerate(cells):
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+        if n == 0:
+            print("  ".join("-" * width for width in widths))
@@ -0,0 +1,64 @@
+"""
+Microbenchmark for bearer-token verification (core/token.py,
+core/jwt_backend.py): a full decode with each JWT backend, a cached
+decode_token() hit, and get_current_user() with cached claims.
+The PyJWT row needs the optional package (requirements-pyjwt.txt).
+
+    python -m benchmarks.jwt_decode [--number 20000] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from benchmarks.harness import configure, make_user, print_table
+
+configure()
+
+from app.api.deps import get_current_user  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.jwt_backend import JoseBackend, build_backend  # noqa: E402
+from app.core.token import decode_token  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+
+
+def per_call_us(fn, number: int, repeat: int) -> float:
+    # best of `repeat`: the run least disturbed by the rest of the machine
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JWT verification")
+    parser.add_argument("--number", type=int, default=20000, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        _, headers = make_user(db, UserRole.customer, "customer@bench.example")
+        token = headers["Authorization"][len("Bearer "):]
+
+        cases = [("python-jose decode", JoseBackend(settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM).decode)]
+        try:
+            pyjwt = build_backend("pyjwt", settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM)
+            cases.append(("PyJWT decode", pyjwt.decode))
+        except RuntimeError:
+            print("pyjwt not installed; skipping its row\n")
+        decode_token(token)  # warm the claims cache
+        cases.append(("decode_token, cached", decode_token))
+
+        rows = [(name, per_call_us(lambda: fn(token), args.number, args.repeat)) for name, fn in cases]
+        rows.append((
+            "get_current_user, cached claims",
+            per_call_us(lambda: get_current_user(db=db, token=token), args.number // 20, args.repeat),
+        ))
+    finally:
+        db.close()
+
+    print(f"HS256 access token, best of {args.repeat} runs\n")
+    print_table(["path", "us per call"], rows)
+
+
+if __name__ == "__main__":
+    main()
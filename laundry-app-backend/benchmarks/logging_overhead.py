@@ -0,0 +1,162 @@
+"""
+Per-request cost of the logging pipeline (core/structured_logging.py):
+times GET /orders/my under each logging setup and reports the overhead
+over a run with logging switched off.
+
+    python -m benchmarks.logging_overhead [--orders 20] [--repeat 200] [--rounds 5] [--sink-delay-us 0]
+
+The setups take turns, one batch of --repeat requests each per round, and
+each reports its best round, so drift over the run hits them all alike.
+Log output goes to /dev/null. --sink-delay-us adds a sleep to every
+write, standing in for a stdout pipe that blocks (a slow log shipper).
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+from benchmarks.harness import configure, make_user, print_table, timed
+
+configure(LOG_LEVEL="INFO")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core.structured_logging import JsonFormatter, RequestIdFilter, configure_logging, stop_logging  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.order import LaundryType  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+from app.services.order_bulk import insert_orders, prepare_rows  # noqa: E402
+
+
+class Sink:
+    """
+    Write-only stream to /dev/null, optionally slowed down per write.
+    """
+
+    def __init__(self, delay_us: int):
+        self._devnull = open(os.devnull, "w")
+        self.delay = delay_us / 1_000_000
+
+    def write(self, data):
+        if self.delay:
+            time.sleep(self.delay)
+        return self._devnull.write(data)
+
+    def flush(self):
+        self._devnull.flush()
+
+
+# --------------------
+# Logging setups
+# --------------------
+def _reset():
+    stop_logging()
+    engine.echo = False
+    root = logging.getLogger()
+    root.handlers = []
+    root.setLevel(logging.WARNING)
+
+
+def _off(sink):
+    pass
+
+
+def _echo(sink):
+    # before the change: SQL echo written synchronously by request threads
+    engine.echo = True
+
+
+def _sync_json(sink):
+    handler = logging.StreamHandler(sink)
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(RequestIdFilter())
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(logging.INFO)
+
+
+def _queued(rates):
+    def setup(sink):
+        configure_logging("INFO", True, rates)
+    return setup
+
+
+SETUPS = [
+    ("off (baseline)", _off),
+    ("SQL echo, synchronous", _echo),
+    ("JSON, synchronous", _sync_json),
+    ("JSON, queued", _queued({})),
+    ("JSON, queued, 10% access", _queued({"app.access": 0.1})),
+]
+
+
+def seed(db, orders: int):
+    customer, headers = make_user(db, UserRole.customer, "customer@bench.example")
+    tomorrow = date.today() + timedelta(days=1)
+    insert_orders(db, prepare_rows(db, [
+        {
+            "customer_id": customer.id,
+            "pickup_address": f"{i} Main St 10001",
+            "laundry_type": LaundryType.regular,
+            "pickup_date": tomorrow,
+            "location": "main",
+        }
+        for i in range(orders)
+    ]))
+    db.commit()
+    return headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request logging overhead")
+    parser.add_argument("--orders", type=int, default=20, help="orders returned by /orders/my")
+    parser.add_argument("--repeat", type=int, default=200, help="requests per setup per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--sink-delay-us", type=int, default=0, help="sleep per log write")
+    args = parser.parse_args()
+
+    sink = Sink(args.sink_delay_us)
+    stdout = sys.stdout
+    results = {}
+    with TestClient(app) as client:
+        db = SessionLocal()
+        try:
+            headers = seed(db, args.orders)
+        finally:
+            db.close()
+
+        def call():
+            r = client.get("/api/v1/orders/my", headers=headers)
+            assert r.status_code == 200, r.text
+
+        try:
+            # configure_logging() and SQL echo both bind to sys.stdout
+            sys.stdout = sink
+            for _ in range(args.rounds):
+                for name, setup in SETUPS:
+                    _reset()
+                    setup(sink)
+                    run = timed(call, args.repeat, warmup=20)
+                    if name not in results or run["median_ms"] < results[name]["median_ms"]:
+                        results[name] = run
+        finally:
+            _reset()
+            sys.stdout = stdout
+
+    base = results[SETUPS[0][0]]["median_ms"]
+    print(f"GET /orders/my ({args.orders} orders), best of {args.rounds} rounds of {args.repeat} requests, "
+          f"{args.sink_delay_us}us per log write\n")
+    print_table(
+        ["logging", "median ms", "p95 ms", "overhead us/request"],
+        [
+            (name, r["median_ms"], r["p95_ms"], f"{(r['median_ms'] - base) * 1000:+.0f}")
+            for name, r in results.items()
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Test harness: the app runs against throwaway SQLite databases, a main
+(directory) database plus one extra location shard ("north"), so
+sharded paths are exercised too. Settings are read at import time, so
+the environment is set before anything from `app` is imported.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="laundroapp-tests-")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_DB_DIR}/main.db",
+    "SHARD_DATABASE_URLS": json.dumps({"north": f"sqlite:///{_DB_DIR}/north.db"}),
+    "RATE_LIMIT_ENABLED": "false",
+    "LOG_LEVEL": "WARNING",
+    "PROFILE_DIR": f"{_DB_DIR}/profiles",
+    # short enough for tests/test_resilience.py to wait them out against a stalled server
+    "STRIPE_TIMEOUT_SECONDS": "0.5",
+    "SENDGRID_TIMEOUT_SECONDS": "0.5",
+})
+for _name, _value in {
+    "JWT_SECRET_KEY": "test-secret",
+    "JWT_ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "15",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "FRONTEND_BASE_URL": "http://localhost",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.token import create_access_token
+from app.db import query_stats
+from app.db.base import Base
+from app.db.session import SessionLocal, shard_router
+from app.models.user import User, UserRole
+from app.services.addresses import address_cache
+from app.services.driver_manifest import manifest_cache
+from app.services.pickup_slots import availability_cache
+from app.services.pricing_rules import pricing_store
+
+# rows that must survive between tests
+_KEEP_TABLES = {"change_counters"}
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(autouse=True)
+def _clean_databases(request):
+    yield
+    if "client" not in request.fixturenames:
+        return
+    for engine in shard_router.engines():
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                if table.name not in _KEEP_TABLES:
+                    conn.execute(table.delete())
+    for cache in (address_cache, manifest_cache, availability_cache):
+        cache.clear()
+    session = SessionLocal()
+    try:
+        pricing_store.reload(session, force=True)
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """
+    make_user(UserRole.driver, location="north") -> (user, auth headers)
+    """
+    counter = iter(range(1_000_000))
+
+    def make(role: UserRole = UserRole.customer, location: str = "main", email: str = None):
+        user = User(
+            email=email or f"{role.value}{next(counter)}@example.com",
+            hashed_password="x",
+            role=role,
+            is_verified=True,
+            location=location,
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        token = create_access_token(user_id=user.id, role=user.role.value)
+        return user, {"Authorization": f"Bearer {token}"}
+
+    return make
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fail the block if it runs more statements than allowed, repeats an
+    identical statement or loops one statement shape (N+1):
+
+        def test_my_orders(client, query_budget):
+            with query_budget(4):
+                client.get("/api/v1/orders/my", headers=auth)
+    """
+    return query_stats.query_budget
@@ -0,0 +1,82 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.models.address import Address
+from app.models.order import Order
+from app.models.user import UserRole
+from app.services.addresses import geocode_pending, link_orders, normalize_address
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+@pytest.mark.parametrize("raw, normalized", [
+    ("123 Main Street", "123 MAIN ST"),
+    ("123 main st.", "123 MAIN ST"),
+    ("  123   Main\tSt ,  ", "123 MAIN ST"),
+    ("45 North Oak Avenue Apt #4", "45 N OAK AVE APT 4"),
+    ("45 N. Oak Ave. # 4", "45 N OAK AVE APT 4"),
+    ("9 Elm Blvd, Suite 200, 10001-1234", "9 ELM BLVD STE 200 10001"),
+    ("7 Café Terrace", "7 CAFE TER"),
+    ("12-14 Pine Rd 1/2", "12-14 PINE RD 1/2"),
+    ("", ""),
+    (None, ""),
+    ("!!! ...", ""),
+    ("東京", ""),
+])
+def test_normalize_address(raw, normalized):
+    assert normalize_address(raw) == normalized
+
+
+def create_order(client, headers, address):
+    r = client.post("/api/v1/orders/create", headers=headers, json={
+        "pickup_address": address,
+        "laundry_type": "regular",
+        "pickup_date": str(TOMORROW),
+    })
+    assert r.status_code == 200, r.text
+    return r.json()["order_id"]
+
+
+def test_backfill_links_unnormalizable_addresses_once(client, db, make_user):
+    _, customer = make_user(UserRole.customer)
+    create_order(client, customer, "1 Main St 10001")
+    create_order(client, customer, "???")
+    db.execute(update(Order).values(address_id=None))
+    db.commit()
+
+    assert link_orders(db, batch_size=1) == 2
+    assert db.query(Order).filter(Order.address_id.is_(None)).count() == 0
+    assert link_orders(db) == 0  # nothing left to rescan
+
+    # the stand-in row for "" is never handed to the geocoder
+    assert geocode_pending(db) == (1, 0)
+    assert geocode_pending(db) == (0, 0)
+
+
+def test_addresses_not_found_are_retried_later(client, db, make_user):
+    _, customer = make_user(UserRole.customer)
+    create_order(client, customer, "1 Main St")  # no zip: the offline geocoder can't place it
+    assert geocode_pending(db) == (0, 1)
+    assert geocode_pending(db) == (0, 0)
+
+    db.execute(update(Address).values(geocoded_at=datetime.utcnow() - timedelta(days=8)))
+    db.commit()
+    assert geocode_pending(db) == (0, 1)
+
+
+def test_manifest_stops_carry_coordinates(client, db, make_user):
+    _, customer = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+    driver, driver_headers = make_user(UserRole.driver)
+    order_id = create_order(client, customer, "1 Main St 10001")
+    r = client.patch(f"/api/v1/orders/assign/{order_id}", headers=admin, params={"driver_id": str(driver.id)})
+    assert r.status_code == 200, r.text
+    assert geocode_pending(db) == (1, 0)
+    lat, lng = db.execute(select(Address.latitude, Address.longitude)).one()
+
+    r = client.get("/api/v1/orders/driver/manifest", headers=driver_headers, params={"pickup_date": str(TOMORROW)})
+    assert r.status_code == 200, r.text
+    stop = r.json()["stops"][0]
+    assert (stop["latitude"], stop["longitude"]) == (lat, lng)
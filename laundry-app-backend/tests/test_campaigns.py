@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.campaign_run import CampaignRun
+from app.models.user import UserRole
+from app.services.campaigns import StubTransport, send_pickup_reminders
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+class FailingTransport(StubTransport):
+    """
+    Accepts `fail_after` payloads, then raises like an unavailable SendGrid.
+    """
+
+    def __init__(self, fail_after: int):
+        super().__init__()
+        self.fail_after = fail_after
+
+    def send(self, payload: dict) -> int:
+        if len(self.payloads) >= self.fail_after:
+            raise RuntimeError("SendGrid unavailable")
+        return super().send(payload)
+
+
+def recipients(transport):
+    return [
+        p["custom_args"]["order_id"]
+        for payload in transport.payloads
+        for p in payload["personalizations"]
+    ]
+
+
+@pytest.fixture
+def scheduled_orders(client, make_user):
+    ids = []
+    for i in range(5):
+        _, headers = make_user(UserRole.customer)
+        r = client.post("/api/v1/orders/create", headers=headers, json={
+            "pickup_address": f"{i} Main St 10001",
+            "laundry_type": "regular",
+            "pickup_date": str(TOMORROW),
+        })
+        assert r.status_code == 200, r.text
+        ids.append(r.json()["order_id"])
+    return sorted(ids)
+
+
+def test_sends_in_batches(db, scheduled_orders):
+    transport = StubTransport()
+    run = send_pickup_reminders(db, TOMORROW, transport, batch_size=2, from_email="noreply@example.com")
+
+    assert [len(p["personalizations"]) for p in transport.payloads] == [2, 2, 1]
+    assert sorted(recipients(transport)) == scheduled_orders
+    assert (run.status, run.sent_count, run.batch_count) == ("completed", 5, 3)
+
+
+def test_resumes_after_failure_without_resending(db, scheduled_orders):
+    failing = FailingTransport(fail_after=1)
+    with pytest.raises(RuntimeError):
+        send_pickup_reminders(db, TOMORROW, failing, batch_size=2, from_email="noreply@example.com")
+    run = db.query(CampaignRun).one()
+    assert (run.status, run.sent_count, run.batch_count) == ("failed", 2, 1)
+
+    resumed = StubTransport()
+    run = send_pickup_reminders(db, TOMORROW, resumed, batch_size=2, from_email="noreply@example.com")
+    assert run.status == "completed"
+    assert sorted(recipients(failing) + recipients(resumed)) == scheduled_orders
+    assert len(resumed.payloads) == 2
+
+
+def test_completed_campaign_is_not_sent_again(db, scheduled_orders):
+    send_pickup_reminders(db, TOMORROW, StubTransport(), batch_size=2, from_email="noreply@example.com")
+
+    again = StubTransport()
+    run = send_pickup_reminders(db, TOMORROW, again, batch_size=2, from_email="noreply@example.com")
+    assert again.payloads == []
+    assert (run.status, run.sent_count) == ("completed", 5)
+
+
+def test_dry_run_writes_no_checkpoint(db, scheduled_orders):
+    preview = StubTransport()
+    run = send_pickup_reminders(db, TOMORROW, preview, batch_size=2, from_email="noreply@example.com", dry_run=True)
+    assert (run.status, run.sent_count) == ("dry_run", 5)
+    assert db.query(CampaignRun).count() == 0
+
+    real = StubTransport()
+    run = send_pickup_reminders(db, TOMORROW, real, batch_size=2, from_email="noreply@example.com")
+    assert (run.status, run.sent_count) == ("completed", 5)
+    assert sorted(recipients(real)) == scheduled_orders
+
+
+def test_dry_run_previews_from_the_checkpoint(db, scheduled_orders):
+    with pytest.raises(RuntimeError):
+        send_pickup_reminders(db, TOMORROW, FailingTransport(fail_after=1), batch_size=2,
+                              from_email="noreply@example.com")
+
+    preview = StubTransport()
+    run = send_pickup_reminders(db, TOMORROW, preview, batch_size=2, from_email="noreply@example.com", dry_run=True)
+    assert run.sent_count == 3
+    db.expire_all()
+    assert db.query(CampaignRun).one().sent_count == 2  # checkpoint untouched
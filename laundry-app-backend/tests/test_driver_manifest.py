@@ -0,0 +1,67 @@
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.models.order import Order
+from app.models.user import UserRole
+from app.services.driver_manifest import manifest_cache
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def create_order(client, headers, address):
+    r = client.post("/api/v1/orders/create", headers=headers, json={
+        "pickup_address": address,
+        "laundry_type": "regular",
+        "pickup_date": str(TOMORROW),
+    })
+    assert r.status_code == 200, r.text
+    return r.json()["order_id"]
+
+
+def assign(client, admin_headers, order_id, driver):
+    r = client.patch(f"/api/v1/orders/assign/{order_id}", headers=admin_headers, params={"driver_id": str(driver.id)})
+    assert r.status_code == 200, r.text
+
+
+def manifest(client, headers):
+    r = client.get("/api/v1/orders/driver/manifest", headers=headers, params={"pickup_date": str(TOMORROW)})
+    assert r.status_code == 200, r.text
+    return [(s["order_id"], s["seq"]) for s in r.json()["stops"]]
+
+
+def test_reassignment_resequences_both_routes(client, make_user):
+    _, customer = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+    first, first_headers = make_user(UserRole.driver)
+    second, second_headers = make_user(UserRole.driver)
+    # zip order: 10001, 10002, 10003
+    orders = [create_order(client, customer, f"1 Main St {zip_code}") for zip_code in ("10001", "10002", "10003")]
+    for order_id in orders:
+        assign(client, admin, order_id, first)
+    assert manifest(client, first_headers) == [(orders[0], 1), (orders[1], 2), (orders[2], 3)]
+
+    assign(client, admin, orders[1], second)
+    assert manifest(client, first_headers) == [(orders[0], 1), (orders[2], 2)]
+    assert manifest(client, second_headers) == [(orders[1], 1)]
+
+
+def test_other_workers_changes_show_within_the_ttl(client, db, make_user, monkeypatch):
+    assert settings.MANIFEST_CACHE_TTL_SECONDS <= 30
+    monkeypatch.setattr(manifest_cache, "ttl_seconds", 0.2)
+    _, customer = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+    driver, driver_headers = make_user(UserRole.driver)
+    order_id = create_order(client, customer, "1 Main St 10001")
+    assign(client, admin, order_id, driver)
+    assert len(manifest(client, driver_headers)) == 1
+
+    # a Core update skips this worker's invalidation, like a commit made elsewhere
+    db.execute(update(Order).values(driver_id=None))
+    db.commit()
+    assert len(manifest(client, driver_headers)) == 1
+
+    time.sleep(0.25)
+    assert manifest(client, driver_headers) == []
@@ -0,0 +1,115 @@
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+from app.models.order import Order, OrderStatus
+from app.models.user import UserRole
+from app.services.order_archive import archive_delivered_orders
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def create_order(client, headers, address="1 Main St 10001"):
+    r = client.post("/api/v1/orders/create", headers=headers, json={
+        "pickup_address": address,
+        "laundry_type": "regular",
+        "pickup_date": str(TOMORROW),
+    })
+    assert r.status_code == 200, r.text
+    return r.json()["order_id"]
+
+
+def assign(client, admin_headers, order_id, driver):
+    r = client.patch(f"/api/v1/orders/assign/{order_id}", headers=admin_headers, params={"driver_id": str(driver.id)})
+    assert r.status_code == 200, r.text
+
+
+def pull(client, headers, cursor=None, limit=200):
+    params = {"limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    r = client.get("/api/v1/orders/driver/sync", headers=headers, params=params)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_reassigned_order_reaches_old_driver_as_removal(client, make_user):
+    _, customer = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+    first, first_headers = make_user(UserRole.driver)
+    second, second_headers = make_user(UserRole.driver)
+    order_id = create_order(client, customer)
+
+    assign(client, admin, order_id, first)
+    page = pull(client, first_headers)
+    assert [o["order_id"] for o in page["data"]] == [order_id]
+    assert page["removed"] == []
+
+    assign(client, admin, order_id, second)
+    page = pull(client, first_headers, page["cursor"])
+    assert page["data"] == []
+    assert [r["order_id"] for r in page["removed"]] == [order_id]
+
+    assert [o["order_id"] for o in pull(client, second_headers)["data"]] == [order_id]
+
+    # back to the first driver: data again, and the old removal is not replayed
+    assign(client, admin, order_id, first)
+    page = pull(client, first_headers)
+    assert [o["order_id"] for o in page["data"]] == [order_id]
+    assert page["removed"] == []
+
+
+def test_archived_order_is_removed_from_driver(client, db, make_user):
+    _, customer = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+    driver, driver_headers = make_user(UserRole.driver)
+    order_id = create_order(client, customer)
+    assign(client, admin, order_id, driver)
+    cursor = pull(client, driver_headers)["cursor"]
+
+    db.execute(
+        update(Order)
+        .where(Order.driver_id == driver.id)
+        .values(status=OrderStatus.delivered, is_paid=True, pickup_date=date.today() - timedelta(days=60))
+    )
+    db.commit()
+    assert archive_delivered_orders(db, older_than_days=30) == 1
+
+    page = pull(client, driver_headers, cursor)
+    assert [r["order_id"] for r in page["removed"]] == [order_id]
+
+
+def test_cursor_pages_orders_sharing_a_stamp(client, make_user):
+    _, customer = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+    driver, driver_headers = make_user(UserRole.driver)
+    order_ids = [create_order(client, customer, f"{i} Main St 10001") for i in range(3)]
+    for order_id in order_ids:
+        assign(client, admin, order_id, driver)
+
+    # one push transaction stamps all three orders with the same change_seq
+    r = client.post("/api/v1/orders/driver/sync", headers=driver_headers, json={"changes": [
+        {"client_ref": str(i), "order_id": order_id, "new_status": "in_cleaning"}
+        for i, order_id in enumerate(order_ids)
+    ]})
+    assert r.status_code == 200, r.text
+    assert r.json()["applied"] == 3
+    assert "cursor" not in r.json()
+
+    seen, cursor = [], None
+    while True:
+        page = pull(client, driver_headers, cursor, limit=1)
+        seen += [o["order_id"] for o in page["data"]]
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+    assert sorted(seen) == sorted(order_ids)
+    assert len({o["change_seq"] for o in pull(client, driver_headers)["data"]}) == 1
+
+    assert pull(client, driver_headers, cursor)["data"] == []
+
+
+def test_invalid_cursor_is_rejected(client, make_user):
+    _, driver_headers = make_user(UserRole.driver)
+    r = client.get("/api/v1/orders/driver/sync", headers=driver_headers, params={"cursor": "nope"})
+    assert r.status_code == 400
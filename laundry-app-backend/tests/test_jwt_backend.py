@@ -0,0 +1,128 @@
+import time
+
+import pytest
+
+from app.core import token as token_module
+from app.core.config import settings
+from app.core.jwt_backend import InvalidTokenError, JoseBackend, JWTBackend, build_backend
+from app.core.token import decode_token
+
+SECRET = "test-secret"
+
+
+def backends():
+    pytest.importorskip("jwt", reason="pyjwt is optional (requirements-pyjwt.txt)")
+    return JoseBackend(SECRET, "HS256"), build_backend("pyjwt", SECRET, "HS256")
+
+
+def test_tokens_are_interchangeable_between_backends():
+    jose, pyjwt = backends()
+    payload = {"sub": "42", "role": "admin", "exp": int(time.time()) + 60}
+    assert pyjwt.decode(jose.encode(payload)) == payload
+    assert jose.decode(pyjwt.encode(payload)) == payload
+
+
+def test_pyjwt_rejects_tampered_expired_and_foreign_tokens():
+    jose, pyjwt = backends()
+    token = pyjwt.encode({"sub": "42", "exp": int(time.time()) + 60})
+    header, body, signature = token.split(".")
+    with pytest.raises(InvalidTokenError):
+        pyjwt.decode(f"{header}.{body}.{signature[::-1]}")
+    with pytest.raises(InvalidTokenError):
+        pyjwt.decode(pyjwt.encode({"sub": "42", "exp": int(time.time()) - 10}))
+    with pytest.raises(InvalidTokenError):
+        pyjwt.decode(JoseBackend("other-secret", "HS256").encode({"sub": "42"}))
+    with pytest.raises(InvalidTokenError):
+        pyjwt.decode("not a token")
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown JWT_BACKEND"):
+        build_backend("nope", SECRET, "HS256")
+
+
+# --------------------
+# decode_token claims cache
+# --------------------
+class CountingBackend(JWTBackend):
+    """
+    The app's backend, counting the decodes that reach it.
+    """
+
+    def __init__(self, inner: JWTBackend):
+        super().__init__(inner.secret, inner.algorithm)
+        self.inner = inner
+        self.decodes = 0
+
+    def encode(self, payload: dict) -> str:
+        return self.inner.encode(payload)
+
+    def decode(self, token: str) -> dict:
+        self.decodes += 1
+        return self.inner.decode(token)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    counting = CountingBackend(token_module.jwt_backend)
+    monkeypatch.setattr(token_module, "jwt_backend", counting)
+    token_module._claims_cache.clear()
+    yield counting
+    token_module._claims_cache.clear()
+
+
+def access_token(backend, sub="42", seconds=60):
+    return backend.encode({"sub": sub, "scope": "access_token", "exp": int(time.time()) + seconds})
+
+
+def test_cache_hit_skips_the_backend(backend):
+    token = access_token(backend)
+    first = decode_token(token)
+    assert decode_token(token) == first
+    assert backend.decodes == 1
+    with pytest.raises(TypeError):
+        first["sub"] = "admin"  # cached claims are shared, so read-only
+
+
+def test_cached_claims_expire_with_the_token(backend):
+    token = access_token(backend, seconds=1)
+    exp = decode_token(token)["exp"]
+    decode_token(token)
+    assert backend.decodes == 1
+
+    # past exp every call goes back to the backend, which decides validity
+    time.sleep(max(0.0, exp - time.time()) + 0.05)
+    for _ in range(2):
+        try:
+            decode_token(token)
+        except InvalidTokenError:
+            pass
+    assert backend.decodes == 3
+    assert len(token_module._claims_cache) == 0
+
+
+def test_tampered_token_is_never_served_from_the_cache(backend):
+    token = access_token(backend)
+    decode_token(token)
+    header, body, signature = token.split(".")
+    forged_body = JoseBackend("other-secret", "HS256").encode({"sub": "1", "exp": int(time.time()) + 60}).split(".")[1]
+
+    for tampered in (f"{header}.{body}.{signature[::-1]}", f"{header}.{forged_body}.{signature}", token + "x"):
+        with pytest.raises(InvalidTokenError):
+            decode_token(tampered)
+    assert backend.decodes == 4
+    assert len(token_module._claims_cache) == 1
+
+
+def test_cache_size_is_capped(backend, monkeypatch):
+    assert token_module._claims_cache.max_entries == settings.TOKEN_CACHE_SIZE
+    monkeypatch.setattr(token_module._claims_cache, "max_entries", 3)
+    tokens = [access_token(backend, sub=str(n)) for n in range(5)]
+    for token in tokens:
+        decode_token(token)
+    assert len(token_module._claims_cache) == 3
+
+    decode_token(tokens[-1])
+    assert backend.decodes == 5
+    decode_token(tokens[0])  # evicted: verified again
+    assert backend.decodes == 6
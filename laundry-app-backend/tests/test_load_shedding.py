@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.load_shedding import LoadSheddingMiddleware
+from app.db.pool import WaitTimedQueuePool, create_timed_engine
+
+
+@pytest.fixture
+def small_engine(tmp_path):
+    engine = create_timed_engine(f"sqlite:///{tmp_path}/pool.db", pool_size=1, max_overflow=0, pool_timeout=5)
+    yield engine
+    engine.dispose()
+
+
+def test_pool_reports_blocked_and_recent_waits(small_engine):
+    pool = small_engine.pool
+    assert isinstance(pool, WaitTimedQueuePool)
+    pool.wait_window_seconds = 0.5
+
+    held = small_engine.connect()
+    waiter = threading.Thread(target=lambda: small_engine.connect().close())
+    waiter.start()
+    time.sleep(0.2)
+    assert pool.wait_seconds() >= 0.15  # the blocked checkout counts while it waits
+
+    held.close()
+    waiter.join()
+    assert pool.wait_seconds() > 0.05  # then as a recent wait, averaged with the fast ones
+
+    time.sleep(0.6)
+    assert pool.wait_seconds() == 0.0
+
+
+def test_in_memory_sqlite_keeps_its_own_pool():
+    engine = create_timed_engine("sqlite://")
+    assert not isinstance(engine.pool, WaitTimedQueuePool)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar_one() == 1
+
+
+def _fake_engine(wait):
+    return SimpleNamespace(pool=SimpleNamespace(wait_seconds=lambda: wait))
+
+
+def _status(middleware, path="/api/v1/orders/my"):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [], "query_string": b""}
+    asyncio.run(middleware(scope, receive, send))
+    return sent[0]["status"]
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def test_sheds_when_any_shard_pool_waits():
+    engines = [_fake_engine(0.0), _fake_engine(0.0)]
+    middleware = LoadSheddingMiddleware(_ok_app, max_in_flight=10, retry_after_seconds=1,
+                                        engines=engines, max_pool_wait_ms=100)
+    assert _status(middleware) == 200
+
+    engines[1] = _fake_engine(0.3)  # a shard, not the directory database
+    middleware.engines = engines
+    assert _status(middleware) == 503
+    assert _status(middleware, "/health") == 200
+    assert middleware.shed_count == 1
+
+
+def test_login_is_limited_per_username(client, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "TRUST_PROXY_HEADERS", True)
+
+    def login(username, ip):
+        return client.post(
+            "/api/v1/auth/login",
+            data={"username": username, "password": "wrong"},
+            headers={"X-Forwarded-For": ip},
+        ).status_code
+
+    # every attempt from a different IP, so only the username bucket fills
+    statuses = [login("Victim@Example.com", f"10.0.0.{i}") for i in range(11)]
+    assert statuses[:10] == [400] * 10
+    assert statuses[10] == 429
+    assert login("victim@example.com ", "10.0.1.1") == 429  # same account, normalized
+    assert login("someone-else@example.com", "10.0.1.2") == 400
@@ -0,0 +1,134 @@
+"""
+migrate() against a database created by the first release, which only
+had the users and orders tables below.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.db.base import Base
+from app.db.migrations import migrate
+
+_BASELINE_DDL = [
+    """CREATE TABLE users (
+        id CHAR(32) NOT NULL PRIMARY KEY,
+        email VARCHAR NOT NULL,
+        hashed_password VARCHAR NOT NULL,
+        role VARCHAR(8) NOT NULL,
+        is_active BOOLEAN NOT NULL,
+        is_verified BOOLEAN NOT NULL
+    )""",
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    "CREATE INDEX ix_users_id ON users (id)",
+    """CREATE TABLE orders (
+        id CHAR(32) NOT NULL PRIMARY KEY,
+        customer_id CHAR(32) NOT NULL REFERENCES users (id),
+        driver_id CHAR(32) REFERENCES users (id),
+        pickup_address VARCHAR NOT NULL,
+        laundry_type VARCHAR(9) NOT NULL,
+        pickup_date DATE NOT NULL,
+        status VARCHAR(18) NOT NULL,
+        special_instructions VARCHAR,
+        weight_lbs INTEGER,
+        price_per_lb_cents INTEGER NOT NULL,
+        service_fee_cents INTEGER NOT NULL,
+        delivery_fee_cents INTEGER NOT NULL,
+        tax_rate_bp INTEGER NOT NULL,
+        subtotal_cents INTEGER,
+        tax_cents INTEGER,
+        total_cents INTEGER,
+        is_paid BOOLEAN,
+        stripe_payment_intent_id VARCHAR
+    )""",
+    "CREATE UNIQUE INDEX ix_orders_id ON orders (id)",
+]
+
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/baseline.db")
+    customer = uuid.uuid4().hex
+    with engine.begin() as conn:
+        for stmt in _BASELINE_DDL:
+            conn.execute(text(stmt))
+        conn.execute(text(
+            "INSERT INTO users VALUES (:id, 'old@example.com', 'x', 'customer', 1, 1)"
+        ), {"id": customer})
+        conn.execute(text(
+            "INSERT INTO orders (id, customer_id, pickup_address, laundry_type, pickup_date, status, "
+            "special_instructions, price_per_lb_cents, service_fee_cents, delivery_fee_cents, tax_rate_bp, is_paid) "
+            "VALUES (:id, :customer, '12 Elm Street 10001', 'regular', '2026-01-05', 'scheduled', "
+            "'ring twice', 175, 300, 500, 700, 0)"
+        ), {"id": uuid.uuid4().hex, "customer": customer})
+    yield engine
+    engine.dispose()
+
+
+def _upgrade(engine):
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+
+
+def test_upgrade_adds_columns_and_backfills(baseline_engine):
+    _upgrade(baseline_engine)
+
+    inspector = inspect(baseline_engine)
+    order_columns = {c["name"] for c in inspector.get_columns("orders")}
+    assert {
+        "location", "pickup_slot_id", "subscription_id", "route_sequence",
+        "address_id", "updated_at", "change_seq",
+    } <= order_columns
+    assert "location" in {c["name"] for c in inspector.get_columns("users")}
+
+    order_indexes = {i["name"] for i in inspector.get_indexes("orders")}
+    assert {"ix_orders_driver_change_seq", "ix_orders_address_id", "uq_orders_subscription_pickup"} <= order_indexes
+    assert not any(name.endswith("_trgm") for name in order_indexes)  # Postgres only
+
+    with baseline_engine.connect() as conn:
+        row = conn.execute(text("SELECT location, change_seq, updated_at FROM orders")).one()
+        assert row.location == "main"
+        assert row.change_seq == 0
+        assert row.updated_at is not None
+        assert conn.execute(text("SELECT location FROM users")).scalar_one() == "main"
+        # rows from before the upgrade are searchable
+        hits = conn.execute(text("SELECT count(*) FROM orders_fts WHERE orders_fts MATCH 'elm'")).scalar_one()
+        assert hits == 1
+
+
+def test_upgrade_is_idempotent(baseline_engine):
+    _upgrade(baseline_engine)
+    before = [c["name"] for c in inspect(baseline_engine).get_columns("orders")]
+    _upgrade(baseline_engine)
+    assert [c["name"] for c in inspect(baseline_engine).get_columns("orders")] == before
+
+
+def test_upgrade_replaces_first_fts_layout(baseline_engine):
+    with baseline_engine.begin() as conn:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE orders_fts USING fts5(order_id UNINDEXED, pickup_address, special_instructions)"
+        ))
+        conn.execute(text(
+            "CREATE TRIGGER orders_fts_ad AFTER DELETE ON orders BEGIN "
+            "DELETE FROM orders_fts WHERE order_id = old.id; END"
+        ))
+        conn.execute(text(
+            "INSERT INTO orders_fts (order_id, pickup_address, special_instructions) "
+            "SELECT id, pickup_address, special_instructions FROM orders"
+        ))
+    _upgrade(baseline_engine)
+
+    with baseline_engine.begin() as conn:
+        fts_sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'orders_fts'")).scalar_one()
+        assert "content='orders'" in fts_sql
+        assert conn.execute(text("SELECT count(*) FROM orders_fts WHERE orders_fts MATCH 'elm'")).scalar_one() == 1
+        conn.execute(text("DELETE FROM orders"))
+        assert conn.execute(text("SELECT count(*) FROM orders_fts WHERE orders_fts MATCH 'elm'")).scalar_one() == 0
+
+
+def test_fresh_database_needs_no_migration(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fresh.db")
+    _upgrade(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM orders_fts")).scalar_one() == 0
+    engine.dispose()
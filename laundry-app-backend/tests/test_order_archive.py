@@ -0,0 +1,85 @@
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+from app.models.order import Order, OrderStatus
+from app.models.order_archive import ArchivedOrder
+from app.models.user import UserRole
+from app.services.order_archive import archive_delivered_orders
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def create_order(client, headers, address="1 Main St 10001"):
+    r = client.post("/api/v1/orders/create", headers=headers, json={
+        "pickup_address": address,
+        "laundry_type": "regular",
+        "pickup_date": str(TOMORROW),
+    })
+    assert r.status_code == 200, r.text
+    return r.json()["order_id"]
+
+
+def set_order(db, order_id, **values):
+    db.execute(update(Order).where(Order.id == uuid.UUID(order_id)).values(**values))
+    db.commit()
+
+
+def my_orders(client, headers, **params):
+    r = client.get("/api/v1/orders/my", headers=headers, params=params)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def seed_history(client, db, customer):
+    """Three archivable orders, one recent delivery, and two open orders."""
+    old = date.today() - timedelta(days=60)
+    ids = [create_order(client, customer, f"{i} Main St 10001") for i in range(6)]
+    for order_id, days in zip(ids[:3], (0, 10, 20)):
+        set_order(db, order_id, status=OrderStatus.delivered, is_paid=True, pickup_date=old - timedelta(days=days))
+    set_order(db, ids[3], status=OrderStatus.delivered, is_paid=True, pickup_date=date.today())
+    # same pickup_date as an archived order: the tie is broken by id across both tables
+    set_order(db, ids[4], pickup_date=old)
+    return ids
+
+
+def test_my_orders_span_live_and_archived_orders(client, db, make_user):
+    customer_user, customer = make_user(UserRole.customer)
+    ids = seed_history(client, db, customer)
+
+    assert archive_delivered_orders(db, older_than_days=30) == 3
+    assert db.query(Order).filter(Order.id.in_([uuid.UUID(i) for i in ids[:3]])).count() == 0
+    assert db.query(ArchivedOrder).filter(ArchivedOrder.customer_id == customer_user.id).count() == 3
+
+    body = my_orders(client, customer)
+    assert (body["meta"]["total"], body["meta"]["count"]) == (6, 6)
+    assert sorted(o["order_id"] for o in body["data"]) == sorted(ids)
+
+    delivered = my_orders(client, customer, status="delivered")
+    assert delivered["meta"]["total"] == 4
+    assert sorted(o["order_id"] for o in delivered["data"]) == sorted(ids[:4])
+    assert all(o["status"] == "delivered" for o in delivered["data"])
+
+    scheduled = my_orders(client, customer, status="scheduled")
+    assert scheduled["meta"]["total"] == 2
+    assert sorted(o["order_id"] for o in scheduled["data"]) == sorted(ids[4:])
+
+    assert my_orders(client, customer, status="picked_up")["meta"]["total"] == 0
+
+
+def test_my_orders_page_in_a_stable_order_across_tables(client, db, make_user):
+    _, customer = make_user(UserRole.customer)
+    seed_history(client, db, customer)
+    assert archive_delivered_orders(db, older_than_days=30) == 3
+
+    full = my_orders(client, customer)["data"]
+    keys = [(o["pickup_date"], o["order_id"]) for o in full]
+    assert keys == sorted(keys, reverse=True)
+
+    paged = []
+    for offset in range(0, len(full), 2):
+        page = my_orders(client, customer, limit=2, offset=offset)
+        assert page["meta"]["total"] == 6
+        paged += page["data"]
+    assert [o["order_id"] for o in paged] == [o["order_id"] for o in full]
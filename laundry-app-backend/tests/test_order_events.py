@@ -0,0 +1,131 @@
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.api.webhooks import router as webhooks_router
+from app.db.session import shard_router
+from app.models.order import Order, OrderStatus
+from app.models.order_event import OrderEvent, OrderEventType
+from app.models.user import UserRole
+from app.services.order_events import record_event, stage_histograms, summarize_histograms
+
+
+def test_created_event_is_written_with_the_order(client, db, make_user):
+    _, headers = make_user(UserRole.customer)
+    r = client.post("/api/v1/orders/create", headers=headers, json={
+        "pickup_address": "1 Main St 10001", "laundry_type": "regular", "pickup_date": str(date.today()),
+    })
+    order_id = uuid.UUID(r.json()["order_id"])
+
+    events = db.execute(select(OrderEvent.event_type).where(OrderEvent.order_id == order_id)).scalars().all()
+    assert events == [OrderEventType.created]
+
+
+def test_rolled_back_events_are_dropped(client, db):
+    db.execute(select(OrderEvent.id))  # begin the transaction being rolled back
+    record_event(db, uuid.uuid4(), OrderEventType.created, OrderStatus.scheduled)
+    db.rollback()
+    db.commit()
+    assert db.execute(select(OrderEvent)).first() is None
+
+
+def test_failed_event_write_rolls_back_the_change(client, db, make_user):
+    customer, _ = make_user(UserRole.customer)
+    order = Order(
+        customer_id=customer.id, pickup_address="1 Main St", laundry_type="regular",
+        pickup_date=date.today(),
+    )
+    db.add(order)
+    db.commit()
+
+    order.status = OrderStatus.picked_up
+    record_event(db, order.id, None)  # event_type is NOT NULL
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
+
+    db.expire_all()
+    assert db.get(Order, order.id).status == OrderStatus.scheduled
+
+
+def _log(db, minutes_to_pickup):
+    created = datetime.utcnow() - timedelta(hours=1)
+    for minutes in minutes_to_pickup:
+        order_id = uuid.uuid4()
+        db.add(OrderEvent(order_id=order_id, event_type=OrderEventType.created,
+                          status=OrderStatus.scheduled, created_at=created))
+        db.add(OrderEvent(order_id=order_id, event_type=OrderEventType.assigned,
+                          status=OrderStatus.picked_up, created_at=created + timedelta(minutes=minutes, seconds=30)))
+    db.commit()
+
+
+def test_stage_histograms_are_computed_in_sql(client, db):
+    _log(db, [5, 5, 10])
+    now = datetime.utcnow()
+    histograms = stage_histograms(db, now - timedelta(days=1), now + timedelta(days=1))
+
+    assert histograms["pickup"] == {5: 2, 10: 1}
+    assert histograms["end_to_end"] == {}
+    summary = summarize_histograms(histograms)
+    assert summary["pickup"] == {"count": 3, "p50_seconds": 360, "p90_seconds": 660, "p95_seconds": 660, "p99_seconds": 660}
+    assert summary["delivery"]["p50_seconds"] is None
+
+
+def test_sla_merges_every_location(client, db, make_user):
+    _, admin_headers = make_user(UserRole.admin)
+    _log(db, [1, 2])
+    north = shard_router.session_for("north")
+    try:
+        _log(north, [30, 40, 50])
+    finally:
+        north.close()
+
+    r = client.get("/api/v1/orders/admin/sla", headers=admin_headers)
+    pickup = r.json()["stages"]["pickup"]
+    assert pickup["count"] == 5
+    assert pickup["p50_seconds"] == 31 * 60
+
+
+def stripe_signature(payload: bytes, secret: str) -> str:
+    timestamp = int(time.time())
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def test_redelivered_payment_webhook_records_one_paid_event(client, db, make_user, monkeypatch):
+    monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", "whsec_test")
+    _, headers = make_user(UserRole.customer)
+    r = client.post("/api/v1/orders/create", headers=headers, json={
+        "pickup_address": "1 Main St 10001", "laundry_type": "regular", "pickup_date": str(date.today()),
+    })
+    order_id = r.json()["order_id"]
+    payload = json.dumps({
+        "id": "evt_1", "object": "event", "type": "payment_intent.succeeded",
+        "data": {"object": {"id": "pi_1", "object": "payment_intent", "metadata": {"order_id": order_id}}},
+    }).encode()
+
+    # the router isn't mounted on the main app; serve it on its own
+    webhooks = FastAPI()
+    webhooks.include_router(webhooks_router)
+    stripe_client = TestClient(webhooks)
+    for _ in range(2):
+        r = stripe_client.post("/webhooks/stripe", content=payload, headers={
+            "stripe-signature": stripe_signature(payload, "whsec_test"), "content-type": "application/json",
+        })
+        assert r.status_code == 200, r.text
+
+    order_uuid = uuid.UUID(order_id)
+    assert db.get(Order, order_uuid).is_paid is True
+    events = db.execute(
+        select(OrderEvent.event_type).where(OrderEvent.order_id == order_uuid).order_by(OrderEvent.id)
+    ).scalars().all()
+    assert events == [OrderEventType.created, OrderEventType.paid]
@@ -0,0 +1,122 @@
+import csv
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.migrations import migrate
+from app.models.order import LaundryType, Order, OrderStatus
+from app.models.user import User, UserRole
+from app.services.order_bulk import prepare_rows
+from app.services.order_import import _COPY_COLUMNS, _copy_payload, _copy_rows
+
+TOMORROW = date.today() + timedelta(days=1)
+HEADER = b"customer_email,pickup_address,laundry_type,pickup_date\n"
+
+
+def csv_line(email, address="1 Main St 10001"):
+    return f"{email},{address},regular,{TOMORROW}\n".encode()
+
+
+def upload(client, headers, body, chunk_size=100):
+    return client.post(
+        "/api/v1/orders/admin/import",
+        headers=headers,
+        params={"chunk_size": chunk_size},
+        files={"file": ("orders.csv", body, "text/csv")},
+    )
+
+
+def test_bad_bytes_and_records_in_a_later_chunk_fail_only_their_rows(client, db, make_user):
+    customer, _ = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+
+    lines = [csv_line(customer.email, f"{i} Main St 10001") for i in range(250)]
+    lines[150] = csv_line(customer.email, "\xe9 Main St 10001").replace(b"\xc3\xa9", b"\xe9")  # latin-1
+    lines[180] = f'{customer.email},"{"x" * 140_000}",regular,{TOMORROW}\n'.encode()
+    r = upload(client, admin, HEADER + b"".join(lines))
+
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["total_rows"], body["imported"], body["failed"]) == (250, 248, 2)
+    assert sorted((e["row"], e["error"]) for e in body["errors"]) == [
+        (152, "not valid UTF-8"),
+        (182, "unreadable CSV record: field larger than field limit (131072)"),
+    ]
+    assert db.query(Order).count() == 248
+
+
+def test_blank_addresses_fail_only_their_rows(client, db, make_user):
+    customer, _ = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+    lines = [csv_line(customer.email), csv_line(customer.email, ""), csv_line(customer.email, '"   "')]
+    r = upload(client, admin, HEADER + b"".join(lines))
+
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["imported"], body["failed"]) == (1, 2)
+    assert sorted((e["row"], e["error"]) for e in body["errors"]) == [
+        (3, "pickup_address: must not be blank"),
+        (4, "pickup_address: must not be blank"),
+    ]
+    assert db.query(Order).count() == 1
+
+
+def test_missing_columns_are_rejected_before_anything_loads(client, db, make_user):
+    customer, _ = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+    r = upload(client, admin, b"customer_email,pickup_address\n" + csv_line(customer.email))
+    assert r.status_code == 400
+    assert db.query(Order).count() == 0
+
+
+def _order_row(customer_id):
+    return {
+        "customer_id": customer_id,
+        "location": "main",
+        "pickup_address": '1 "Main" St, Apt 2 10001',
+        "laundry_type": LaundryType.dry_clean,
+        "pickup_date": TOMORROW,
+        "price_per_lb_cents": 175,
+        "service_fee_cents": 300,
+        "delivery_fee_cents": 500,
+        "tax_rate_bp": 700,
+    }
+
+
+def test_copy_payload_encodes_nulls_enums_and_booleans(db):
+    row = prepare_rows(db, [_order_row(customer_id="c1")])[0]
+    db.rollback()
+    fields = next(csv.reader(_copy_payload([row])))
+    values = dict(zip(_COPY_COLUMNS, fields))
+    assert values["laundry_type"] == "dry_clean"
+    assert values["status"] == "scheduled"
+    assert values["is_paid"] == "false"
+    assert values["driver_id"] == ""
+    assert values["pickup_address"] == '1 "Main" St, Apt 2 10001'
+    assert values["change_seq"] == str(row["change_seq"])
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_POSTGRES_URL"), reason="set TEST_POSTGRES_URL to a scratch Postgres database")
+def test_copy_loads_rows_on_postgres():
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    with Session(engine) as db:
+        user = User(email="copy@example.com", hashed_password="x", role=UserRole.customer, is_verified=True)
+        db.add(user)
+        db.flush()
+        rows = prepare_rows(db, [_order_row(user.id) for _ in range(3)])
+        _copy_rows(db, rows)
+
+        loaded = db.execute(select(Order).where(Order.customer_id == user.id)).scalars().all()
+        assert len(loaded) == 3
+        assert {o.laundry_type for o in loaded} == {LaundryType.dry_clean}
+        assert {o.status for o in loaded} == {OrderStatus.scheduled}
+        assert {o.pickup_address for o in loaded} == {'1 "Main" St, Apt 2 10001'}
+        assert all(o.driver_id is None and o.is_paid is False for o in loaded)
+        db.rollback()
+    engine.dispose()
@@ -0,0 +1,163 @@
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.models.order import LaundryType, Order, OrderStatus
+from app.models.user import UserRole
+from app.services.order_query import _statement
+
+BASE = date.today() + timedelta(days=1)
+STATUSES = (OrderStatus.scheduled, OrderStatus.picked_up, OrderStatus.delivered)
+
+
+@pytest.fixture
+def orders(client, db, make_user):
+    """
+    Nine orders over three pickup dates, two customers, two laundry types,
+    with one driver and a few paid orders. Dates repeat so sorts need the
+    id tiebreaker.
+    """
+    first, first_headers = make_user(UserRole.customer)
+    second, second_headers = make_user(UserRole.customer)
+    driver, _ = make_user(UserRole.driver)
+    _, admin = make_user(UserRole.admin)
+
+    seeded = []
+    for i in range(9):
+        customer, headers = (first, first_headers) if i < 5 else (second, second_headers)
+        r = client.post("/api/v1/orders/create", headers=headers, json={
+            "pickup_address": f"{i} Main St 10001", "laundry_type": "regular", "pickup_date": str(BASE),
+        })
+        assert r.status_code == 200, r.text
+        values = {
+            "pickup_date": BASE + timedelta(days=i % 3),
+            "status": STATUSES[i // 3],
+            "laundry_type": (LaundryType.regular, LaundryType.dry_clean)[i % 2],
+            "is_paid": i % 4 == 0,
+            "driver_id": driver.id if i % 3 == 0 else None,
+        }
+        seeded.append({"order_id": r.json()["order_id"], "customer_id": str(customer.id), **values})
+
+    for o in seeded:
+        values = {k: o[k] for k in ("pickup_date", "status", "laundry_type", "is_paid", "driver_id")}
+        db.execute(update(Order).where(Order.id == uuid.UUID(o["order_id"])).values(**values))
+    db.commit()
+    return {"admin": admin, "orders": seeded, "driver": driver, "customer": first}
+
+
+def query(client, headers, **params):
+    r = client.get("/api/v1/orders/admin/query", headers=headers, params={"limit": 500, **params})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def ids(body):
+    return sorted(o["order_id"] for o in body["data"])
+
+
+def expected(orders, predicate):
+    return sorted(o["order_id"] for o in orders if predicate(o))
+
+
+def test_each_filter_and_combinations(client, orders):
+    admin, seeded = orders["admin"], orders["orders"]
+    driver_id, customer_id = orders["driver"].id, orders["customer"].id
+
+    assert ids(query(client, admin)) == expected(seeded, lambda o: True)
+    assert ids(query(client, admin, status=["scheduled", "delivered"])) == expected(
+        seeded, lambda o: o["status"] in (OrderStatus.scheduled, OrderStatus.delivered))
+    assert ids(query(client, admin, driver_id=str(driver_id))) == expected(seeded, lambda o: o["driver_id"] == driver_id)
+    assert ids(query(client, admin, customer_id=str(customer_id))) == expected(
+        seeded, lambda o: o["customer_id"] == str(customer_id))
+    assert ids(query(client, admin, date_from=str(BASE + timedelta(days=1)))) == expected(
+        seeded, lambda o: o["pickup_date"] >= BASE + timedelta(days=1))
+    assert ids(query(client, admin, date_to=str(BASE))) == expected(seeded, lambda o: o["pickup_date"] <= BASE)
+    assert ids(query(client, admin, is_paid="true")) == expected(seeded, lambda o: o["is_paid"])
+    assert ids(query(client, admin, is_paid="false")) == expected(seeded, lambda o: not o["is_paid"])
+    assert ids(query(client, admin, laundry_type="dry_clean")) == expected(
+        seeded, lambda o: o["laundry_type"] == LaundryType.dry_clean)
+
+    combined = expected(seeded, lambda o: (
+        o["customer_id"] == str(customer_id)
+        and o["status"] in (OrderStatus.scheduled, OrderStatus.picked_up)
+        and o["laundry_type"] == LaundryType.regular
+        and o["pickup_date"] <= BASE + timedelta(days=1)
+    ))
+    assert combined
+    assert ids(query(
+        client, admin, customer_id=str(customer_id), status=["scheduled", "picked_up"],
+        laundry_type="regular", date_to=str(BASE + timedelta(days=1)),
+    )) == combined
+    assert query(client, admin, driver_id=str(driver_id), is_paid="false", status=["scheduled"])["data"] == []
+
+
+def test_projection_returns_only_requested_fields(client, orders):
+    body = query(client, orders["admin"], fields="order_id,total_cents,status")
+    assert body["meta"]["count"] == 9
+    assert all(set(o) == {"order_id", "total_cents", "status"} for o in body["data"])
+
+    # sorting by an unprojected key still pages
+    body = query(client, orders["admin"], fields="order_id", sort="laundry_type", limit=4)
+    assert all(set(o) == {"order_id"} for o in body["data"])
+    assert body["meta"]["next_cursor"]
+
+
+@pytest.mark.parametrize("sort", ["pickup_date", "-pickup_date", "pickup_date,-status", "-laundry_type,pickup_date"])
+def test_keyset_pages_have_no_gaps_or_duplicates(client, orders, sort):
+    admin = orders["admin"]
+    unpaged = [o["order_id"] for o in query(client, admin, sort=sort, fields="order_id,pickup_date")["data"]]
+    assert len(unpaged) == 9
+
+    paged, cursor = [], None
+    while True:
+        params = {"sort": sort, "fields": "order_id,pickup_date", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        body = query(client, admin, **params)
+        assert body["meta"]["count"] <= 2
+        paged += [o["order_id"] for o in body["data"]]
+        cursor = body["meta"]["next_cursor"]
+        if not cursor:
+            break
+
+    assert paged == unpaged
+    assert len(set(paged)) == 9
+
+    dates = [o["pickup_date"] for o in query(client, admin, sort=sort, fields="pickup_date")["data"]]
+    if sort.startswith("pickup_date"):
+        assert dates == sorted(dates)
+    elif sort.startswith("-pickup_date"):
+        assert dates == sorted(dates, reverse=True)
+
+
+@pytest.mark.parametrize("params", [
+    {"fields": "order_id,secret"},
+    {"sort": "total_cents"},
+    {"sort": "pickup_date,-pickup_date"},
+    {"cursor": "not-a-cursor"},
+    {"cursor": "WzFd"},  # base64 of [1]: wrong length for the sort
+])
+def test_bad_fields_sorts_and_cursors_are_rejected(client, orders, params):
+    r = client.get("/api/v1/orders/admin/query", headers=orders["admin"], params=params)
+    assert r.status_code == 400, r.text
+
+
+def test_cursor_from_another_sort_is_rejected(client, orders):
+    admin = orders["admin"]
+    cursor = query(client, admin, sort="-pickup_date", limit=2)["meta"]["next_cursor"]
+    r = client.get("/api/v1/orders/admin/query", headers=admin, params={"sort": "status,pickup_date", "cursor": cursor})
+    assert r.status_code == 400
+
+
+def test_statement_is_built_once_per_query_shape(client, orders):
+    admin = orders["admin"]
+    _statement.cache_clear()
+
+    query(client, admin, status=["scheduled"], fields="order_id")
+    query(client, admin, status=["picked_up", "delivered"], fields="order_id")
+    assert (_statement.cache_info().misses, _statement.cache_info().hits) == (1, 1)
+
+    query(client, admin, status=["scheduled"], is_paid="true", fields="order_id")
+    assert _statement.cache_info().misses == 2
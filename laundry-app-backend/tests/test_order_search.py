@@ -0,0 +1,46 @@
+from datetime import date, timedelta
+
+from sqlalchemy import delete, text
+
+from app.models.order import Order
+from app.models.user import UserRole
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def create_order(client, headers, address, notes=None):
+    r = client.post("/api/v1/orders/create", headers=headers, json={
+        "pickup_address": address,
+        "laundry_type": "regular",
+        "pickup_date": str(TOMORROW),
+        "special_instructions": notes,
+    })
+    assert r.status_code == 200, r.text
+    return r.json()["order_id"]
+
+
+def search(client, headers, q):
+    r = client.get("/api/v1/orders/admin/search", headers=headers, params={"q": q})
+    assert r.status_code == 200, r.text
+    return [o["order_id"] for o in r.json()["data"]]
+
+
+def test_search_follows_inserts_updates_and_deletes(client, db, make_user):
+    _, customer = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+    elm = create_order(client, customer, "12 Elm Street 10001", "ring twice")
+    oak = create_order(client, customer, "7 Oak Avenue 10001")
+
+    assert search(client, admin, "elm") == [elm]
+    assert search(client, admin, "ring") == [elm]
+    assert search(client, admin, "oak ave") == [oak]
+
+    db.execute(text("UPDATE orders SET pickup_address = '9 Birch Road 10001' WHERE pickup_address LIKE '7 Oak%'"))
+    db.commit()
+    assert search(client, admin, "oak") == []
+    assert search(client, admin, "birch") == [oak]
+
+    db.execute(delete(Order).where(Order.pickup_address.like("12 Elm%")))
+    db.commit()
+    assert search(client, admin, "elm") == []
+    assert db.execute(text("SELECT count(*) FROM orders_fts WHERE orders_fts MATCH 'ring'")).scalar_one() == 0
@@ -0,0 +1,89 @@
+import threading
+from datetime import date, time, timedelta
+
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models.order import Order
+from app.models.pickup_slot import PickupSlot
+from app.models.user import UserRole
+from app.services.pickup_slots import create_slots
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def create_slot(client, admin, location, capacity=5, start="09:00:00", end="11:00:00"):
+    r = client.post(
+        "/api/v1/orders/admin/slots",
+        headers={**admin, "X-Location": location},
+        json={
+            "date_from": str(TOMORROW),
+            "date_to": str(TOMORROW),
+            "windows": [{"start": start, "end": end}],
+            "zone": "",
+            "capacity": capacity,
+        },
+    )
+    assert r.status_code == 200, r.text
+
+
+def available(client, headers):
+    r = client.get("/api/v1/orders/slots/available", headers=headers)
+    assert r.status_code == 200, r.text
+    return [(s["window_start"], s["remaining"]) for s in r.json()]
+
+
+def test_availability_is_cached_per_shard(client, make_user):
+    _, admin = make_user(UserRole.admin)
+    _, main_customer = make_user(UserRole.customer, location="main")
+    _, north_customer = make_user(UserRole.customer, location="north")
+    create_slot(client, admin, "main", capacity=5)
+    create_slot(client, admin, "north", capacity=2, start="13:00:00", end="15:00:00")
+
+    assert available(client, main_customer) == [("09:00:00", 5)]
+    # same (start, days, zip) as the cached main entry
+    assert available(client, north_customer) == [("13:00:00", 2)]
+
+    # new north slots drop the north entry only
+    create_slot(client, admin, "north", capacity=1, start="15:00:00", end="17:00:00")
+    assert available(client, north_customer) == [("13:00:00", 2), ("15:00:00", 1)]
+    assert available(client, main_customer) == [("09:00:00", 5)]
+
+
+def test_concurrent_orders_never_overbook(client, make_user):
+    db = SessionLocal()
+    try:
+        create_slots(db, TOMORROW, TOMORROW, [(time(9), time(11))], zone="", capacity=3)
+        slot_id = db.execute(select(PickupSlot.id)).scalar_one()
+    finally:
+        db.close()
+
+    attempts = 12
+    customers = [make_user(UserRole.customer)[1] for _ in range(attempts)]
+    barrier = threading.Barrier(attempts)
+    statuses = []
+
+    def create_order(headers):
+        barrier.wait()
+        r = client.post("/api/v1/orders/create", headers=headers, json={
+            "pickup_address": "1 Main St 10001",
+            "laundry_type": "regular",
+            "pickup_date": str(TOMORROW),
+            "pickup_slot_id": slot_id,
+        })
+        statuses.append(r.status_code)
+
+    threads = [threading.Thread(target=create_order, args=(headers,)) for headers in customers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert statuses.count(200) == 3
+    assert statuses.count(409) == attempts - 3
+    db = SessionLocal()
+    try:
+        assert db.get(PickupSlot, slot_id).booked == 3
+        assert db.query(Order).filter(Order.pickup_slot_id == slot_id).count() == 3
+    finally:
+        db.close()
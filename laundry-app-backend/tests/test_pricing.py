@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.models.order import LaundryType
+from app.models.pricing_rule import PricingRule
+from app.models.user import UserRole
+from app.services.pricing_rules import PricingTable, pricing_store
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def _rule(rule_id, price, **overrides):
+    fields = dict(
+        id=rule_id,
+        laundry_type=LaundryType.regular,
+        zip_prefix="100",
+        effective_from=date(2026, 1, 1),
+        effective_to=None,
+        tax_jurisdiction=None,
+        price_per_lb_cents=price,
+        service_fee_cents=300,
+        delivery_fee_cents=500,
+        tax_rate_bp=700,
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def test_equally_specific_rules_resolve_to_the_newest():
+    rules = [_rule(7, 250), _rule(3, 199), _rule(5, 220)]
+    for ordering in (rules, list(reversed(rules))):
+        rates = PricingTable(ordering, version=1).resolve(LaundryType.regular, "10001", TOMORROW)
+        assert (rates.rule_id, rates.price_per_lb_cents) == (7, 250)
+
+
+def test_more_specific_rule_still_wins_over_newer():
+    rules = [_rule(1, 199, zip_prefix="1000"), _rule(2, 250)]
+    assert PricingTable(rules, version=1).resolve(LaundryType.regular, "10001", TOMORROW).rule_id == 1
+
+
+def test_set_weight_prices_from_the_booking_snapshot(client, db, make_user):
+    _, customer = make_user(UserRole.customer)
+    _, admin = make_user(UserRole.admin)
+    r = client.post("/api/v1/orders/create", headers=customer, json={
+        "pickup_address": "1 Main St 10001",
+        "laundry_type": "regular",
+        "pickup_date": str(TOMORROW),
+    })
+    assert r.status_code == 200, r.text
+    order_id = r.json()["order_id"]
+
+    # prices go up after the booking
+    db.add(PricingRule(
+        laundry_type=None, zip_prefix=None, effective_from=date(2000, 1, 1),
+        price_per_lb_cents=999, service_fee_cents=999, delivery_fee_cents=999, tax_rate_bp=2000,
+    ))
+    db.commit()
+    pricing_store.reload(db)
+
+    r = client.patch(f"/api/v1/orders/admin/set-weight/{order_id}", headers=admin, params={"weight_lbs": 10})
+    assert r.status_code == 200, r.text
+    # 10 * 175 + 300 + 500 = 2550, plus 7% tax
+    assert r.json()["subtotal_cents"] == 2550
+    assert r.json()["total_cents"] == 2550 + 178
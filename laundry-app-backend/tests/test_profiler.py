@@ -0,0 +1,109 @@
+import asyncio
+import os
+import time
+from collections import Counter
+
+from app.core.config import settings
+from app.core.profiler import Profile, ProfileStore, RequestProfilerMiddleware, profiling_lock
+from app.models.user import UserRole
+
+
+def sample_profile():
+    stacks = Counter({
+        (("thread:main", "", 0), ("handler", "app/api/orders.py", 10)): 3,
+        (("thread:main", "", 0), ("query", "app/db/session.py", 5)): 1,
+    })
+    return Profile(stacks, interval=0.001, duration=0.004, samples=4)
+
+
+def other_worker():
+    return ProfileStore(settings.PROFILE_DIR, settings.PROFILE_TTL_SECONDS, settings.PROFILE_MAX_STORED)
+
+
+def test_request_profile_is_readable_from_another_worker(client, make_user):
+    _, admin = make_user(UserRole.admin)
+    r = client.get("/health", headers={**admin, "X-Profile": "1"})
+    assert r.status_code == 200
+    profile_id = r.headers["x-profile-id"]
+
+    assert other_worker().get(profile_id) is not None
+    r = client.get(f"/api/v1/admin/profiles/{profile_id}", headers=admin)
+    assert r.status_code == 200, r.text
+
+
+def test_profile_is_stored_before_the_response_ends(client, make_user):
+    _, admin = make_user(UserRole.admin)
+
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"part", "more_body": True})
+        await send({"type": "http.response.body", "body": b"end"})
+
+    middleware = RequestProfilerMiddleware(endpoint, authorize=lambda token: True)
+    sent, fetched = [], []
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.start":
+            fetched.append(dict(message["headers"])[b"x-profile-id"].decode())
+        elif not message.get("more_body", False):
+            # what a client does the moment it has the whole response
+            r = client.get(f"/api/v1/admin/profiles/{fetched[0]}", headers=admin)
+            fetched.append(r.status_code)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/health",
+        "headers": [(b"x-profile", b"1"), (b"authorization", admin["Authorization"].encode())],
+    }
+    asyncio.run(middleware(scope, receive, send))
+
+    assert fetched[1] == 200
+    assert [m.get("body") for m in sent] == [None, b"part", b"end"]
+
+
+def test_profiles_round_trip_through_the_store(tmp_path):
+    writer = ProfileStore(str(tmp_path), ttl_seconds=60, max_entries=5)
+    reader = ProfileStore(str(tmp_path), ttl_seconds=60, max_entries=5)
+    profile = sample_profile()
+    writer.save("a" * 32, profile)
+
+    loaded = reader.get("a" * 32)
+    assert loaded.stacks == profile.stacks
+    assert loaded.collapsed() == profile.collapsed()
+    assert reader.get("b" * 32) is None
+    assert reader.get("../" + "a" * 29) is None
+
+
+def test_store_expires_and_caps_profiles(tmp_path):
+    store = ProfileStore(str(tmp_path), ttl_seconds=60, max_entries=2)
+    for n, profile_id in enumerate(("1" * 32, "2" * 32, "3" * 32)):
+        store.save(profile_id, sample_profile())
+        written = time.time() - 10 + n
+        os.utime(tmp_path / f"{profile_id}.json", (written, written))
+    store.save("4" * 32, sample_profile())
+    assert sorted(os.listdir(tmp_path)) == [f"{'3' * 32}.json", f"{'4' * 32}.json"]
+
+    store.ttl_seconds = 0
+    time.sleep(0.01)
+    assert store.get("4" * 32) is None
+
+
+def test_only_one_sampler_per_worker(client, make_user):
+    _, admin = make_user(UserRole.admin)
+    assert profiling_lock.acquire(blocking=False)
+    try:
+        r = client.get("/health", headers={**admin, "X-Profile": "1"})
+        assert r.status_code == 200
+        assert r.headers["x-profile-status"] == "busy"
+        assert "x-profile-id" not in r.headers
+
+        r = client.get("/api/v1/admin/profile", headers=admin, params={"seconds": 0.1})
+        assert r.status_code == 409
+    finally:
+        profiling_lock.release()
+
+    r = client.get("/health", headers={**admin, "X-Profile": "1"})
+    assert "x-profile-id" in r.headers
@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.db.query_stats import QueryBudgetExceeded, max_queries, query_budget as budget_block
+from app.models.user import User, UserRole
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def create_orders(client, headers, n):
+    ids = []
+    for i in range(n):
+        r = client.post("/api/v1/orders/create", headers=headers, json={
+            "pickup_address": f"{i} Main St 10001",
+            "laundry_type": "regular",
+            "pickup_date": str(TOMORROW),
+        })
+        assert r.status_code == 200, r.text
+        ids.append(r.json()["order_id"])
+    return ids
+
+
+@pytest.fixture
+def busy_driver(client, make_user):
+    _, customer_headers = make_user(UserRole.customer)
+    driver, driver_headers = make_user(UserRole.driver)
+    _, admin_headers = make_user(UserRole.admin)
+    for order_id in create_orders(client, customer_headers, 12):
+        r = client.patch(f"/api/v1/orders/assign/{order_id}", headers=admin_headers, params={"driver_id": str(driver.id)})
+        assert r.status_code == 200, r.text
+    return customer_headers, driver_headers, admin_headers
+
+
+def test_budget_catches_n_plus_one(db, make_user):
+    user, _ = make_user()
+
+    with pytest.raises(QueryBudgetExceeded, match="possible N\\+1"):
+        with budget_block(100, allow_duplicates=True):
+            for _ in range(10):
+                db.query(User).filter(User.id == user.id).first()
+                db.expire_all()
+
+
+def test_budget_catches_repeated_statement(db, make_user):
+    user, _ = make_user()
+
+    with pytest.raises(QueryBudgetExceeded, match="identical statements"):
+        with budget_block(100):
+            for _ in range(2):
+                db.query(User).filter(User.id == user.id).first()
+                db.expire_all()
+
+
+def test_my_orders_query_count_is_flat(client, busy_driver, query_budget):
+    customer_headers, _, _ = busy_driver
+    with query_budget(4):
+        r = client.get("/api/v1/orders/my", headers=customer_headers)
+    assert r.status_code == 200
+    assert r.json()["meta"]["count"] == 12
+
+
+def test_driver_assigned_query_count_is_flat(client, busy_driver, query_budget):
+    _, driver_headers, _ = busy_driver
+    with query_budget(3):
+        r = client.get("/api/v1/orders/driver/assigned", headers=driver_headers)
+    assert r.json()["meta"]["count"] == 12
+
+
+def test_driver_manifest_query_count_is_flat(client, busy_driver, query_budget):
+    _, driver_headers, _ = busy_driver
+    with query_budget(2):
+        r = client.get("/api/v1/orders/driver/manifest", headers=driver_headers, params={"pickup_date": str(TOMORROW)})
+    assert len(r.json()["stops"]) == 12
+
+
+def test_driver_sync_pull_query_count_is_flat(client, busy_driver, query_budget):
+    _, driver_headers, _ = busy_driver
+    with query_budget(3):
+        r = client.get("/api/v1/orders/driver/sync", headers=driver_headers)
+    assert len(r.json()["data"]) == 12
+
+
+def test_admin_search_query_count_is_flat(client, busy_driver, query_budget):
+    _, _, admin_headers = busy_driver
+    with query_budget(2):
+        r = client.get("/api/v1/orders/admin/search", headers=admin_headers, params={"q": "main"})
+    assert r.json()["meta"]["count"] == 12
+
+
+def test_admin_query_query_count_is_flat(client, busy_driver, query_budget):
+    _, _, admin_headers = busy_driver
+    with query_budget(2):
+        r = client.get("/api/v1/orders/admin/query", headers=admin_headers, params={"fields": "order_id,status"})
+    assert r.json()["meta"]["count"] == 12
+
+
+def test_max_queries_decorator(client, busy_driver):
+    customer_headers, _, _ = busy_driver
+
+    @max_queries(4)
+    def fetch():
+        return client.get("/api/v1/orders/my", headers=customer_headers)
+
+    assert fetch().status_code == 200
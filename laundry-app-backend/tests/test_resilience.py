@@ -0,0 +1,403 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import URLError
+
+import httpx
+import pytest
+import stripe
+from python_http_client.exceptions import BadRequestsError, InternalServerError, UnauthorizedError
+
+from app.core.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    Dependency,
+    DependencyUnavailable,
+    is_server_side,
+    sendgrid_dependency,
+    stripe_dependency,
+)
+from app.core.config import settings
+from app.services.campaigns import SendGridTransport
+from app.services.stripe_service import create_payment_intent
+
+RESET = 0.05
+
+
+class ClientError(Exception):
+    pass
+
+
+def make_dependency(threshold=2):
+    return Dependency(
+        "upstream",
+        timeout=5,
+        max_concurrent=10,
+        breaker=CircuitBreaker(threshold, RESET),
+        failure_types=(RuntimeError,),
+    )
+
+
+def fail():
+    raise RuntimeError("503 from upstream")
+
+
+def ok():
+    return "ok"
+
+
+def trip(dep):
+    for _ in range(dep.breaker.failure_threshold):
+        with pytest.raises(DependencyUnavailable):
+            dep.call(fail)
+    assert dep.breaker.state == OPEN
+
+
+class Held:
+    """
+    A call that blocks until released, then returns or raises `outcome`.
+    """
+
+    def __init__(self, dep, outcome=None):
+        self.dep = dep
+        self.outcome = outcome
+        self.started = threading.Event()
+        self.go = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self._run)
+        self.thread.start()
+        assert self.started.wait(1)
+
+    def _fn(self):
+        self.started.set()
+        self.go.wait(2)
+        if self.outcome is not None:
+            raise self.outcome
+        return "ok"
+
+    def _run(self):
+        try:
+            self.dep.call(self._fn)
+        except Exception as exc:
+            self.error = exc
+
+    def finish(self):
+        self.go.set()
+        self.thread.join()
+
+
+def test_opens_after_consecutive_failures_and_rejects():
+    dep = make_dependency()
+    trip(dep)
+    with pytest.raises(DependencyUnavailable, match="circuit open"):
+        dep.call(ok)
+    assert dep.counters["rejected_open"] == 1
+
+
+def test_one_probe_at_a_time_and_its_success_closes():
+    dep = make_dependency()
+    trip(dep)
+    time.sleep(RESET * 1.5)
+
+    probe = Held(dep)
+    assert dep.breaker.state == HALF_OPEN
+    with pytest.raises(DependencyUnavailable, match="circuit open"):
+        dep.call(ok)  # the probe slot is taken
+    probe.finish()
+    assert probe.error is None
+    assert dep.breaker.state == CLOSED
+    assert dep.call(ok) == "ok"
+
+
+def test_probe_failure_reopens():
+    dep = make_dependency()
+    trip(dep)
+    time.sleep(RESET * 1.5)
+    with pytest.raises(DependencyUnavailable, match="upstream error"):
+        dep.call(fail)
+    assert dep.breaker.state == OPEN
+    assert dep.breaker.transitions == {CLOSED: 0, OPEN: 2, HALF_OPEN: 1}
+
+
+def test_late_successes_from_before_the_outage_do_not_close():
+    dep = make_dependency()
+    stragglers = [Held(dep), Held(dep)]  # admitted while closed
+    trip(dep)
+
+    stragglers[0].finish()
+    assert dep.breaker.state == OPEN
+
+    time.sleep(RESET * 1.5)
+    probe = Held(dep)
+    stragglers[1].finish()
+    assert dep.breaker.state == HALF_OPEN
+    assert all(s.error is None for s in stragglers)
+
+    probe.finish()
+    assert dep.breaker.state == CLOSED
+
+
+def test_client_errors_from_ordinary_calls_do_not_free_probe_slots():
+    dep = make_dependency()
+    stragglers = [Held(dep, ClientError("declined")) for _ in range(3)]
+    trip(dep)
+    time.sleep(RESET * 1.5)
+
+    probe = Held(dep)
+    for straggler in stragglers:
+        straggler.finish()
+        assert isinstance(straggler.error, ClientError)
+    assert dep.breaker._probes_in_flight == 1
+    with pytest.raises(DependencyUnavailable, match="circuit open"):
+        dep.call(ok)
+
+    probe.finish()
+    assert dep.breaker.state == CLOSED
+    assert dep.breaker._probes_in_flight == 0
+
+
+def test_probe_from_an_earlier_round_is_ignored():
+    breaker = CircuitBreaker(1, RESET, half_open_probes=2)
+    breaker.record_failure(breaker.allow())
+    time.sleep(RESET * 1.5)
+    first, stale = breaker.allow(), breaker.allow()
+    breaker.record_failure(first)
+    assert breaker.state == OPEN
+
+    time.sleep(RESET * 1.5)
+    current = breaker.allow()
+    breaker.record_success(stale)
+    assert breaker.state == HALF_OPEN
+    breaker.record_failure(stale)
+    assert breaker.state == HALF_OPEN
+    breaker.record_success(current)
+    assert breaker.state == CLOSED
+
+
+def test_non_failure_exceptions_propagate_without_tripping():
+    dep = make_dependency(threshold=1)
+
+    def decline():
+        raise ClientError("declined")
+
+    with pytest.raises(ClientError):
+        dep.call(decline, fallback=lambda: "fallback")
+    assert dep.breaker.state == CLOSED
+
+
+# --------------------
+# SendGrid failure classification
+# --------------------
+def _httpx_status(code):
+    request = httpx.Request("POST", "https://api.sendgrid.com/v3/mail/send")
+    return httpx.HTTPStatusError("status", request=request, response=httpx.Response(code, request=request))
+
+
+@pytest.mark.parametrize("exc, outage", [
+    (InternalServerError(500, "error", b"", {}), True),
+    (BadRequestsError(400, "bad request", b"", {}), False),
+    (UnauthorizedError(401, "unauthorized", b"", {}), False),
+    (_httpx_status(503), True),
+    (_httpx_status(429), False),
+    (_httpx_status(422), False),
+    (httpx.ConnectError("refused"), True),
+    (httpx.ReadTimeout("slow"), True),
+    (URLError("connection refused"), True),
+    (TimeoutError(), True),
+    (ValueError("bad payload"), False),
+])
+def test_sendgrid_trips_only_on_server_side_errors(exc, outage):
+    assert is_server_side(exc) is outage
+
+
+def test_sendgrid_rejections_leave_the_breaker_closed():
+    dep = Dependency("sendgrid-test", timeout=5, max_concurrent=2,
+                     breaker=CircuitBreaker(2, RESET), is_failure=is_server_side)
+
+    def reject():
+        raise BadRequestsError(400, "bad request", b"", {})
+
+    for _ in range(5):
+        with pytest.raises(BadRequestsError):
+            dep.call(reject)
+    assert dep.breaker.state == CLOSED
+
+    def down():
+        raise InternalServerError(500, "error", b"", {})
+
+    for _ in range(2):
+        with pytest.raises(DependencyUnavailable):
+            dep.call(down)
+    assert dep.breaker.state == OPEN
+
+
+# --------------------
+# Real clients against a local fake upstream
+# --------------------
+class FakeUpstream:
+    """
+    Local HTTP server standing in for Stripe and SendGrid. `mode` is "ok",
+    "error" (503), "stall" (hold the response past any client timeout) or
+    "drop" (close the connection without answering).
+    """
+
+    def __init__(self):
+        self.mode = "ok"
+        self.hits = 0
+        self.received = threading.Event()
+        self.closing = threading.Event()
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                upstream.hits += 1
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                upstream.received.set()
+                if upstream.mode == "drop":
+                    self.close_connection = True
+                    return
+                if upstream.mode == "stall":
+                    upstream.closing.wait(5)
+                status = 503 if upstream.mode == "error" else 200
+                body = json.dumps(
+                    {"error": {"message": "unavailable"}} if status == 503 else {"id": "pi_1", "object": "payment_intent"}
+                ).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    pass  # the client already gave up
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.closing.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    server = FakeUpstream()
+    monkeypatch.setattr(stripe, "api_base", server.url)
+    monkeypatch.setattr(stripe, "api_key", "sk_test_fake")
+    # fresh breaker and counters on the app's shared dependencies
+    for dep in (stripe_dependency, sendgrid_dependency):
+        monkeypatch.setattr(dep, "breaker", CircuitBreaker(2, RESET))
+        monkeypatch.setattr(dep, "counters", dict.fromkeys(dep.counters, 0))
+    yield server
+    server.close()
+
+
+def stripe_call():
+    return create_payment_intent(1000, "order-1", "main")
+
+
+def sendgrid_call(server):
+    transport = SendGridTransport("SG.fake", settings.SENDGRID_TIMEOUT_SECONDS, base_url=server.url)
+    try:
+        return transport.send({"personalizations": []})
+    finally:
+        transport.close()
+
+
+CLIENTS = {
+    "stripe": (stripe_dependency, lambda server: stripe_call()),
+    "sendgrid": (sendgrid_dependency, sendgrid_call),
+}
+
+
+@pytest.mark.parametrize("name", CLIENTS)
+def test_client_timeout_fires_and_counts_as_timeout(upstream, name):
+    dep, call = CLIENTS[name]
+    assert dep.timeout == 0.5  # set by conftest through the *_TIMEOUT_SECONDS settings
+    upstream.mode = "stall"
+
+    start = time.monotonic()
+    with pytest.raises(DependencyUnavailable, match="timed out"):
+        call(upstream)
+    elapsed = time.monotonic() - start
+
+    # one attempt: client-side retries would take three timeouts or more
+    assert dep.timeout <= elapsed < dep.timeout * 3
+    assert upstream.hits == 1
+    assert (dep.counters["timeouts"], dep.counters["failures"]) == (1, 0)
+
+
+@pytest.mark.parametrize("mode", ["error", "drop"])
+@pytest.mark.parametrize("name", CLIENTS)
+def test_breaker_opens_on_outage_and_recovers_through_half_open(upstream, name, mode):
+    dep, call = CLIENTS[name]
+    upstream.mode = mode
+    for _ in range(2):
+        with pytest.raises(DependencyUnavailable, match="upstream error"):
+            call(upstream)
+    assert dep.breaker.state == OPEN
+    hits = upstream.hits
+
+    with pytest.raises(DependencyUnavailable, match="circuit open"):
+        call(upstream)
+    assert upstream.hits == hits  # rejected without touching the server
+
+    upstream.mode = "ok"
+    time.sleep(RESET * 1.5)
+    call(upstream)
+    assert dep.breaker.state == CLOSED
+    assert dep.breaker.transitions == {CLOSED: 1, OPEN: 1, HALF_OPEN: 1}
+    assert dep.counters == {**dep.counters, "failures": 2, "rejected_open": 1, "successes": 1, "timeouts": 0}
+
+
+def test_bulkhead_rejects_calls_beyond_the_limit(upstream, monkeypatch):
+    monkeypatch.setattr(sendgrid_dependency, "max_concurrent", 1)
+    monkeypatch.setattr(sendgrid_dependency, "_slots", threading.BoundedSemaphore(1))
+    upstream.mode = "stall"
+
+    errors = []
+
+    def hold_the_slot():
+        try:
+            sendgrid_call(upstream)
+        except DependencyUnavailable as exc:
+            errors.append(exc.reason)
+
+    held = threading.Thread(target=hold_the_slot)
+    held.start()
+    assert upstream.received.wait(1)
+
+    with pytest.raises(DependencyUnavailable, match="too many concurrent calls"):
+        sendgrid_call(upstream)
+    held.join()
+
+    assert errors == ["timed out"]
+
+    assert upstream.hits == 1
+    assert sendgrid_dependency.counters["rejected_bulkhead"] == 1
+    assert sendgrid_dependency.counters["timeouts"] == 1
+    assert sendgrid_dependency.breaker.state == CLOSED
+
+
+def test_fallback_is_returned_for_failures_and_open_circuit(upstream):
+    def charge():
+        return stripe_dependency.call(stripe.PaymentIntent.create, amount=1000, currency="usd", fallback=lambda: "queued")
+
+    upstream.mode = "error"
+    assert [charge(), charge()] == ["queued", "queued"]
+    assert stripe_dependency.breaker.state == OPEN
+    assert charge() == "queued"
+
+    assert upstream.hits == 2
+    assert stripe_dependency.counters["fallbacks"] == 3
+    assert stripe_dependency.counters["failures"] == 2
+    assert stripe_dependency.counters["rejected_open"] == 1
@@ -0,0 +1,91 @@
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
+
+from app.db.session import SessionLocal
+from app.models.order import Order, OrderStatus
+from app.models.order_rollup import OrderDailyRollup
+from app.models.user import UserRole
+from app.services.rollups import rebuild_rollups
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def create_order(client, headers):
+    r = client.post("/api/v1/orders/create", headers=headers, json={
+        "pickup_address": "1 Main St 10001",
+        "laundry_type": "regular",
+        "pickup_date": str(TOMORROW),
+    })
+    assert r.status_code == 200, r.text
+    return uuid.UUID(r.json()["order_id"])
+
+
+def rollups(db):
+    rows = db.execute(
+        select(OrderDailyRollup).where(OrderDailyRollup.order_count != 0)
+    ).scalars().all()
+    return sorted(
+        (r.day, r.status.value, r.laundry_type.value, r.driver_id, r.order_count, r.paid_count,
+         r.weight_lbs, r.subtotal_cents, r.tax_cents, r.total_cents, r.paid_total_cents)
+        for r in rows
+    )
+
+
+def counts_by_status(db):
+    return {status: count for _, status, _, _, count, *_ in rollups(db)}
+
+
+def test_update_of_expired_order_moves_it_between_buckets(client, db, make_user):
+    _, customer = make_user(UserRole.customer)
+    order_id = create_order(client, customer)
+
+    session = SessionLocal()
+    try:
+        order = session.get(Order, order_id)
+        session.expire(order)  # as after a commit
+        order.status = OrderStatus.picked_up
+        order.weight_lbs = 10
+        session.commit()
+    finally:
+        session.close()
+
+    assert counts_by_status(db) == {"picked_up": 1}
+
+
+def test_order_loaded_without_tracked_columns(client, db, make_user):
+    _, customer = make_user(UserRole.customer)
+    order_id = create_order(client, customer)
+
+    session = SessionLocal()
+    try:
+        # only the id is loaded; status is set without ever being read
+        order = session.query(Order).options(load_only(Order.id)).filter(Order.id == order_id).one()
+        order.status = OrderStatus.picked_up
+        session.commit()
+    finally:
+        session.close()
+
+    assert counts_by_status(db) == {"picked_up": 1}
+
+
+def test_rebuild_matches_incremental_rollups(client, db, make_user):
+    _, customer = make_user(UserRole.customer)
+    driver, _ = make_user(UserRole.driver)
+    _, admin = make_user(UserRole.admin)
+    for i in range(3):
+        order_id = create_order(client, customer)
+        if i:
+            r = client.patch(f"/api/v1/orders/assign/{order_id}", headers=admin, params={"driver_id": str(driver.id)})
+            assert r.status_code == 200, r.text
+        if i == 2:
+            r = client.patch(f"/api/v1/orders/admin/set-weight/{order_id}", headers=admin, params={"weight_lbs": 8})
+            assert r.status_code == 200, r.text
+
+    incremental = rollups(db)
+    assert incremental
+
+    assert rebuild_rollups(db) == len(incremental)
+    assert rollups(db) == incremental
@@ -0,0 +1,103 @@
+"""
+Location sharding against the two SQLite databases from conftest:
+"main" (the directory database) and "north".
+"""
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import select, update
+
+from app.db.session import SessionLocal, shard_router
+from app.models.order import Order, OrderStatus
+from app.models.user import User, UserRole
+from app.services.user_mirror import mirror_user
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def create_order(client, headers):
+    r = client.post("/api/v1/orders/create", headers=headers, json={
+        "pickup_address": "1 Main St 10001",
+        "laundry_type": "regular",
+        "pickup_date": str(TOMORROW),
+    })
+    assert r.status_code == 200, r.text
+    return uuid.UUID(r.json()["order_id"])
+
+
+def move(client, admin, user, location):
+    return client.patch(f"/api/v1/admin/users/{user.id}/location", headers=admin, json={"location": location})
+
+
+def north_user(user_id):
+    db = shard_router.session_for("north")
+    try:
+        return db.execute(select(User.email, User.location).where(User.id == user_id)).one_or_none()
+    finally:
+        db.close()
+
+
+def test_orders_live_on_the_users_shard(client, make_user):
+    _, north_customer = make_user(UserRole.customer, location="north")
+    order_id = create_order(client, north_customer)
+
+    for location, expected in (("north", 1), ("main", 0)):
+        db = shard_router.session_for(location)
+        try:
+            assert db.query(Order).filter(Order.id == order_id).count() == expected
+        finally:
+            db.close()
+
+
+def test_move_refused_while_orders_are_open(client, make_user):
+    _, admin = make_user(UserRole.admin)
+    customer, headers = make_user(UserRole.customer, location="north")
+    create_order(client, headers)
+
+    r = move(client, admin, customer, "main")
+    assert r.status_code == 409, r.text
+    db = SessionLocal()
+    try:
+        assert db.get(User, customer.id).location == "north"
+    finally:
+        db.close()
+
+
+def test_move_allowed_once_orders_are_delivered(client, make_user):
+    _, admin = make_user(UserRole.admin)
+    customer, headers = make_user(UserRole.customer, location="north")
+    create_order(client, headers)
+
+    north = shard_router.session_for("north")
+    try:
+        north.execute(update(Order).where(Order.customer_id == customer.id).values(status=OrderStatus.delivered))
+        north.commit()
+    finally:
+        north.close()
+
+    r = move(client, admin, customer, "main")
+    assert r.status_code == 200, r.text
+    # the copy on the old shard is refreshed, and new orders land on main
+    assert north_user(customer.id).location == "main"
+    order_id = create_order(client, headers)
+    main = SessionLocal()
+    try:
+        assert main.query(Order).filter(Order.id == order_id).count() == 1
+    finally:
+        main.close()
+
+
+def test_mirror_refreshes_changed_fields(client, db, make_user):
+    customer, headers = make_user(UserRole.customer, location="north")
+    create_order(client, headers)
+    assert north_user(customer.id).email == customer.email
+
+    customer.email = "renamed@example.com"
+    db.commit()
+    north = shard_router.session_for("north")
+    try:
+        mirror_user(north, customer, db)
+        north.commit()
+    finally:
+        north.close()
+    assert north_user(customer.id).email == "renamed@example.com"
@@ -0,0 +1,90 @@
+import io
+import itertools
+import json
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core import structured_logging
+from app.core.config import settings
+from app.core.structured_logging import RequestContextMiddleware, configure_logging, stop_logging
+from app.models.user import UserRole
+
+
+@pytest.fixture
+def captured_logs():
+    """
+    Re-route the queue listener to a buffer. Calling the returned function
+    drains the queue and returns the JSON records written so far.
+    """
+    stop_logging()
+    stdout, buffer = sys.stdout, io.StringIO()
+    sys.stdout = buffer
+    configure_logging("INFO", True, {"app.access": 0.5})
+
+    def records():
+        stop_logging()
+        return [json.loads(line) for line in buffer.getvalue().splitlines()]
+
+    try:
+        yield records
+    finally:
+        stop_logging()
+        sys.stdout = stdout
+        configure_logging(settings.LOG_LEVEL, settings.LOG_JSON, settings.LOG_SAMPLE_RATES)
+
+
+async def plain_app(scope, receive, send):
+    status = 500 if scope["path"] == "/error" else 200
+    await send({"type": "http.response.start", "status": status, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def test_non_error_access_lines_are_sampled(captured_logs, monkeypatch):
+    # alternate draws below and above the 0.5 rate
+    draws = itertools.cycle([0.1, 0.9])
+    monkeypatch.setattr(structured_logging.random, "random", lambda: next(draws))
+    client = TestClient(RequestContextMiddleware(plain_app, slow_request_ms=60_000))
+
+    for _ in range(4):
+        assert client.get("/ok").status_code == 200
+    for _ in range(2):
+        assert client.get("/error").status_code == 500
+
+    access = [r for r in captured_logs() if r["logger"] == "app.access"]
+    assert [r["status"] for r in access if r["path"] == "/ok"] == [200, 200]
+    assert [r["status"] for r in access if r["path"] == "/error"] == [500, 500]
+    assert all(r["method"] == "GET" and "duration_ms" in r for r in access)
+    # each request gets its own generated id
+    assert len({r["request_id"] for r in access}) == 4
+
+
+def test_request_id_reaches_records_from_the_handler(client, make_user, captured_logs, monkeypatch):
+    _, customer = make_user(UserRole.customer)
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+
+    r = client.get("/api/v1/orders/my", headers={**customer, "X-Request-ID": "req-abc"})
+    assert r.status_code == 200
+    assert r.headers["x-request-id"] == "req-abc"
+
+    # slow-query records are written from the threadpool thread running the endpoint
+    slow = [r for r in captured_logs() if r["logger"] == "app.db.slow_query"]
+    assert slow
+    assert {r["request_id"] for r in slow} == {"req-abc"}
+
+
+def test_slow_queries_are_logged_as_fingerprints(client, db, captured_logs, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    db.execute(text("SELECT 'card-4242', 42 WHERE 1 IN (1, 2, 3)"))
+    db.rollback()
+
+    slow = [r for r in captured_logs() if r["logger"] == "app.db.slow_query"]
+    record = next(r for r in slow if r["statement"].startswith("SELECT ?"))
+    assert record["statement"] == "SELECT ?, ? WHERE ? IN (...)"
+    assert record["level"] == "WARNING"
+    assert record["message"].startswith("Slow query (")
+    assert record["executemany"] is False
+    assert "request_id" not in record  # outside any request
+    assert isinstance(record["duration_ms"], float)
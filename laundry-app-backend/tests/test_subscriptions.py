@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, event, select
+
+from app.models.change_counter import ChangeCounter
+from app.models.order import Order
+from app.models.user import UserRole
+from app.services.subscriptions import generate_subscription_orders
+
+START = date.today() + timedelta(days=1)
+END = START + timedelta(days=13)  # two weeks: 2 weekly pickups, 1 biweekly
+
+
+@pytest.fixture
+def subscriptions(client, make_user):
+    _, headers = make_user(UserRole.customer)
+    for i, cadence in enumerate(("weekly", "weekly", "biweekly")):
+        r = client.post("/api/v1/subscriptions/", headers=headers, json={
+            "cadence": cadence,
+            "anchor_date": str(START),
+            "pickup_address": f"{i} Main St 10001",
+            "laundry_type": "regular",
+        })
+        assert r.status_code == 200, r.text
+
+
+def order_stamp(db):
+    return db.execute(select(ChangeCounter.value).where(ChangeCounter.name == "orders")).scalar_one()
+
+
+def writes_during(db, fn):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        result = fn()
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+    return result, statements
+
+
+def test_rerun_writes_nothing_and_takes_no_stamp(db, subscriptions):
+    assert generate_subscription_orders(db, START, END, batch_size=2) == (5, 0)
+    stamp = order_stamp(db)
+
+    result, writes = writes_during(db, lambda: generate_subscription_orders(db, START, END, batch_size=2))
+    assert result == (0, 5)
+    assert writes == []
+    assert order_stamp(db) == stamp
+    assert db.query(Order).count() == 5
+
+
+def test_rerun_fills_only_missing_dates(db, subscriptions):
+    generate_subscription_orders(db, START, END)
+    gone = db.execute(select(Order.id).where(Order.pickup_date == START + timedelta(days=7))).scalars().first()
+    db.execute(delete(Order).where(Order.id == gone))
+    db.commit()
+
+    assert generate_subscription_orders(db, START, END) == (1, 4)
+    pairs = db.execute(select(Order.subscription_id, Order.pickup_date)).all()
+    assert len(pairs) == len(set(pairs)) == 5